@@ -41,6 +41,17 @@ if config.config_file_name is not None:
 # ✅ Alembic이 참고할 SQLAlchemy 메타데이터 (즉, 모델 정의 정보)
 target_metadata = Base.metadata
 
+# ✅ 온라인 마이그레이션 헬퍼의 진행 상황 테이블은 모델에 없으므로 autogenerate 비교에서 제외
+from app.utils.online_migration import PROGRESS_TABLE
+
+# ✅ SQLite 는 ALTER TABLE 지원이 제한적이므로 batch 모드(테이블 복사 후 교체)로 마이그레이션 생성/실행
+render_as_batch = settings.db_backend == "sqlite"
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table" and name == PROGRESS_TABLE:
+        return False
+    return True
+
 # ▶ 오프라인 마이그레이션 실행 함수 (SQL 파일만 생성, DB 연결 없음)
 def run_migrations_offline() -> None:
     """
@@ -54,6 +65,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,  # 파라미터 바인딩을 리터럴로 출력
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
+        render_as_batch=render_as_batch,
     )
 
     with context.begin_transaction():
@@ -75,7 +88,10 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
-            compare_type=True  # 컬럼 타입 변경도 감지
+            compare_type=True,  # 컬럼 타입 변경도 감지
+            include_object=include_object,
+            render_as_batch=render_as_batch,
+            transaction_per_migration=True,  # 리비전마다 트랜잭션 분리 (autocommit_block 배치 백필과 함께 사용)
         )
 
         with context.begin_transaction():
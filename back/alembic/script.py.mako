@@ -10,6 +10,7 @@ from typing import Sequence, Union
 from alembic import op
 import sqlalchemy as sa
 ${imports if imports else ""}
+# 대용량 테이블 변경 시: from app.utils.online_migration import backfill_in_batches, create_index_online
 
 # revision identifiers, used by Alembic.
 revision: str = ${repr(up_revision)}
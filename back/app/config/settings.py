@@ -14,9 +14,18 @@ settings.py
     - DB 연결, API 기본 정보 등 프로젝트 전체 설정을 중앙 집중화
 """
 
+from typing import Literal
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import socket
 
+# db_backend="mysql" 일 때 .env 에 반드시 있어야 하는 항목 (없으면 시작 시 바로 오류)
+_MYSQL_FIELDS = (
+    "local_mysql_user", "local_mysql_password", "local_mysql_host", "local_mysql_db",
+    "prod_mysql_user", "prod_mysql_password", "prod_mysql_host", "prod_mysql_db",
+)
+
 # 환경설정 클래스 (BaseSettings 상속 → .env에서 값 자동 로드)
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -27,29 +36,156 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "Base App"  # 프로젝트 이름
     API_PREFIX: str = "/api"           # API 엔드포인트 prefix
 
+    # DB 백엔드 — "mysql": 아래 local/prod MySQL (환경 자동 판별) / "sqlite": 임베디드 SQLite (utils/sqlite_tuning.py)
+    db_backend: Literal["mysql", "sqlite"] = "mysql"
+
+    # 임베디드 SQLite 모드 (db_backend="sqlite", 단일 노드 배포·빠른 테스트용)
+    sqlite_path: str = "data/app.db"           # DB 파일 경로 (":memory:" 면 연결 하나를 공유하는 프로세스 메모리 DB → 테스트 전용)
+    sqlite_journal_mode: str = "WAL"           # WAL: 읽기/쓰기 동시 진행
+    sqlite_synchronous: str = "NORMAL"         # WAL 에서 안전한 최소 fsync 수준 ("FULL" 이면 commit 마다 fsync)
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # 메모리 맵 읽기 크기(바이트), 0 이면 비활성
+    sqlite_busy_timeout_ms: int = 5000         # 쓰기 잠금 대기 시간
+    sqlite_cache_size_kb: int = 64 * 1024      # 연결당 페이지 캐시 크기(KiB)
+    sqlite_pool_size: int = 8                  # 연결 풀 크기 (+ 같은 수만큼 overflow)
+
     # 공통 설정
     mysql_port: int = 3306             # MySQL 포트 (로컬/운영 동일하게 사용)
 
-    # 로컬 개발 환경용 DB 설정
-    local_mysql_user: str              # 로컬 DB 사용자 이름
-    local_mysql_password: str          # 로컬 DB 비밀번호
-    local_mysql_host: str              # 로컬 DB 호스트 (예: localhost)
-    local_mysql_db: str                # 로컬 DB 이름
+    # 로컬 개발 환경용 DB 설정 (로컬/운영 모두 db_backend="mysql" 이면 필수, _require_mysql_settings)
+    local_mysql_user: str = ""         # 로컬 DB 사용자 이름
+    local_mysql_password: str = ""     # 로컬 DB 비밀번호
+    local_mysql_host: str = ""         # 로컬 DB 호스트 (예: localhost)
+    local_mysql_db: str = ""           # 로컬 DB 이름
 
     # 운영 환경용 DB 설정
-    prod_mysql_user: str               # 운영 DB 사용자 이름
-    prod_mysql_password: str           # 운영 DB 비밀번호
-    prod_mysql_host: str               # 운영 DB 호스트 (예: RDS, 외부 서버 등)
-    prod_mysql_db: str                 # 운영 DB 이름
+    prod_mysql_user: str = ""          # 운영 DB 사용자 이름
+    prod_mysql_password: str = ""      # 운영 DB 비밀번호
+    prod_mysql_host: str = ""          # 운영 DB 호스트 (예: RDS, 외부 서버 등)
+    prod_mysql_db: str = ""            # 운영 DB 이름
 
     # 시크릿 키 (세션 쿠키 서명 등 보안 기능에 사용됨. 반드시 노출 금지!)
     secret_key: str
 
+    # 세션 쿠키 관련 (middlewares/session.py)
+    session_store: str = "cookie"              # "cookie": 쿠키에 서명된 데이터 저장 / "memory": 서버 메모리에 저장, 쿠키엔 세션 ID만
+    session_max_age: int = 14 * 24 * 60 * 60   # 세션 쿠키 유효 시간(초)
+
+    # 관리자 API (/api/admin) 접근 토큰 — X-Admin-Token 헤더로 전달, 비어 있으면 관리자 API 비활성
+    admin_token: str = ""
+
+    # 요청 프로파일링 (middlewares/profiler.py)
+    profiling_enabled: bool = False            # False 면 미들웨어 미등록 (오버헤드 없음)
+    profiling_mode: str = "sample"             # "sample": 스택 샘플링(.folded) / "cprofile": 이벤트 루프 cProfile(.pstats)
+    profiling_sample_rate: int = 0             # N개 요청 중 1개 자동 캡처 (0이면 비활성)
+    profiling_interval_ms: float = 1.0         # 스택 샘플링 주기(ms)
+    profiling_dir: str = "profiles"            # 결과 저장 디렉토리
+    profiling_max_files: int = 50              # 보관할 최대 파일 수 (초과 시 오래된 것부터 삭제)
+
+    # 사용자 내보내기 (/api/user/export)
+    export_batch_size: int = 1000              # 서버 측 커서에서 한 번에 가져올 행 수
+    export_chunk_bytes: int = 64 * 1024        # 응답 청크 크기 (작은 청크를 모아서 전송)
+
+    # 사용자 타입어헤드 검색 (/api/user/search)
+    user_search_index_enabled: bool = False    # True 면 프로세스 내 접두사 인덱스 사용 (False 면 DB 접두사 쿼리)
+
+    # Write-behind (services/bookkeeping_service.py) — 부가 쓰기 배치 처리
+    write_behind_enabled: bool = True          # False 면 요청 경로에서 즉시 동기 실행
+    write_behind_flush_interval: float = 1.0   # flush 주기(초)
+    write_behind_flush_threshold: int = 500    # 이 개수 이상 쌓이면 즉시 flush
+    write_behind_max_pending: int = 10000      # 버퍼 상한 (초과 시 새 항목 드롭)
+
+    # 토큰 introspection (/api/auth/introspect) — 게이트웨이/사이드카 전용
+    introspection_token: str = ""              # X-Service-Token 헤더 값, 비어 있으면 엔드포인트 비활성
+    introspection_cache_seconds: int = 5       # refresh 세션 상태 캐시 시간 (폐기된 세션은 만료까지 캐시)
+
+    # Idempotency-Key (middlewares/idempotency.py)
+    idempotency_ttl_seconds: int = 3600        # 저장된 응답 재생 가능 시간(초)
+    idempotency_max_keys: int = 10000          # 저장할 최대 키 수
+
+    # 요청 마감 시각 / DB statement timeout (middlewares/deadline.py)
+    request_timeout_seconds: float = 10.0      # 기본 요청 제한 시간(초), 0 이면 비활성
+    request_timeout_routes: dict[str, float] = {"/user/export": 0}  # API_PREFIX 기준 경로 prefix별 제한 시간 (0 = 제한 없음)
+
+    # 적응형 동시성 제한 / 부하 차단 (middlewares/load_shed.py)
+    concurrency_limit_enabled: bool = True
+    concurrency_initial_limit: int = 20        # 그룹별 초기 동시 처리 한도
+    concurrency_min_limit: int = 2
+    concurrency_max_limit: int = 200
+    concurrency_target_latency_ms: float = 250 # 목표 지연, 넘기면 한도 감소 (AIMD)
+    concurrency_queue_timeout_ms: float = 100  # 한도 초과 시 대기 최대 시간, 지나면 503
+    concurrency_routes: dict[str, float] = {   # API_PREFIX 기준 경로 prefix별 목표 지연(ms), 0 = 제한 제외
+        "/auth/login": 1000,                   # bcrypt 검증
+        "/user/register": 1000,                # bcrypt 해싱
+        "/user/export": 0,                     # 장시간 스트리밍
+    }
+
+    # 요청 본문 크기 제한 (middlewares/body_limit.py)
+    max_body_bytes: int = 1024 * 1024          # 기본 최대 본문 크기 (1MB)
+    body_limit_routes: dict[str, int] = {      # API_PREFIX 기준 경로 prefix별 최대 본문 크기
+        "/auth/login": 4096,
+        "/user/register": 4096,
+        "/operations": 64 * 1024,
+    }
+
+    # DB 지연/장애 주입 (utils/latency_injection.py) — 테스트/벤치마크 전용, 운영에서는 끌 것
+    db_latency_enabled: bool = False
+    db_latency_statement_ms: float = 2.0       # SQL 실행당 지연(ms) — 운영 MySQL 왕복 1~5ms 흉내
+    db_latency_commit_ms: float = 2.0          # commit 당 지연(ms)
+    db_latency_jitter_ms: float = 1.0          # 0~jitter 무작위 추가 지연(ms)
+    db_failure_rate: float = 0.0               # SQL 실행 실패 확률 (0~1)
+
+    # refresh 세션(tb_token) 샤딩 (app/sharding.py) — 비어 있으면 메인 DB 에 저장
+    token_shard_urls: list[str] = []           # 샤드 DB URL 목록 (user_id 해시 % 샤드 수), 변경 후 tools.rebalance_token_shards 실행
+
+    # 응답 압축 (middlewares/compression.py)
+    compression_enabled: bool = True
+    compression_min_size: int = 1024           # 이 크기(바이트) 미만 응답은 압축하지 않음
+    compression_encodings: list[str] = ["zstd", "br", "gzip"]  # 서버 선호 순서 (br/zstd 는 패키지가 설치된 경우만)
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4        # 요청마다 압축하므로 속도 위주 (0~11)
+    compression_zstd_level: int = 3
+    compression_cache_paths: list[str] = ["/openapi.json"]  # 미리 압축한 본문을 재사용할 GET 경로
+    compression_cache_size: int = 64           # 캐시 항목 수 (경로 x 인코딩 x 본문)
+    compression_cache_max_bytes: int = 2 * 1024 * 1024  # 이보다 큰 본문은 캐시하지 않음
+    compression_cache_ttl_seconds: int = 3600
+    compression_cache_level_boost: int = 5     # 캐시 대상은 한 번만 압축하므로 압축 수준을 이만큼 올림
+
+    # JSON:API Atomic Operations (POST /api/operations, services/atomic_service.py)
+    atomic_max_operations: int = 20            # 요청 하나에 담을 수 있는 최대 연산 수
+
+    # DB 서킷 브레이커 (utils/circuit_breaker.py)
+    db_breaker_enabled: bool = True
+    db_breaker_failure_threshold: int = 5      # 연속 연결 실패/끊김/풀 타임아웃 횟수, 넘으면 open
+    db_breaker_reset_seconds: float = 10.0     # open 유지 시간, 지나면 half-open
+    db_breaker_half_open_probes: int = 1       # half-open 에서 동시에 통과시킬 프로브 요청 수
+
+    # 분산 트레이싱 (middlewares/tracing.py, utils/tracing.py)
+    tracing_enabled: bool = False              # False 면 계측/미들웨어 미등록
+    tracing_sample_rate: float = 0.01          # traceparent 없는 요청의 샘플링 확률 (head 기반)
+    tracing_exporter: str = "file"             # "file": JSON Lines / "http": 로컬 수집기로 POST
+    tracing_file: str = "traces/spans.jsonl"
+    tracing_endpoint: str = "http://127.0.0.1:4319/v1/spans"  # python -m tools.trace_collector
+    tracing_batch_size: int = 512              # 한 번에 내보낼 span 수
+    tracing_flush_interval: float = 2.0        # 내보내기 주기(초)
+    tracing_max_queue: int = 10000             # 대기 span 상한 (초과 시 드롭)
+
     # JWT 관련
     jwt_algorithm: str = "HS256"
     access_token_expires_minutes: int = 60
     refresh_token_expires_days: int = 7
+    refresh_reuse_grace_seconds: int = 5      # 회전 직후 같은 refresh 재요청 시 직전 결과를 돌려주는 유예 시간 (0이면 비활성)
+    refresh_grace_cache_size: int = 10000     # 유예 캐시 최대 항목 수
+    max_active_sessions_per_user: int = 10    # 사용자별 활성 refresh 세션 상한 (초과 시 오래된 것부터 폐기, 0이면 무제한)
     
+    @model_validator(mode="after")
+    def _require_mysql_settings(self):
+        """MySQL 모드에서 DB 접속 정보가 빠졌으면 첫 연결이 아니라 시작 시점에 실패"""
+        if self.db_backend == "mysql":
+            missing = [name for name in _MYSQL_FIELDS if name not in self.model_fields_set]
+            if missing:
+                raise ValueError(f"db_backend='mysql' requires: {', '.join(missing)}")
+        return self
+
     @property
     def env(self) -> str:
         """
@@ -66,7 +202,12 @@ class Settings(BaseSettings):
     def get_db_url(self) -> str:
         """
         현재 환경(local 또는 prod)에 따라 SQLAlchemy DB 연결 URL을 반환하는 함수.
+        - db_backend="sqlite" 면 환경과 무관하게 sqlite_path 의 임베디드 DB
         """
+        if self.db_backend == "sqlite":
+            if self.sqlite_path == ":memory:":
+                return "sqlite://"
+            return f"sqlite:///{self.sqlite_path}"
         if self.env == "prod":
             # 운영용 DB URL 구성
             return (
@@ -11,22 +11,70 @@ database.py
 
 settings.get_db_url()을 통해 로컬/운영 환경을 자동 판별하며,
 로컬에서는 SQL 로그를 출력하고, 운영에서는 생략하도록 설정합니다.
+settings.db_backend="sqlite" 면 MySQL 대신 임베디드 SQLite 를 사용합니다.
 """
 
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from app.config.settings import settings
+from app.utils.deadline import install_statement_timeouts
+from app.utils.latency_injection import install_latency_injection
+from app.utils import sqlite_tuning
+from app.utils.circuit_breaker import CircuitBreaker, breakers, install_circuit_breaker
 
 # 로컬 또는 운영 환경에 따라 DB 연결 URL 결정
 SQLALCHEMY_DATABASE_URL = settings.get_db_url()
 
+def make_engine(url: str, name: str | None = None):
+    """
+    SQLAlchemy 엔진 생성 (메인 DB / refresh 세션 샤드 공용)
+    - 요청 deadline → DB statement timeout 전파 (utils/deadline.py)
+    - 테스트/벤치마크용 DB 왕복 지연·장애 주입 (settings.db_latency_enabled)
+    - name 을 주면 그 이름으로 서킷 브레이커 연결 (settings.db_breaker_enabled, utils/circuit_breaker.py)
+    - SQLite URL 이면 SQLite 용 풀 + 연결마다 PRAGMA 적용 (utils/sqlite_tuning.py)
+    """
+    options = {"pool_pre_ping": True}  # 연결 유효성 확인
+    if sqlite_tuning.is_sqlite(url):
+        options = sqlite_tuning.engine_options(url)
+    new_engine = create_engine(
+        url,
+        echo=False,
+        future=True,
+        **options,
+    )
+    if sqlite_tuning.is_sqlite(url):
+        sqlite_tuning.install_pragmas(
+            new_engine,
+            journal_mode=settings.sqlite_journal_mode,
+            synchronous=settings.sqlite_synchronous,
+            mmap_size=settings.sqlite_mmap_size,
+            busy_timeout_ms=settings.sqlite_busy_timeout_ms,
+            cache_size_kb=settings.sqlite_cache_size_kb,
+        )
+    install_statement_timeouts(new_engine)
+    if settings.db_latency_enabled:
+        install_latency_injection(
+            new_engine,
+            statement_ms=settings.db_latency_statement_ms,
+            commit_ms=settings.db_latency_commit_ms,
+            jitter_ms=settings.db_latency_jitter_ms,
+            failure_rate=settings.db_failure_rate,
+        )
+    if name and settings.db_breaker_enabled:
+        install_circuit_breaker(new_engine, CircuitBreaker(
+            name,
+            failure_threshold=settings.db_breaker_failure_threshold,
+            reset_timeout=settings.db_breaker_reset_seconds,
+            half_open_probes=settings.db_breaker_half_open_probes,
+        ))
+    return new_engine
+
 # SQLAlchemy 엔진 생성 (DB와 연결)
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True,  # 연결 유효성 확인
-    echo=False,
-    future=True
-)
+engine = make_engine(SQLALCHEMY_DATABASE_URL, name="db")
 
 # 세션 팩토리 생성
 SessionLocal = sessionmaker(
@@ -43,9 +91,65 @@ def get_db():
     """
     FastAPI 라우터에서 의존성으로 사용하기 위한 DB 세션 함수.
     요청 처리 중에는 DB 세션을 열고, 처리가 끝나면 자동으로 닫습니다.
+    - 서킷이 열려 있으면 세션을 만들지 않고 바로 CircuitOpenError (→ 503)
+    - 커넥션 풀 checkout 타임아웃도 서킷 실패로 기록
     """
+    breaker = breakers.get("db")
+    probe = breaker.allow() if breaker else False
     db = SessionLocal()
     try:
         yield db
+    except PoolTimeoutError:
+        if breaker:
+            breaker.record_failure()
+        raise
     finally:
         db.close()
+        if probe:
+            breaker.release()
+
+# atomic_session 안에서는 세션의 after_commit 이 실제 COMMIT 이 아님 (flush 만 됨)
+#  → commit 후처리(검색 인덱스 반영 등)는 run_after_commit 으로 바깥 트랜잭션 COMMIT 뒤로 미룸
+_AFTER_COMMIT_KEY = "atomic_after_commit"
+
+def run_after_commit(db: Session, fn: Callable[[], None]) -> None:
+    """
+    commit 후처리 실행 (Session after_commit 이벤트 안에서 호출)
+    - 일반 세션: 바로 실행
+    - atomic_session: 블록이 정상 COMMIT 된 뒤에 실행, 롤백되면 버림
+    """
+    deferred = db.info.get(_AFTER_COMMIT_KEY)
+    if deferred is None:
+        fn()
+    else:
+        deferred.append(fn)
+
+@contextmanager
+def atomic_session() -> Iterator[Session]:
+    """
+    여러 작업을 DB 트랜잭션 하나로 묶는 세션 (JSON:API atomic operations 등)
+    - 커넥션에서 트랜잭션을 먼저 열고 세션을 join_transaction_mode="rollback_only" 로 붙임
+        → repository 함수 안의 db.commit() 은 flush 만 하고, 실제 COMMIT 은 블록이 정상 종료될 때 한 번
+        → 중간에 예외(또는 db.rollback())가 나면 전체 롤백
+    - commit 후처리(run_after_commit)는 실제 COMMIT 성공 후에만 실행 (롤백되면 버림)
+    - get_db 와 같이 서킷이 열려 있으면 바로 CircuitOpenError
+    """
+    breaker = breakers.get("db")
+    probe = breaker.allow() if breaker else False
+    try:
+        with engine.connect() as conn:
+            trans = conn.begin()
+            db = SessionLocal(bind=conn, join_transaction_mode="rollback_only")
+            after_commit: list[Callable[[], None]] = []
+            db.info[_AFTER_COMMIT_KEY] = after_commit
+            try:
+                yield db
+                db.flush()
+                trans.commit()
+            finally:
+                db.close()
+        for fn in after_commit:
+            fn()
+    finally:
+        if probe:
+            breaker.release()
@@ -1,9 +1,13 @@
 # app/errors/handlers.py
+import math
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from app.errors.problem_details import problem
 from app.errors import codes  # 상태코드 상수 정의
+from app.utils.circuit_breaker import CircuitOpenError
+from app.utils.deadline import DeadlineExceeded
+from app.utils.metrics import metrics
 
 def register_error_handlers(app: FastAPI) -> None:
     # 422 Validation Error
@@ -34,6 +38,36 @@ def register_error_handlers(app: FastAPI) -> None:
             media_type="application/problem+json"
         )
 
+    # 504 요청 마감 시각 초과 (DB statement timeout 포함)
+    @app.exception_handler(DeadlineExceeded)
+    async def handle_deadline(request: Request, exc: DeadlineExceeded):
+        metrics.inc("deadline_exceeded")
+        return JSONResponse(
+            status_code=codes.HTTP_504_GATEWAY_TIMEOUT,
+            content=problem(
+                status=codes.HTTP_504_GATEWAY_TIMEOUT,
+                title="Gateway Timeout",
+                detail="Request deadline exceeded",
+                instance=str(request.url.path)
+            ),
+            media_type="application/problem+json"
+        )
+
+    # 503 DB 서킷 open (DB 호출 없이 빠른 실패)
+    @app.exception_handler(CircuitOpenError)
+    async def handle_circuit_open(request: Request, exc: CircuitOpenError):
+        return JSONResponse(
+            status_code=codes.HTTP_503_SERVICE_UNAVAILABLE,
+            content=problem(
+                status=codes.HTTP_503_SERVICE_UNAVAILABLE,
+                title="Service Unavailable",
+                detail="Database is temporarily unavailable",
+                instance=str(request.url.path)
+            ),
+            media_type="application/problem+json",
+            headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))}
+        )
+
     # 500 Internal Server Error
     @app.middleware("http")
     async def catch_all(request: Request, call_next):
@@ -13,19 +13,39 @@ FastAPI 앱 진입점 (main.py)
 이 구조를 사용하면 `create_app()`을 통해 테스트, 배포, 커스터마이징이 쉬워집니다.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routers import user, auth
+from app.routers import user, auth, admin, operations
 from app.config.settings import settings
-from app.middlewares import cors, secure_headers, session, https_redirect, access_log, rate_limiter
+from app.middlewares import cors, secure_headers, session, https_redirect, access_log, rate_limiter, profiler, idempotency, deadline, load_shed, body_limit, tracing, compression
 from app.database import engine, Base
+from app import sharding
 from app.errors import handlers
+from app.services import bookkeeping_service
+from app.utils import tracing as trace_utils
 import app.models  # 모델 자동 인식용 import
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    앱 시작/종료 시 백그라운드 작업 관리
+    - 시작: write-behind flush 스레드 시작
+    - 종료: 버퍼에 남은 쓰기 flush 후 스레드 종료
+    """
+    bookkeeping_service.start()
+    try:
+        if settings.tracing_enabled:
+            trace_utils.exporter.start()
+        yield
+    finally:
+        bookkeeping_service.stop()
+        trace_utils.exporter.stop()
+
 def create_app() -> FastAPI:
     """
     FastAPI 앱 인스턴스를 생성하고 설정 구성(CORS, DB, 라우터 등)을 등록하는 함수입니다.
     """
-    app = FastAPI(title=settings.PROJECT_NAME)
+    app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
     # 1. Access 로그 기록 (요청/응답 로그를 콘솔 또는 파일로 기록)
     access_log.add_access_log(app)
@@ -33,28 +53,55 @@ def create_app() -> FastAPI:
     # 2. HTTPS 리디렉션 (운영 환경에서만 HTTP → HTTPS 강제 전환)
     https_redirect.add_https_redirect(app)
 
-    # 3. 보안 헤더 삽입 (XSS, MIME 스니핑, iframe 삽입 등 보호)
+    # ※ 직접 응답을 만들어 끝내는(short-circuit) 미들웨어는 보안 헤더/CORS 보다 먼저 등록
+    #    (나중에 등록한 미들웨어가 바깥 → 이들의 4xx/5xx 응답에도 보안 헤더와 Access-Control-Allow-Origin 이 붙음)
+
+    # 3. 요청 마감 시각 (경로별 제한 시간 → DB statement timeout 전파, 초과 시 504)
+    deadline.add_deadline(app)
+
+    # 4. 적응형 동시성 제한 (한도 초과 요청은 짧게 대기 후 503 + Retry-After)
+    load_shed.add_load_shed(app)
+
+    # 5. Idempotency-Key 처리 (회원가입/로그인 재시도 시 저장된 응답 재생)
+    idempotency.add_idempotency(app)
+
+    # 6. 요청 본문 크기 제한 (Content-Length / 수신 바이트 기준, 초과 시 413)
+    body_limit.add_body_limit(app)
+
+    # 7. 보안 헤더 삽입 (XSS, MIME 스니핑, iframe 삽입 등 보호)
     secure_headers.add_secure_headers(app)
 
-    # 4. 세션 쿠키 설정 (환경에 따라 Secure, SameSite 등 다르게 설정)
+    # 8. 세션 쿠키 설정 (환경에 따라 Secure, SameSite 등 다르게 설정)
     session.add_session_middleware(app)
 
-    # 5. CORS 정책 적용 (로컬은 전체 허용, 운영은 특정 도메인만 허용)
+    # 9. CORS 정책 적용 (로컬은 전체 허용, 운영은 특정 도메인만 허용)
     cors.add_cors(app)
 
-    # 6. Rate Limiting 설정 (라우터 단위에서 @limiter.limit 데코레이터로 적용)
+    # 10. Rate Limiting 설정 (라우터 단위에서 @limiter.limit 데코레이터로 적용)
     rate_limiter.add_rate_limiter(app)
 
-    # 7. 에러 핸들러 등록
+    # 11. 에러 핸들러 등록
     handlers.register_error_handlers(app)
+
+    # 12. 응답 압축 (Accept-Encoding 협상, 작은 응답 제외, /openapi.json 등은 압축 결과 캐시)
+    compression.add_compression(app)
+
+    # 13. 요청 프로파일링 (profiling_enabled=True 일 때만 등록, 가장 바깥에서 전체 스택을 측정)
+    profiler.add_profiler(app)
+
+    # 14. 분산 트레이싱 (tracing_enabled=True 일 때만, 가장 바깥에서 traceparent 수신/전파)
+    tracing.add_tracing(app)
     
-    # 로컬 환경에서만 DB 테이블 자동 생성
-    if settings.env == "local":
+    # 로컬 환경 또는 임베디드 SQLite 모드에서 DB 테이블 자동 생성 (별도 마이그레이션 단계 없이 단일 노드 배포)
+    if settings.env == "local" or settings.db_backend == "sqlite":
         Base.metadata.create_all(bind=engine)
+        sharding.create_shard_tables()   # token_shard_urls 가 있을 때만 (샤드마다 tb_token)
 
     # 샘플 라우터 등록
     app.include_router(user.router, prefix=settings.API_PREFIX + "/user")
     app.include_router(auth.router, prefix=settings.API_PREFIX + "/auth")
+    app.include_router(admin.router, prefix=settings.API_PREFIX + "/admin")
+    app.include_router(operations.router, prefix=settings.API_PREFIX + "/operations")
 
     return app
 
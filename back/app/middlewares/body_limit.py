@@ -0,0 +1,106 @@
+"""
+body_limit.py
+--------------
+
+요청 본문 크기 제한 미들웨어
+
+FastAPI 는 본문 전체를 메모리에 읽고 JSON 파싱을 끝낸 뒤에야 pydantic 검증을 하므로,
+거대한 본문은 검증에서 걸러지기 전에 이미 메모리/CPU 를 소모합니다. 이 미들웨어는:
+
+    - Content-Length 가 한도를 넘으면 본문을 읽기 전에 바로 413
+    - Content-Length 가 없거나(chunked) 거짓이면, 받는 도중 누적 바이트가 한도를 넘는 순간 중단 → 413
+
+한도는 경로 prefix별(settings.body_limit_routes, API_PREFIX 기준, 가장 긴 prefix 우선), 나머지는 settings.max_body_bytes.
+필드 길이 제한은 스키마(UserCreate, LoginIn)의 Field(max_length=...) 가 담당합니다.
+"""
+
+import json
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.errors import codes
+from app.errors.problem_details import problem
+
+class BodyLimitMiddleware:
+    def __init__(self, app: ASGIApp, default: int, routes: dict[str, int]) -> None:
+        self.app = app
+        self.default = default
+        self.routes = sorted(routes.items(), key=lambda kv: len(kv[0]), reverse=True)
+
+    def limit_for(self, path: str) -> int:
+        for prefix, limit in self.routes:
+            if path.startswith(prefix):
+                return limit
+        return self.default
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        limit = self.limit_for(scope["path"])
+
+        content_length = next((v for k, v in scope["headers"] if k == b"content-length"), None)
+        if content_length is not None:
+            try:
+                too_large = int(content_length) > limit
+            except ValueError:
+                too_large = False
+            if too_large:
+                await _reject(send, limit, scope["path"])
+                return
+
+        # 한도 초과 시 앱에는 연결 끊김(http.disconnect)을 전달해 본문 읽기를 멈추게 하고,
+        # 앱이 대신 만든 응답(400 등)은 버린 뒤 413 을 직접 보냄
+        # (receive 에서 예외를 던지면 BaseHTTPMiddleware 계층을 지나며 ExceptionGroup 으로 감싸짐)
+        received = 0
+        exceeded = False
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            if exceeded:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit and not started:
+                    exceeded = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        started = False
+        async def guarded_send(message: Message) -> None:
+            nonlocal started
+            if exceeded:
+                return
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not exceeded:
+                raise
+        if exceeded:
+            await _reject(send, limit, scope["path"])
+
+async def _reject(send: Send, limit: int, instance: str) -> None:
+    body = json.dumps(problem(
+        status=codes.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        title="Payload Too Large",
+        detail=f"Request body exceeds {limit} bytes",
+        instance=instance,
+    )).encode()
+    await send({"type": "http.response.start", "status": codes.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                "headers": [(b"content-type", b"application/problem+json"),
+                            (b"content-length", str(len(body)).encode()),
+                            (b"connection", b"close")]})
+    await send({"type": "http.response.body", "body": body})
+
+def add_body_limit(app: FastAPI):
+    app.add_middleware(
+        BodyLimitMiddleware,
+        default=settings.max_body_bytes,
+        routes={settings.API_PREFIX + prefix: limit for prefix, limit in settings.body_limit_routes.items()},
+    )
@@ -0,0 +1,300 @@
+"""
+compression.py
+---------------
+
+응답 압축 미들웨어 (Accept-Encoding 협상: zstd / br / gzip)
+
+목록/내보내기 문서(list_doc, /api/user/export), OpenAPI 스키마, 검증 오류(problem+json) 같은 큰 응답을
+압축해서 느린 모바일 회선의 전송량을 줄입니다.
+
+📌 동작 방식:
+    - 인코딩 선택: settings.compression_encodings 순서(서버 선호) 중 클라이언트가 q>0 으로 허용한 첫 번째
+        - br / zstd 는 brotli / zstandard 패키지가 설치된 경우에만 사용 (없으면 건너뜀, gzip 은 표준 라이브러리)
+    - 크기 기준: 본문이 compression_min_size 바이트 미만이면 압축하지 않음 (작은 응답은 CPU 를 쓰지 않음)
+        - Content-Length 가 있으면 그 값으로 판단 (기준 이상이면 본문을 다 모아 한 번에 압축),
+          없으면 기준 크기까지만 모아 보고 판단
+    - 스트리밍: 여러 청크로 나뉜 응답(StreamingResponse)은 청크마다 압축 후 flush 해서 바로 전송
+    - 이미 Content-Encoding 이 있거나, 압축 효과가 없는 타입(이미지 등), 204/304 는 그대로 통과
+    - 압축 대상 타입에는 항상 Vary: Accept-Encoding, 압축하면 강한 ETag 를 약한 ETag(W/)로 바꿈
+
+📌 미리 압축한 본문 캐시 (compression_cache_paths, 예: /openapi.json):
+    - 같은 본문이면 (경로, 인코딩, 본문 해시) 키로 압축 결과를 재사용 → 요청마다 압축 CPU 를 쓰지 않음
+    - 캐시 대상은 한 번만 압축하므로 더 높은 압축 수준(compression_cache_level_boost)을 사용
+    - 항목 수(compression_cache_size)와 본문 크기(compression_cache_max_bytes)로 메모리 상한
+
+캐시 적중/압축 건수는 `GET /api/admin/metrics` 의 compression.* 에서 확인할 수 있습니다.
+"""
+
+import gzip
+import hashlib
+import zlib
+from typing import Callable
+
+from fastapi import FastAPI
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.utils.metrics import metrics
+from app.utils.ttl_cache import TTLCache
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+_COMPRESSIBLE = (
+    "text/", "application/json", "application/problem+json", "application/vnd.api+json",
+    "application/x-ndjson", "application/javascript", "application/xml", "image/svg+xml",
+)
+
+# ---------------------------
+# 🗜️ 인코딩별 압축기
+# ---------------------------
+class _Gzip:
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)   # wbits 31 = gzip 헤더/트레일러
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+class _Brotli:
+    def __init__(self, quality: int):
+        self._obj = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data) + self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+class _Zstd:
+    def __init__(self, level: int):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+def _codecs() -> dict[str, tuple[Callable[[int], object], int, int]]:
+    """인코딩 → (압축기 생성자, 기본 수준, 최대 수준), 설치된 것만"""
+    codecs = {"gzip": (_Gzip, settings.compression_gzip_level, 9)}
+    if brotli is not None:
+        codecs["br"] = (_Brotli, settings.compression_brotli_quality, 11)
+    if zstandard is not None:
+        codecs["zstd"] = (_Zstd, settings.compression_zstd_level, 19)
+    return codecs
+
+def compress_once(encoding: str, body: bytes, level: int) -> bytes:
+    """본문 전체를 한 번에 압축 (캐시/벤치마크용)"""
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return zstandard.ZstdCompressor(level=level).compress(body)
+
+def negotiate(accept_encoding: str, preferred: list[str]) -> str | None:
+    """Accept-Encoding(q 값 포함) 중 서버 선호 순서로 첫 번째 허용 인코딩, 없으면 None"""
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            accepted[name.strip().lower()] = q
+    for encoding in preferred:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+# ---------------------------
+# 🧩 미들웨어
+# ---------------------------
+class CompressionMiddleware:
+    def __init__(
+        self, app: ASGIApp, *, min_size: int, encodings: list[str],
+        cache_paths: list[str], cache_size: int, cache_max_bytes: int, cache_level_boost: int,
+    ) -> None:
+        self.app = app
+        self.min_size = min_size
+        self.codecs = _codecs()
+        self.encodings = [e for e in encodings if e in self.codecs]
+        self.cache_paths = set(cache_paths)
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_level_boost = cache_level_boost
+        self.cache = TTLCache(maxsize=cache_size, ttl=settings.compression_cache_ttl_seconds)
+        for counter in ("compressed", "skipped_small", "streamed", "cache_hits", "cache_misses", "bytes_in", "bytes_out"):
+            metrics.inc(f"compression.{counter}", 0)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        cacheable = scope["method"] == "GET" and scope["path"] in self.cache_paths
+        await _Responder(self, encoding, scope["path"] if cacheable else None, send).run(self.app, scope, receive)
+
+class _Responder:
+    """응답 하나의 압축 상태 (start 메시지 보류 → 크기 판단 → 통과 / 한 번에 압축 / 스트리밍 압축)"""
+
+    def __init__(self, owner: CompressionMiddleware, encoding: str, cache_path: str | None, send: Send):
+        self.owner = owner
+        self.encoding = encoding
+        self.cache_path = cache_path
+        self.send = send
+        self.start: Message | None = None
+        self.buffer: list[bytes] = []
+        self.buffered = 0
+        self.mode = "undecided"     # undecided / identity / stream / done
+        self.expected: int | None = None
+        self.compressor = None
+
+    async def run(self, app: ASGIApp, scope: Scope, receive: Receive) -> None:
+        await app(scope, receive, self.on_send)
+
+    async def on_send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message.get("headers", []))
+            length = headers.get("content-length")
+            if (
+                message["status"] < 200 or message["status"] in (204, 304)
+                or "content-encoding" in headers
+                or not headers.get("content-type", "").startswith(_COMPRESSIBLE)
+            ):
+                self.mode = "identity"
+                await self.send(message)
+            elif length is not None and int(length) < self.owner.min_size:
+                metrics.inc("compression.skipped_small")
+                self.mode = "identity"
+                await self.send(self._vary_only(message))
+            elif length is not None and int(length) <= self.owner.cache_max_bytes:
+                # 크기를 아는 본문은 (BaseHTTPMiddleware 가 청크로 나눠 보내더라도) 다 모아서 한 번에 압축
+                self.expected = int(length)
+            return
+
+        if message["type"] != "http.response.body" or self.mode == "identity":
+            await self.send(message)
+            return
+        if self.mode == "done":     # 한 번에 보낸 뒤 남은 빈 종료 메시지
+            return
+
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+        if self.mode == "stream":
+            await self._send_chunk(body, more)
+            return
+
+        # 아직 판단 전: 크기를 알면 전부, 모르면 기준 크기에 닿거나 본문이 끝날 때까지 모음
+        self.buffer.append(body)
+        self.buffered += len(body)
+        if more and self.buffered < (self.expected if self.expected is not None else self.owner.min_size):
+            return
+        data = b"".join(self.buffer)
+        self.buffer = []
+        if not more or self.expected is not None:
+            await self._send_complete(data)
+            self.mode = "done"
+        else:
+            metrics.inc("compression.streamed")
+            self.mode = "stream"
+            await self.send(self._compressed_start(None))
+            await self._send_chunk(data, more)
+
+    # ---------------------------
+    # 전송 도우미
+    # ---------------------------
+    async def _send_complete(self, data: bytes) -> None:
+        if len(data) < self.owner.min_size:
+            metrics.inc("compression.skipped_small")
+            self.mode = "identity"
+            await self.send(self._vary_only(self.start))
+            await self.send({"type": "http.response.body", "body": data})
+            return
+        compressed = self._compress_whole(data)
+        metrics.inc("compression.compressed")
+        metrics.inc("compression.bytes_in", len(data))
+        metrics.inc("compression.bytes_out", len(compressed))
+        await self.send(self._compressed_start(len(compressed)))
+        await self.send({"type": "http.response.body", "body": compressed})
+
+    async def _send_chunk(self, data: bytes, more: bool) -> None:
+        if self.compressor is None:
+            factory, level, _ = self.owner.codecs[self.encoding]
+            self.compressor = factory(level)
+        out = self.compressor.compress(data) if data else b""
+        if not more:
+            out += self.compressor.finish()
+        metrics.inc("compression.bytes_in", len(data))
+        metrics.inc("compression.bytes_out", len(out))
+        await self.send({"type": "http.response.body", "body": out, "more_body": more})
+
+    def _compress_whole(self, data: bytes) -> bytes:
+        _, level, max_level = self.owner.codecs[self.encoding]
+        if self.cache_path is None or self.start["status"] != 200 or len(data) > self.owner.cache_max_bytes:
+            return compress_once(self.encoding, data, level)
+        key = (self.cache_path, self.encoding, hashlib.blake2b(data, digest_size=16).digest())
+        cached = self.owner.cache.get(key)
+        if cached is not None:
+            metrics.inc("compression.cache_hits")
+            return cached
+        metrics.inc("compression.cache_misses")
+        compressed = compress_once(self.encoding, data, min(max_level, level + self.owner.cache_level_boost))
+        self.owner.cache.set(key, compressed)
+        return compressed
+
+    def _vary_only(self, message: Message) -> Message:
+        message = {**message, "headers": list(message.get("headers", []))}
+        _add_vary(MutableHeaders(raw=message["headers"]))
+        return message
+
+    def _compressed_start(self, length: int | None) -> Message:
+        message = {**self.start, "headers": list(self.start.get("headers", []))}
+        headers = MutableHeaders(raw=message["headers"])
+        _add_vary(headers)
+        headers["Content-Encoding"] = self.encoding
+        if length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(length)
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag   # 바이트 표현이 달라지므로 약한 ETag (If-None-Match 비교는 W/ 무시)
+        return message
+
+def _add_vary(headers: MutableHeaders) -> None:
+    vary = headers.get("vary", "")
+    if "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+
+def add_compression(app: FastAPI):
+    if not settings.compression_enabled:
+        return
+    app.add_middleware(
+        CompressionMiddleware,
+        min_size=settings.compression_min_size,
+        encodings=settings.compression_encodings,
+        cache_paths=settings.compression_cache_paths,
+        cache_size=settings.compression_cache_size,
+        cache_max_bytes=settings.compression_cache_max_bytes,
+        cache_level_boost=settings.compression_cache_level_boost,
+    )
@@ -0,0 +1,104 @@
+"""
+deadline.py
+------------
+
+요청 마감 시각(deadline) 미들웨어
+
+- 경로별 제한 시간(settings.request_timeout_routes, 가장 긴 prefix 우선, 없으면 request_timeout_seconds)을
+  contextvar 로 설정 → DB statement timeout 으로 전파 (utils/deadline.py)
+- 시간이 지나면 바로 504 problem+json 응답 (경로 prefix 는 API_PREFIX 기준 상대 경로)
+- 핸들러 태스크는 취소하지 않고 끝날 때까지 기다리며, 이후 앱이 보내는 메시지는 버립니다.
+    - 동기 핸들러는 스레드를 강제로 멈출 수 없으므로, 실행 중인 쿼리는 DB 타임아웃으로 중단되고
+      다음 SQL 실행 시점에 DeadlineExceeded 로 끝납니다.
+    - 취소하면 FastAPI 가 get_db 정리(db.close())를 다른 스레드에서 바로 실행해,
+      아직 핸들러 스레드가 쓰고 있는 Session 을 동시에 건드리게 됩니다 (Session 은 스레드 안전하지 않음).
+      기다리면 세션 정리는 핸들러가 끝난 뒤에 순서대로 일어납니다.
+- 응답을 이미 보내기 시작한 뒤(스트리밍)에는 상태 코드를 바꿀 수 없으므로,
+  다음 send 에서 예외를 던져 앱이 스스로 응답을 중단하게 합니다 (연결 끊김과 같은 처리).
+"""
+
+import asyncio
+import json
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.errors import codes
+from app.errors.problem_details import problem
+from app.utils.deadline import DeadlineExceeded, deadline_scope
+from app.utils.metrics import metrics
+
+class DeadlineMiddleware:
+    def __init__(self, app: ASGIApp, default: float, routes: dict[str, float]) -> None:
+        self.app = app
+        self.default = default
+        # 긴 prefix 부터 검사
+        self.routes = sorted(routes.items(), key=lambda kv: len(kv[0]), reverse=True)
+
+    def timeout_for(self, path: str) -> float:
+        for prefix, seconds in self.routes:
+            if path.startswith(prefix):
+                return seconds
+        return self.default
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        seconds = self.timeout_for(scope["path"])
+        if not seconds:
+            await self.app(scope, receive, send)
+            return
+
+        started = False
+        expired = False
+        app_timed_out = False   # 앱(errors/handlers.py)이 직접 504 를 만들었는지 (metrics 중복 방지)
+        async def guarded_send(message: Message) -> None:
+            nonlocal started, app_timed_out
+            if expired:
+                if message["type"] == "http.response.start":
+                    app_timed_out = message["status"] == codes.HTTP_504_GATEWAY_TIMEOUT
+                if started:
+                    raise DeadlineExceeded()   # 스트리밍 중 → 앱이 응답 생성을 멈추도록
+                return
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        with deadline_scope(seconds):
+            task = asyncio.ensure_future(self.app(scope, receive, guarded_send))
+            try:
+                await asyncio.wait({task}, timeout=seconds)
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            if task.done():
+                task.result()
+                return
+
+            expired = True
+            if not started:
+                body = json.dumps(problem(
+                    status=codes.HTTP_504_GATEWAY_TIMEOUT,
+                    title="Gateway Timeout",
+                    detail=f"Request exceeded its {seconds:g}s deadline",
+                    instance=scope["path"],
+                )).encode()
+                await send({"type": "http.response.start", "status": codes.HTTP_504_GATEWAY_TIMEOUT,
+                            "headers": [(b"content-type", b"application/problem+json"),
+                                        (b"content-length", str(len(body)).encode())]})
+                await send({"type": "http.response.body", "body": body})
+            try:
+                await task
+            except Exception:
+                pass   # 응답은 이미 끝남 → 마감 이후 앱에서 난 오류(DeadlineExceeded 등)는 버림
+            if not app_timed_out:
+                metrics.inc("deadline_exceeded")
+
+def add_deadline(app: FastAPI):
+    app.add_middleware(
+        DeadlineMiddleware,
+        default=settings.request_timeout_seconds,
+        routes={settings.API_PREFIX + prefix: seconds for prefix, seconds in settings.request_timeout_routes.items()},
+    )
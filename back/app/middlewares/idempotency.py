@@ -0,0 +1,147 @@
+"""
+idempotency.py
+---------------
+
+`Idempotency-Key` 헤더 기반 POST 재시도 안전 처리 미들웨어
+
+네트워크 타임아웃 뒤 클라이언트가 같은 요청을 다시 보내면 bcrypt 해싱/DB 쓰기가 반복되고,
+회원가입은 중복 오류로 실패합니다. 이 미들웨어는:
+
+    - (클라이언트 IP + 메서드 + 경로 + Idempotency-Key) 단위로 첫 응답을 저장하고
+    - 같은 키로 다시 오면 핸들러를 실행하지 않고 저장된 응답을 그대로 재생합니다 (`Idempotent-Replayed: true`)
+    - 같은 키인데 본문이 다르면 422, 첫 요청이 아직 처리 중이면 409 (+ Retry-After) 를 돌려줍니다.
+    - 5xx 응답은 저장하지 않으므로 재시도하면 다시 실행됩니다.
+
+저장소는 프로세스 메모리 TTL 캐시(settings.idempotency_ttl_seconds, 최대 idempotency_max_keys 개)이며,
+워커 간 공유가 필요하면 Redis 등으로 교체하세요.
+"""
+
+import hashlib
+import json
+import threading
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.errors import codes
+from app.errors.problem_details import problem
+from app.utils.ttl_cache import TTLCache
+
+HEADER = b"idempotency-key"
+MAX_KEY_LENGTH = 255
+MAX_STORED_BODY = 64 * 1024   # 이보다 큰 응답은 저장하지 않음
+
+class _InFlight:
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+
+class _Stored:
+    def __init__(self, fingerprint: str, status: int, headers: list, body: bytes):
+        self.fingerprint = fingerprint
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+class IdempotencyMiddleware:
+    def __init__(self, app: ASGIApp, routes: set[tuple[str, str]], ttl: int, max_keys: int) -> None:
+        self.app = app
+        self.routes = routes
+        self.store = TTLCache(maxsize=max_keys, ttl=ttl)
+        self._lock = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or (scope["method"], scope["path"]) not in self.routes:
+            await self.app(scope, receive, send)
+            return
+        key = next((v for k, v in scope["headers"] if k == HEADER), None)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _problem(send, codes.HTTP_400_BAD_REQUEST, "Invalid Idempotency-Key", scope["path"])
+            return
+
+        # 본문 지문(fingerprint) 계산을 위해 전체 본문을 먼저 읽고, 앱에는 그대로 다시 흘려보냄
+        body = b""
+        more = True
+        while more:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+        fingerprint = hashlib.sha256(body).hexdigest()
+
+        client = scope.get("client")
+        scope_key = hashlib.sha256(
+            b"\x1f".join([
+                (client[0] if client else "-").encode(), scope["method"].encode(), scope["path"].encode(), key,
+            ])
+        ).hexdigest()
+
+        with self._lock:
+            entry = self.store.get(scope_key)
+            if entry is None:
+                self.store.set(scope_key, _InFlight(fingerprint))
+
+        if entry is not None:
+            if entry.fingerprint != fingerprint:
+                await _problem(send, codes.HTTP_422_UNPROCESSABLE_ENTITY,
+                               "Idempotency-Key reused with a different request body", scope["path"])
+            elif isinstance(entry, _InFlight):
+                await _problem(send, codes.HTTP_409_CONFLICT,
+                               "A request with this Idempotency-Key is still in progress", scope["path"],
+                               extra_headers=[(b"retry-after", b"1")])
+            else:
+                await send({"type": "http.response.start", "status": entry.status,
+                            "headers": entry.headers + [(b"idempotent-replayed", b"true")]})
+                await send({"type": "http.response.body", "body": entry.body})
+            return
+
+        sent_body = False
+        async def replay_receive() -> Message:
+            nonlocal sent_body
+            if not sent_body:
+                sent_body = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        captured: dict = {"status": None, "headers": [], "body": b"", "too_big": False}
+        async def capture_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = list(message.get("headers", []))
+            elif message["type"] == "http.response.body" and not captured["too_big"]:
+                captured["body"] += message.get("body", b"")
+                captured["too_big"] = len(captured["body"]) > MAX_STORED_BODY
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        finally:
+            status = captured["status"]
+            if status is None or status >= 500 or captured["too_big"]:
+                self.store.pop(scope_key)   # 실패 → 재시도 시 다시 실행되도록
+            else:
+                self.store.set(scope_key, _Stored(fingerprint, status, captured["headers"], captured["body"]))
+
+async def _problem(send: Send, status: int, detail: str, instance: str, extra_headers: list | None = None) -> None:
+    body = json.dumps(problem(status=status, title="Idempotency Error", detail=detail, instance=instance)).encode()
+    headers = [(b"content-type", b"application/problem+json"), (b"content-length", str(len(body)).encode())]
+    await send({"type": "http.response.start", "status": status, "headers": headers + (extra_headers or [])})
+    await send({"type": "http.response.body", "body": body})
+
+def add_idempotency(app: FastAPI):
+    # 멱등 키를 지원할 POST 엔드포인트 (비용이 큰 bcrypt/DB 쓰기 경로)
+    routes = {
+        ("POST", f"{settings.API_PREFIX}/user/register"),
+        ("POST", f"{settings.API_PREFIX}/auth/login"),
+        ("POST", f"{settings.API_PREFIX}/operations"),
+    }
+    app.add_middleware(
+        IdempotencyMiddleware,
+        routes=routes,
+        ttl=settings.idempotency_ttl_seconds,
+        max_keys=settings.idempotency_max_keys,
+    )
@@ -0,0 +1,168 @@
+"""
+load_shed.py
+-------------
+
+적응형 동시성 제한(admission control) + 부하 차단 미들웨어
+
+트래픽이 몰리면 동기 라우터는 anyio 스레드풀과 DB 커넥션 풀 앞에서 끝없이 줄을 서고,
+실패하기 전까지 지연 시간만 계속 늘어납니다. 이 미들웨어는 앞단에서 동시 처리 수를 제한합니다.
+
+📌 동작 방식:
+    - 경로 prefix 그룹마다 AdaptiveLimiter 하나 (settings.concurrency_routes, API_PREFIX 기준 / 나머지는 "default" 그룹)
+    - 한도 안이면 바로 처리, 한도를 넘으면 최대 concurrency_queue_timeout_ms 동안 대기
+    - 대기열이 가득 찼거나 대기 시간이 지나면 즉시 503 + Retry-After (problem+json)
+    - AIMD 로 한도 조정:
+        - 목표 지연(target) 이내로 끝난 요청마다 한도 += 1/한도 (한도만큼 성공하면 약 +1)
+        - 목표를 넘기거나 5xx 면 한도 *= 0.9 (목표 지연 시간당 최대 한 번)
+
+그룹별 한도/처리 중/대기 수와 차단 건수는 `GET /api/admin/metrics` 에서 확인할 수 있습니다.
+※ 단일 이벤트 루프에서만 접근하므로 Lock 없이 동작합니다 (워커 프로세스마다 따로 존재).
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.errors import codes
+from app.errors.problem_details import problem
+from app.utils.metrics import metrics
+
+class AdaptiveLimiter:
+    def __init__(self, name: str, *, initial: int, min_limit: int, max_limit: int,
+                 target: float, backoff: float = 0.9):
+        self.name = name
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target = target          # 목표 지연(초)
+        self.backoff = backoff
+        self.inflight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+
+        metrics.gauge(f"concurrency.{name}.limit", lambda: int(self.limit))
+        metrics.gauge(f"concurrency.{name}.inflight", lambda: self.inflight)
+        metrics.gauge(f"concurrency.{name}.queued", lambda: len(self._waiters))
+
+    async def acquire(self, timeout: float) -> bool:
+        """슬롯 확보. 대기열이 가득 찼거나 timeout 안에 못 얻으면 False"""
+        if self.inflight < int(self.limit) and not self._waiters:
+            self.inflight += 1
+            return True
+        if timeout <= 0 or len(self._waiters) >= int(self.limit):
+            return False
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            return await asyncio.wait_for(fut, timeout)
+        except TimeoutError:
+            return False
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self._hand_off()   # 슬롯을 받은 직후 취소됨 → 다음 대기자에게 반납
+            raise
+        finally:
+            if not fut.done() or fut.cancelled():
+                try:
+                    self._waiters.remove(fut)
+                except ValueError:
+                    pass
+
+    def release(self, latency: float, ok: bool) -> None:
+        """처리 완료: 지연 시간으로 한도 조정 후, 대기 중인 요청에 슬롯 넘김"""
+        if ok and latency <= self.target:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        else:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.target:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+        self._hand_off()
+
+    def _hand_off(self) -> None:
+        """슬롯 하나 반납 후, 빈 슬롯 수(한도 - 처리 중)만큼 대기 요청을 깨움 (한도가 늘었으면 여럿)"""
+        self.inflight -= 1
+        while self._waiters and self.inflight < int(self.limit):
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(True)
+                self.inflight += 1
+
+class LoadShedMiddleware:
+    def __init__(self, app: ASGIApp, routes: dict[str, float], *, initial: int, min_limit: int,
+                 max_limit: int, target_ms: float, queue_timeout_ms: float) -> None:
+        self.app = app
+        self.queue_timeout = queue_timeout_ms / 1000
+        self.retry_after = str(max(1, round(target_ms / 1000))).encode()
+
+        def limiter(name: str, target: float) -> AdaptiveLimiter:
+            return AdaptiveLimiter(name, initial=initial, min_limit=min_limit,
+                                   max_limit=max_limit, target=target / 1000)
+
+        # (prefix, limiter | None) — 긴 prefix 부터 검사, 목표 지연 0 인 그룹은 제한 제외
+        self.routes = [
+            (prefix, limiter(prefix, ms) if ms else None)
+            for prefix, ms in sorted(routes.items(), key=lambda kv: len(kv[0]), reverse=True)
+        ]
+        self.default = limiter("default", target_ms)
+
+    def limiter_for(self, path: str) -> AdaptiveLimiter | None:
+        for prefix, lim in self.routes:
+            if path.startswith(prefix):
+                return lim
+        return self.default
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        lim = self.limiter_for(scope["path"]) if scope["type"] == "http" else None
+        if lim is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await lim.acquire(self.queue_timeout):
+            metrics.inc(f"concurrency.{lim.name}.shed")
+            await self._reject(scope, send)
+            return
+
+        status = 500
+        async def track_send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, track_send)
+        finally:
+            lim.release(time.monotonic() - started, status < 500)
+
+    async def _reject(self, scope: Scope, send: Send) -> None:
+        body = json.dumps(problem(
+            status=codes.HTTP_503_SERVICE_UNAVAILABLE,
+            title="Service Unavailable",
+            detail="Server is overloaded, retry later",
+            instance=scope["path"],
+        )).encode()
+        await send({"type": "http.response.start", "status": codes.HTTP_503_SERVICE_UNAVAILABLE,
+                    "headers": [(b"content-type", b"application/problem+json"),
+                                (b"content-length", str(len(body)).encode()),
+                                (b"retry-after", self.retry_after)]})
+        await send({"type": "http.response.body", "body": body})
+
+def add_load_shed(app: FastAPI):
+    if not settings.concurrency_limit_enabled:
+        return
+    app.add_middleware(
+        LoadShedMiddleware,
+        routes={settings.API_PREFIX + prefix: ms for prefix, ms in settings.concurrency_routes.items()},
+        initial=settings.concurrency_initial_limit,
+        min_limit=settings.concurrency_min_limit,
+        max_limit=settings.concurrency_max_limit,
+        target_ms=settings.concurrency_target_latency_ms,
+        queue_timeout_ms=settings.concurrency_queue_timeout_ms,
+    )
@@ -0,0 +1,223 @@
+"""
+profiler.py
+------------
+
+요청 단위 온디맨드 프로파일링 미들웨어
+
+운영 중 느린 요청의 Python 레벨 병목을 보기 위한 opt-in 훅입니다.
+`settings.profiling_enabled` 가 False 면 미들웨어 자체를 등록하지 않으므로 오버헤드가 0 입니다.
+
+📌 캡처 트리거 (셋 중 하나라도 해당하면 해당 요청을 프로파일링)
+    1. 서명 헤더:   `X-Profile-Token: <unix ts>.<hmac>`  (make_profile_token() 으로 발급, 5분 유효)
+    2. 관리자 토글: POST /api/admin/profiles/arm → 다음 N개 요청 캡처
+    3. 샘플링:      settings.profiling_sample_rate = N → N개 요청 중 1개 캡처 (0이면 비활성)
+
+📌 캡처 방식 (settings.profiling_mode)
+    - "sample"  : 백그라운드 스레드가 주기적으로 스택을 수집 → `.folded` (flamegraph.pl / speedscope 입력 형식)
+                  동기 라우터는 스레드풀에서 실행되므로 이 방식을 권장합니다.
+                  app/ 코드를 실행 중인 스레드만 집계하므로, 동시에 처리 중인 다른 요청의 샘플이 섞일 수 있습니다.
+    - "cprofile": 이벤트 루프 스레드에서 cProfile → `.pstats` (async 경로 분석용, 스레드풀 작업은 보이지 않음)
+
+결과 파일은 settings.profiling_dir 아래에 저장되며, profiling_max_files 개를 넘으면 오래된 것부터 삭제됩니다(링 버퍼).
+"""
+
+import cProfile
+import hashlib
+import hmac
+import itertools
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config.settings import settings
+
+TOKEN_HEADER = b"x-profile-token"
+TOKEN_MAX_AGE = 5 * 60   # 서명 헤더 유효 시간(초)
+
+_APP_DIR = str(Path(__file__).resolve().parents[1])   # .../back/app
+_SAFE_NAME = re.compile(r"^[0-9]+-[A-Za-z0-9_.-]+\.(folded|pstats)$")
+
+# ---------------------------
+# 🔐 서명 헤더
+# ---------------------------
+def _sign(ts: str) -> str:
+    return hmac.new(settings.secret_key.encode("utf-8"), f"profile:{ts}".encode("utf-8"), hashlib.sha256).hexdigest()
+
+def make_profile_token(now: float | None = None) -> str:
+    """
+    X-Profile-Token 헤더 값 발급 (관리자용)
+    예: curl -H "X-Profile-Token: $(python -c 'from app.middlewares.profiler import make_profile_token as t; print(t())')" ...
+    """
+    ts = str(int(now if now is not None else time.time()))
+    return f"{ts}.{_sign(ts)}"
+
+def _valid_token(value: str) -> bool:
+    ts, _, sig = value.partition(".")
+    if not ts.isdigit() or abs(time.time() - int(ts)) > TOKEN_MAX_AGE:
+        return False
+    return hmac.compare_digest(sig, _sign(ts))
+
+# ---------------------------
+# 🎛️ 런타임 상태 (관리자 토글)
+# ---------------------------
+class ProfilerState:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._armed = 0
+        self._counter = itertools.count(1)
+
+    def arm(self, count: int) -> int:
+        """다음 count 개 요청을 캡처하도록 설정, 남은 개수 반환"""
+        with self._lock:
+            self._armed = max(0, count)
+            return self._armed
+
+    @property
+    def armed(self) -> int:
+        return self._armed
+
+    def take_armed(self) -> bool:
+        if not self._armed:   # 잠금 없이 빠르게 확인 (대부분의 요청)
+            return False
+        with self._lock:
+            if self._armed:
+                self._armed -= 1
+                return True
+            return False
+
+    def sampled(self) -> bool:
+        rate = settings.profiling_sample_rate
+        return rate > 0 and next(self._counter) % rate == 0
+
+profiler_state = ProfilerState()
+
+# ---------------------------
+# 💾 결과 저장소 (디스크 링 버퍼)
+# ---------------------------
+def _profile_dir() -> Path:
+    path = Path(settings.profiling_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+def _save(method: str, path: str, duration_ms: int, ext: str, write) -> str:
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", path.strip("/")) or "root"
+    name = f"{time.time_ns() // 1_000_000}-{method}-{slug[:80]}-{duration_ms}ms.{ext}"
+    directory = _profile_dir()
+    write(directory / name)
+
+    # 링 버퍼: 최대 개수를 넘으면 오래된 파일부터 삭제
+    files = sorted(p for p in directory.iterdir() if _SAFE_NAME.match(p.name))
+    for old in files[:-settings.profiling_max_files]:
+        old.unlink(missing_ok=True)
+    return name
+
+def list_profiles() -> list[dict]:
+    """저장된 프로파일 목록 (최신순)"""
+    directory = _profile_dir()
+    items = []
+    for p in sorted(directory.iterdir(), reverse=True):
+        if _SAFE_NAME.match(p.name):
+            stat = p.stat()
+            items.append({"name": p.name, "size": stat.st_size, "created_at": int(stat.st_mtime)})
+    return items
+
+def profile_path(name: str) -> Path | None:
+    """다운로드용 파일 경로 (이름 검증으로 경로 탈출 방지)"""
+    if not _SAFE_NAME.match(name):
+        return None
+    path = _profile_dir() / name
+    return path if path.is_file() else None
+
+# ---------------------------
+# 📈 스택 샘플러
+# ---------------------------
+class _StackSampler(threading.Thread):
+    def __init__(self, interval: float):
+        super().__init__(daemon=True, name="request-profiler")
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._halt = threading.Event()
+
+    def run(self) -> None:
+        me = threading.get_ident()
+        while not self._halt.wait(self.interval):
+            for tid, frame in sys._current_frames().items():
+                if tid == me:
+                    continue
+                stack = []
+                in_app = False
+                while frame is not None:
+                    code = frame.f_code
+                    in_app = in_app or code.co_filename.startswith(_APP_DIR)
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                # app/ 코드를 실행 중인 스레드만 집계 (유휴 스레드풀/서버 스레드 제외)
+                if in_app:
+                    self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._halt.set()
+        self.join()
+
+    def write(self, path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+# ---------------------------
+# 🧩 미들웨어
+# ---------------------------
+class ProfilerMiddleware:
+    def __init__(self, app: ASGIApp, mode: str = "sample", interval: float = 0.001) -> None:
+        self.app = app
+        self.mode = mode
+        self.interval = interval
+
+    def _triggered(self, scope: Scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == TOKEN_HEADER:
+                return _valid_token(value.decode("latin-1"))
+        return profiler_state.take_armed() or profiler_state.sampled()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._triggered(scope):
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        if self.mode == "cprofile":
+            prof = cProfile.Profile()
+            prof.enable()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                prof.disable()
+                duration_ms = round((time.perf_counter() - start) * 1000)
+                _save(scope["method"], scope["path"], duration_ms, "pstats", prof.dump_stats)
+            return
+
+        sampler = _StackSampler(self.interval)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            sampler.stop()
+            duration_ms = round((time.perf_counter() - start) * 1000)
+            _save(scope["method"], scope["path"], duration_ms, "folded", sampler.write)
+
+def add_profiler(app: FastAPI):
+    # 비활성 시 미들웨어를 등록하지 않음 → 요청 경로 오버헤드 없음
+    if not settings.profiling_enabled:
+        return
+    app.add_middleware(
+        ProfilerMiddleware,
+        mode=settings.profiling_mode,
+        interval=settings.profiling_interval_ms / 1000,
+    )
@@ -1,10 +1,231 @@
-from starlette.middleware.sessions import SessionMiddleware
+"""
+session.py
+-----------
+
+세션 쿠키 미들웨어 (Lazy 방식)
+
+Starlette 기본 `SessionMiddleware` 는 모든 요청마다 쿠키를 파싱/서명 검증하고,
+세션이 비어 있지 않으면 모든 응답마다 다시 서명해서 Set-Cookie 를 내려보냅니다.
+대부분의 라우터는 `request.session` 을 쓰지 않으므로 이 비용이 그대로 낭비됩니다.
+
+이 모듈의 `LazySessionMiddleware` 는:
+    - `request.session` 에 처음 접근할 때만 쿠키를 읽고 서명을 검증하며
+    - 세션 내용이 실제로 바뀐 경우에만 다시 서명하여 Set-Cookie 를 보냅니다.
+      (`session["cart"].append(1)` 처럼 값 내부만 바꾼 경우도 로드 시점 직렬화와 비교해 감지)
+    - `settings.session_store == "memory"` 이면 쿠키에는 서명된 세션 ID 만 담고
+      실제 데이터는 서버 메모리(TTL 캐시)에 보관합니다 (쿠키 크기 최소화).
+
+※ 기본 SessionMiddleware 와 달리 "읽기만 한" 요청에서는 쿠키 만료 시간을 연장하지 않습니다.
+"""
+
+import copy
+import hashlib
+import json
+import secrets
+from base64 import b64decode, b64encode
+from collections.abc import MutableMapping
+from http.cookies import SimpleCookie
+from typing import Any, Iterator
+
+import itsdangerous
+from itsdangerous.exc import BadSignature
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
 from app.config.settings import settings
+from app.utils.ttl_cache import TTLCache
+
+class MemorySessionStore:
+    """
+    서버 측 세션 저장소 (프로세스 메모리)
+    - 워커 간 공유가 필요하면 같은 인터페이스(load/save/delete)로 Redis 등 구현체를 만들어 교체
+    """
+    def __init__(self, max_age: int, maxsize: int = 100_000):
+        self._cache = TTLCache(maxsize=maxsize, ttl=max_age)
+
+    def load(self, sid: str) -> dict | None:
+        # 복사본을 돌려줌 → 요청이 save 없이 내용을 바꿔도 저장된 세션은 그대로
+        data = self._cache.get(sid)
+        return None if data is None else copy.deepcopy(data)
+
+    def save(self, sid: str, data: dict) -> None:
+        self._cache.set(sid, copy.deepcopy(data))
+
+    def delete(self, sid: str) -> None:
+        self._cache.pop(sid)
+
+def _fingerprint(data: dict[str, Any]) -> object:
+    """세션 내용 비교용 해시 (직렬화 불가 값이 섞이면 항상 '바뀜'으로 취급)"""
+    try:
+        raw = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return object()
+    return hashlib.sha256(raw.encode("utf-8")).digest()
+
+class LazySession(MutableMapping):
+    """
+    첫 접근 시점에만 쿠키 헤더를 파싱하고 서명을 검증하는 세션 dict
+    - loaded: 한 번이라도 접근했는지
+    - modified: 최상위 키를 설정/삭제했는지
+    - changed: 응답에서 재서명할지 (modified 이거나, 값 내부 변경으로 직렬화 결과가 로드 시점과 다름)
+    - had_cookie: 요청에 세션 쿠키가 있었는지 (비워졌을 때 삭제 쿠키 발송 여부)
+    """
+    def __init__(self, middleware: "LazySessionMiddleware", scope: Scope):
+        self._mw = middleware
+        self._scope = scope
+        self._data: dict[str, Any] | None = None
+        self._loaded_fp: object = None
+        self.sid: str | None = None
+        self.modified = False
+        self.had_cookie = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    def _load(self) -> dict[str, Any]:
+        if self._data is None:
+            raw = self._mw.raw_cookie(self._scope)
+            self.had_cookie = raw is not None
+            self._data, self.sid = self._mw.decode(raw)
+            self._loaded_fp = _fingerprint(self._data)
+        return self._data
+
+    @property
+    def changed(self) -> bool:
+        if not self.loaded:
+            return False
+        return self.modified or _fingerprint(self._data) != self._loaded_fp
+
+    def __getitem__(self, key: str) -> Any:
+        return self._load()[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._load()[key] = value
+        self.modified = True
+
+    def __delitem__(self, key: str) -> None:
+        del self._load()[key]
+        self.modified = True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def clear(self) -> None:
+        # MutableMapping.clear 는 popitem 반복 → 한 번에 비우기
+        if self._load():
+            self._data.clear()
+            self.modified = True
+
+    def __repr__(self) -> str:
+        return f"LazySession({self._data if self.loaded else '<not loaded>'})"
+
+class LazySessionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        secret_key: str,
+        session_cookie: str = "session",
+        max_age: int = 14 * 24 * 60 * 60,
+        path: str = "/",
+        same_site: str = "lax",
+        https_only: bool = False,
+        store: MemorySessionStore | None = None,
+    ) -> None:
+        self.app = app
+        self.signer = itsdangerous.TimestampSigner(str(secret_key))
+        self.session_cookie = session_cookie
+        self.max_age = max_age
+        self.path = path
+        self.store = store
+        self.security_flags = "httponly; samesite=" + same_site
+        if https_only:
+            self.security_flags += "; secure"
+
+    # --- 쿠키 <-> 세션 변환 ---
+    def decode(self, raw: str | None) -> tuple[dict[str, Any], str | None]:
+        """
+        서명된 쿠키 값 → (세션 dict, 서버 측 세션 ID)
+        - 서명 불일치/만료/손상 시 빈 세션
+        """
+        if not raw:
+            return {}, None
+        try:
+            payload = self.signer.unsign(raw.encode("utf-8"), max_age=self.max_age)
+        except BadSignature:
+            return {}, None
+        if self.store is not None:
+            sid = payload.decode("utf-8")
+            data = self.store.load(sid)
+            return (data, sid) if data is not None else ({}, None)
+        try:
+            return json.loads(b64decode(payload)), None
+        except ValueError:
+            return {}, None
+
+    def encode(self, session: LazySession) -> str:
+        data = dict(session)
+        if self.store is not None:
+            session.sid = session.sid or secrets.token_urlsafe(32)
+            self.store.save(session.sid, data)
+            payload = session.sid.encode("utf-8")
+        else:
+            payload = b64encode(json.dumps(data).encode("utf-8"))
+        return self.signer.sign(payload).decode("utf-8")
+
+    def raw_cookie(self, scope: Scope) -> str | None:
+        for name, value in scope.get("headers", []):
+            if name == b"cookie":
+                cookie = SimpleCookie()
+                cookie.load(value.decode("latin-1"))
+                morsel = cookie.get(self.session_cookie)
+                if morsel is not None:
+                    return morsel.value
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        # 쿠키 헤더 파싱/서명 검증은 세션 첫 접근 시점까지 미룸
+        session = LazySession(self, scope)
+        scope["session"] = session
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and session.changed:
+                headers = MutableHeaders(scope=message)
+                if len(session):
+                    value = self.encode(session)
+                    headers.append(
+                        "Set-Cookie",
+                        f"{self.session_cookie}={value}; path={self.path}; "
+                        f"Max-Age={self.max_age}; {self.security_flags}",
+                    )
+                elif session.had_cookie:
+                    if self.store is not None and session.sid:
+                        self.store.delete(session.sid)
+                    headers.append(
+                        "Set-Cookie",
+                        f"{self.session_cookie}=null; path={self.path}; "
+                        f"expires=Thu, 01 Jan 1970 00:00:00 GMT; {self.security_flags}",
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
 
 def add_session_middleware(app):
+    store = None
+    if settings.session_store == "memory":
+        store = MemorySessionStore(max_age=settings.session_max_age)
     app.add_middleware(
-        SessionMiddleware,
+        LazySessionMiddleware,
         secret_key=settings.secret_key,  # 필요 시 settings.SECRET_KEY로 치환
+        max_age=settings.session_max_age,
         https_only=(settings.env == "prod"),
         same_site="none" if settings.env == "prod" else "lax",
+        store=store,
     )
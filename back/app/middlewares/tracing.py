@@ -0,0 +1,70 @@
+"""
+tracing.py
+-----------
+
+요청 진입 span + W3C traceparent 전파 미들웨어
+
+- 요청의 `traceparent` 헤더가 있으면 그 trace 를 이어받고(샘플링 결정 포함), 없으면
+  settings.tracing_sample_rate 확률로 새 trace 를 샘플링합니다 (head 기반 샘플링).
+- 응답에 `traceparent` 헤더를 붙여 클라이언트/게이트웨이 로그와 연결할 수 있게 합니다.
+- add_tracing() 은 서비스/레포지토리 모듈 함수와 DB 엔진(샤드 포함)도 함께 계측합니다.
+  span 은 utils/tracing.exporter 가 배치로 내보냅니다 (lifespan 에서 start/stop).
+
+settings.tracing_enabled=False 면 아무것도 등록하지 않습니다 (오버헤드 없음).
+"""
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import sharding
+from app.config.settings import settings
+from app.database import engine
+from app.repository import analytics_repo, auth_repo, user_repo
+from app.services import analytics_service, auth_service, search_service, user_service
+from app.utils import tracing
+
+class TracingMiddleware:
+    def __init__(self, app: ASGIApp, sample_rate: float) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        header = next((v for k, v in scope["headers"] if k == b"traceparent"), None)
+        span = tracing.start_root(
+            f'{scope["method"]} {scope["path"]}',
+            traceparent=header.decode("latin-1") if header else None,
+            sample_rate=self.sample_rate,
+        )
+        span.set("span.kind", "server")
+        span.set("http.method", scope["method"])
+        span.set("http.target", scope["path"])
+        traceparent = tracing.format_traceparent(span).encode()
+
+        async def traced_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                span.set("http.status_code", message["status"])
+                message = {**message, "headers": [*message.get("headers", []), (b"traceparent", traceparent)]}
+            await send(message)
+
+        with tracing.activate(span):
+            await self.app(scope, receive, traced_send)
+
+def add_tracing(app: FastAPI):
+    if not settings.tracing_enabled:
+        return
+    for module in (auth_service, user_service, search_service, analytics_service,
+                   auth_repo, user_repo, analytics_repo):
+        tracing.instrument_module(module)
+    for bind in (engine, *sharding.engines()):
+        tracing.instrument_engine(bind)
+    tracing.exporter.configure(
+        kind=settings.tracing_exporter,
+        target=settings.tracing_endpoint if settings.tracing_exporter == "http" else settings.tracing_file,
+        batch_size=settings.tracing_batch_size,
+        flush_interval=settings.tracing_flush_interval,
+        max_queue=settings.tracing_max_queue,
+    )
+    app.add_middleware(TracingMiddleware, sample_rate=settings.tracing_sample_rate)
@@ -14,14 +14,14 @@ Alembic 등의 마이그레이션 도구에서도 자동으로 인식됩니다.
 """
 
 from app.database import Base
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.sql import func
 
 class User(Base):
     __tablename__ = "tb_user"
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(String(100), unique=True, nullable=False)
-    user_name = Column(String(100), nullable=False)
+    user_name = Column(String(100), nullable=False, index=True)  # 타입어헤드 접두사 검색용
     user_email = Column(String(100), unique=True, nullable=False)
     user_password = Column(String(255), nullable=False)
     user_created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -42,3 +42,28 @@ class RefreshSession(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_used_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # 사용자별 활성 세션 (revoke_all / 세션 수 상한 eviction 의 범위 검색 + id 역순 정렬)
+        Index("ix_tb_token_user_active", "user_id", "revoked", "id"),
+    )
+
+# ---------------------------
+# 📊 로그인/세션 분석 롤업 (services/analytics_service.py)
+#  - 로그인/refresh 경로가 write-behind 로 증분 반영 → 대시보드는 원본(tb_token) 대신 여기만 조회
+# ---------------------------
+class AnalyticsDaily(Base):
+    __tablename__ = "tb_analytics_daily"
+    day = Column(Date, primary_key=True)                  # UTC 기준 날짜
+    device = Column(String(16), primary_key=True)         # desktop / mobile / tablet / bot / other / all(전체)
+    logins = Column(Integer, nullable=False, default=0)
+    refreshes = Column(Integer, nullable=False, default=0)
+    active_users = Column(Integer, nullable=False, default=0)  # 그날 로그인/refresh 한 고유 사용자 수 (활성 세션 수 아님, analytics_service 참고)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class AnalyticsSeen(Base):
+    # active_users 중복 제거용 (day, device, user_id) — 최근 이틀치만 보관
+    __tablename__ = "tb_analytics_seen"
+    day = Column(Date, primary_key=True)
+    device = Column(String(16), primary_key=True)
+    user_id = Column(Integer, primary_key=True)
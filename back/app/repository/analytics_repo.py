@@ -0,0 +1,119 @@
+"""
+analytics_repo.py
+------------------
+
+로그인/세션 분석 롤업 테이블(tb_analytics_daily, tb_analytics_seen) 접근 계층
+
+- apply_activity: write-behind 배치 핸들러 — (일자, 기기) 카운터를 UPDATE += / 없으면 INSERT
+- get_daily     : 대시보드 조회 — PK(day, device) 범위 조회라 원본 테이블 크기와 무관
+"""
+
+from datetime import date, timedelta
+from typing import Sequence
+
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import AnalyticsDaily, AnalyticsSeen
+
+ALL_DEVICES = "all"
+
+_daily_t = AnalyticsDaily.__table__
+_seen_t = AnalyticsSeen.__table__
+
+_SEEN_IN_GROUP = select(_seen_t.c.user_id).where(
+    _seen_t.c.day == bindparam("day"),
+    _seen_t.c.device == bindparam("device"),
+    _seen_t.c.user_id.in_(bindparam("uids", expanding=True)),
+)
+_SEEN_PRUNE = delete(_seen_t).where(_seen_t.c.day < bindparam("_before"))
+_DAILY_INCR = (
+    update(_daily_t)
+    .where(_daily_t.c.day == bindparam("_day"), _daily_t.c.device == bindparam("_device"))
+    .values(
+        logins=_daily_t.c.logins + bindparam("_logins"),
+        refreshes=_daily_t.c.refreshes + bindparam("_refreshes"),
+        active_users=_daily_t.c.active_users + bindparam("_active"),
+        updated_at=func.now(),
+    )
+)
+_DAILY_COLUMNS = (
+    _daily_t.c.day, _daily_t.c.device, _daily_t.c.logins, _daily_t.c.refreshes,
+    _daily_t.c.active_users, _daily_t.c.updated_at,
+)
+_DAILY_RANGE = (
+    select(*_DAILY_COLUMNS)
+    .where(_daily_t.c.day >= bindparam("start"), _daily_t.c.day <= bindparam("end"))
+    .order_by(_daily_t.c.day, _daily_t.c.device)
+)
+_DAILY_RANGE_DEVICE = (
+    select(*_DAILY_COLUMNS)
+    .where(
+        _daily_t.c.day >= bindparam("start"), _daily_t.c.day <= bindparam("end"),
+        _daily_t.c.device == bindparam("device"),
+    )
+    .order_by(_daily_t.c.day)
+)
+
+def apply_activity(db: Session, items: list[tuple[tuple[date, str, int], tuple[int, int]]]) -> None:
+    """
+    활동 배치 반영 (write-behind 핸들러)
+    - items: ((day, device, user_id), (logins, refreshes))
+    - 기기별 행 + 전체("all") 행을 함께 갱신, 처음 보는 (day, device, user_id) 만 active_users 에 더함
+    - 여러 워커가 같은 사용자를 동시에 기록해 INSERT 가 충돌하면 다시 조회해서 한 번 재시도
+    """
+    groups: dict[tuple[date, str], dict[int, list[int]]] = {}
+    for (day, device, user_id), (logins, refreshes) in items:
+        for dev in (device, ALL_DEVICES):
+            counts = groups.setdefault((day, dev), {}).setdefault(user_id, [0, 0])
+            counts[0] += logins
+            counts[1] += refreshes
+    if not groups:
+        return
+
+    for attempt in range(2):
+        try:
+            _apply_groups(db, groups)
+            db.commit()
+            return
+        except IntegrityError:
+            db.rollback()
+            if attempt:
+                raise
+
+def _apply_groups(db: Session, groups: dict[tuple[date, str], dict[int, list[int]]]) -> None:
+    conn = db.connection()
+    for (day, device), users in groups.items():
+        uids = list(users)
+        seen: set[int] = set()
+        for i in range(0, len(uids), 1000):  # IN 목록 길이 제한
+            seen.update(conn.execute(_SEEN_IN_GROUP, {"day": day, "device": device, "uids": uids[i:i + 1000]}).scalars())
+        new = [uid for uid in uids if uid not in seen]
+        if new:
+            conn.execute(insert(_seen_t), [{"day": day, "device": device, "user_id": uid} for uid in new])
+
+        params = {
+            "_day": day, "_device": device, "_active": len(new),
+            "_logins": sum(c[0] for c in users.values()),
+            "_refreshes": sum(c[1] for c in users.values()),
+        }
+        if conn.execute(_DAILY_INCR, params).rowcount == 0:
+            conn.execute(insert(_daily_t), {
+                "day": day, "device": device, "logins": params["_logins"],
+                "refreshes": params["_refreshes"], "active_users": params["_active"],
+            })
+
+    # 중복 제거용 행은 어제까지만 필요
+    latest = max(day for day, _ in groups)
+    conn.execute(_SEEN_PRUNE, {"_before": latest - timedelta(days=1)})
+
+def get_daily(db: Session, start: date, end: date, device: str | None = None) -> Sequence[Row]:
+    """
+    [start, end] 기간의 일별 롤업 조회 (device 지정 시 해당 기기만)
+    """
+    conn = db.connection()
+    if device:
+        return conn.execute(_DAILY_RANGE_DEVICE, {"start": start, "end": end, "device": device}).all()
+    return conn.execute(_DAILY_RANGE, {"start": start, "end": end}).all()
@@ -1,72 +1,230 @@
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
+from app import sharding
 from app.models.models import User, RefreshSession
 
+# ---------------------------------------------------------------------------
+# 재사용 statement (모듈 로드 시 1회 생성)
+#  - 값은 bindparam 으로만 바꾸므로 SQLAlchemy 컴파일 캐시가 항상 적중
+#  - *_ROW 계열은 테이블 컬럼(Core)만 SELECT → ORM 엔티티/identity map 생성 없음
+# ---------------------------------------------------------------------------
+_user_t = User.__table__
+_rs_t = RefreshSession.__table__
+
+_USER_BY_LOGIN = select(User).where(User.user_id == bindparam("user_id")).limit(1)
+_LOGIN_ROW = (
+    select(_user_t.c.id, _user_t.c.user_password)
+    .where(_user_t.c.user_id == bindparam("user_id"))
+    .limit(1)
+)
+_RS_INSERT = insert(_rs_t)
+_RS_BY_JTI = select(RefreshSession).where(RefreshSession.jti == bindparam("jti")).limit(1)
+_RS_ROW_BY_JTI = (
+    select(
+        _rs_t.c.id, _rs_t.c.user_id, _rs_t.c.jti, _rs_t.c.token_hash, _rs_t.c.expires_at,
+        _rs_t.c.revoked, _rs_t.c.user_agent, _rs_t.c.ip,
+    )
+    .where(_rs_t.c.jti == bindparam("jti"))
+    .limit(1)
+)
+_REVOKE_ONE = (
+    update(_rs_t)
+    .where(_rs_t.c.jti == bindparam("_jti"), _rs_t.c.revoked == False)  # noqa: E712
+    .values(revoked=True)
+)
+_REVOKE_ALL = (
+    update(_rs_t)
+    .where(_rs_t.c.user_id == bindparam("_user_id"), _rs_t.c.revoked == False)  # noqa: E712
+    .values(revoked=True)
+)
+_RS_STATES = select(_rs_t.c.jti, _rs_t.c.token_hash, _rs_t.c.revoked, _rs_t.c.expires_at).where(
+    _rs_t.c.jti.in_(bindparam("jtis", expanding=True))
+)
+# 사용자 활성 세션 중 최신 _keep 개만 남기고 폐기 (개수 COUNT 없이 인덱스 역순으로 경계 id 만 찾음)
+#  - MySQL 은 UPDATE 대상 테이블을 서브쿼리에서 직접 읽을 수 없으므로 파생 테이블로 한 번 감쌈
+#  - 활성 세션이 _keep 개 이하면 경계 id 가 NULL → 아무 행도 바뀌지 않음
+_EVICT_CUTOFF = (
+    select(_rs_t.c.id)
+    .where(_rs_t.c.user_id == bindparam("_user_id"), _rs_t.c.revoked == False)  # noqa: E712
+    .order_by(_rs_t.c.id.desc())
+    .limit(1)
+    .offset(bindparam("_keep"))
+    .subquery("cutoff")
+)
+_EVICT_OLDEST = (
+    update(_rs_t)
+    .where(
+        _rs_t.c.user_id == bindparam("_user_id"),
+        _rs_t.c.revoked == False,  # noqa: E712
+        _rs_t.c.id <= select(_EVICT_CUTOFF.c.id).scalar_subquery(),
+    )
+    .values(revoked=True)
+)
+_TOUCH = update(_rs_t).where(_rs_t.c.jti == bindparam("_jti")).values(last_used_at=bindparam("_now"))
+_TOUCH_MANY = (
+    update(_rs_t)
+    .where(_rs_t.c.jti.in_(bindparam("_jtis", expanding=True)))
+    .values(last_used_at=bindparam("_now"))
+)
+
+# ---------------------------------------------------------------------------
+# tb_token 실행 대상 선택 (app/sharding.py)
+#  - 샤딩 꺼짐: 요청 세션(db)의 커넥션에서 실행 + db.commit()
+#  - 샤딩 켜짐: user_id 소유 샤드 먼저, 없으면 나머지 샤드 (리밸런싱 중 누락 대비)
+# ---------------------------------------------------------------------------
+def _token_first(db: Session, stmt, params: dict, user_id: int | None) -> Row | None:
+    if not sharding.enabled():
+        return db.connection().execute(stmt, params).first()
+    for shard in sharding.shard_order(user_id):
+        with shard.connect() as conn:
+            row = conn.execute(stmt, params).first()
+        if row is not None:
+            return row
+    return None
+
+def _token_write(db: Session, stmt, params, user_id: int | None, *, every_shard: bool = False) -> int:
+    """쓰기 실행 → 영향받은 행 수. every_shard=False 면 처음 행이 바뀐 샤드에서 멈춤"""
+    if not sharding.enabled():
+        count = db.connection().execute(stmt, params).rowcount
+        db.commit()
+        return count
+    total = 0
+    for shard in sharding.shard_order(user_id):
+        with shard.begin() as conn:
+            total += conn.execute(stmt, params).rowcount
+        if total and not every_shard:
+            break
+    return total
+
 # User 관련 Repository 함수
 def get_by_user_id(db: Session, user_id: str) -> User | None:
     """
     user_id(로그인용 아이디)로 사용자 조회
     - 없으면 None 반환
     """
-    return db.query(User).filter(User.user_id == user_id).first()
+    return db.execute(_USER_BY_LOGIN, {"user_id": user_id}).scalar_one_or_none()
+
+def get_login_row(db: Session, user_id: str) -> Row | None:
+    """
+    로그인 검증용 (id, user_password) 만 조회 (Core row, ORM 엔티티 생성 없음)
+    - 없으면 None 반환
+    """
+    return db.connection().execute(_LOGIN_ROW, {"user_id": user_id}).first()
 
 # RefreshSession 관련 Repository 함수
 def create_refresh_session(
     db: Session, *, user_id: int, jti: str, token_hash: str, expires_at: datetime,
-    user_agent: str | None, ip: str | None
-) -> RefreshSession:
+    user_agent: str | None, ip: str | None, keep_active: int = 0
+) -> int:
     """
-    새로운 RefreshSession 생성
+    새로운 RefreshSession 생성 (user_id 소유 샤드에 저장)
     - refresh_token 원문은 저장하지 않고 해시(token_hash)만 저장
     - jti(토큰 고유 식별자), 만료 시간, 클라이언트 정보(User-Agent, IP) 함께 저장
+    - Core INSERT 한 번 (ORM 엔티티 생성/flush 없음)
+    - keep_active > 0 이면 같은 트랜잭션에서 가장 최근 keep_active 개를 넘는 오래된 활성 세션을 폐기
+    반환: 폐기(evict)된 세션 수
     """
-    rs = RefreshSession(
-        user_id=user_id,
-        jti=jti,
-        token_hash=token_hash,
-        expires_at=expires_at,
-        user_agent=user_agent,
-        ip=ip
-    )
-    db.add(rs)
-    db.commit()
-    db.refresh(rs)
-    return rs
+    params = {
+        "user_id": user_id,
+        "jti": jti,
+        "token_hash": token_hash,
+        "expires_at": expires_at,
+        "revoked": False,
+        "user_agent": user_agent,
+        "ip": ip,
+    }
+    def run(conn) -> int:
+        conn.execute(_RS_INSERT, params)
+        if keep_active <= 0:
+            return 0
+        return conn.execute(_EVICT_OLDEST, {"_user_id": user_id, "_keep": keep_active}).rowcount
+
+    if not sharding.enabled():
+        evicted = run(db.connection())
+        db.commit()
+        return evicted
+    with sharding.engines()[sharding.shard_for_user(user_id)].begin() as conn:
+        return run(conn)
 
-def get_refresh_session_by_jti(db: Session, jti: str) -> RefreshSession | None:
+def get_refresh_session_by_jti(db: Session, jti: str, *, user_id: int | None = None) -> RefreshSession | None:
     """
     jti(토큰 고유 ID)로 RefreshSession 조회
     - 없으면 None 반환
+    - 샤딩 시에는 user_id(토큰 sub) 소유 샤드의 세션에서 조회 (반환 객체는 detached)
     """
-    return db.query(RefreshSession).filter(RefreshSession.jti == jti).first()
+    if not sharding.enabled():
+        return db.execute(_RS_BY_JTI, {"jti": jti}).scalar_one_or_none()
+    for shard in sharding.shard_order(user_id):
+        with Session(shard, expire_on_commit=False) as shard_db:
+            rs = shard_db.execute(_RS_BY_JTI, {"jti": jti}).scalar_one_or_none()
+        if rs is not None:
+            return rs
+    return None
 
-def mark_refresh_revoked(db: Session, jti: str) -> None:
+def get_refresh_row_by_jti(db: Session, jti: str, *, user_id: int | None = None) -> Row | None:
+    """
+    refresh 회전 검증용 Core row 조회 (created_at/last_used_at 제외, ORM 엔티티 생성 없음)
+    - 없으면 None 반환
+    - user_id(토큰 sub)로 샤드 결정
+    """
+    return _token_first(db, _RS_ROW_BY_JTI, {"jti": jti}, user_id)
+
+def mark_refresh_revoked(db: Session, jti: str, *, user_id: int | None = None) -> None:
     """
     특정 RefreshSession을 폐기(revoked=True 처리)
     - 로그아웃 시 호출
-    - 이미 revoke 되지 않았다면 True로 변경 후 commit
+    - 조회 없이 UPDATE ... WHERE jti=? AND revoked=false 한 번으로 처리 (이미 폐기된 경우 no-op)
     """
-    rs = get_refresh_session_by_jti(db, jti)
-    if rs and not rs.revoked:
-        rs.revoked = True
-        db.commit()
+    _token_write(db, _REVOKE_ONE, {"_jti": jti}, user_id)
 
 def revoke_all_refresh_for_user(db: Session, user_id: int) -> None:
     """
     해당 사용자의 모든 RefreshSession을 일괄 폐기 (재사용 탐지 대응)
+    - 행마다 로딩하지 않고 집합 UPDATE 한 번으로 처리
     """
-    q = db.query(RefreshSession).filter(RefreshSession.user_id == user_id, RefreshSession.revoked == False)
     # 이미 revoke된 것도 함께 막고 싶으면 revoked 조건을 제거해도 됨
-    for rs in q.all():
-        rs.revoked = True
-    db.commit()
+    # 샤딩 시 리밸런싱 중 옛 샤드에 남은 행까지 막기 위해 모든 샤드에 실행
+    _token_write(db, _REVOKE_ALL, {"_user_id": user_id}, user_id, every_shard=True)
 
-def touch_refresh_last_used(db: Session, jti: str) -> None:
+def touch_refresh_last_used(db: Session, jti: str, *, user_id: int | None = None) -> None:
     """
-    RefreshSession의 마지막 사용 시각(last_used_at) 업데이트
-    - /refresh API 호출 시마다 실행
+    RefreshSession의 마지막 사용 시각(last_used_at) 업데이트 (단건, 즉시 commit)
+    - /refresh 경로는 write-behind 배치(touch_refresh_last_used_many)를 사용
     """
-    rs = get_refresh_session_by_jti(db, jti)
-    if rs:
-        rs.last_used_at = datetime.now(timezone.utc)
-        db.commit()
+    _token_write(db, _TOUCH, {"_jti": jti, "_now": datetime.now(timezone.utc)}, user_id)
+
+def touch_refresh_last_used_many(db: Session, items: list[tuple[str, datetime]]) -> None:
+    """
+    write-behind 배치용: 여러 jti 의 last_used_at 을 UPDATE 한 번 + commit 한 번으로 갱신
+    - 시각은 배치 내 가장 최근 값으로 통일 (flush 주기 이내의 오차 허용)
+    - 샤딩 시 jti 만으로는 샤드를 알 수 없으므로 샤드마다 같은 배치 UPDATE 실행 (없는 jti 는 무시됨)
+    """
+    if not items:
+        return
+    now = max(ts for _, ts in items)
+    jtis = [jti for jti, _ in items]
+    for i in range(0, len(jtis), 1000):  # IN 목록 길이 제한
+        _token_write(db, _TOUCH_MANY, {"_jtis": jtis[i:i + 1000], "_now": now}, None, every_shard=True)
+
+def get_refresh_states(db: Session, jtis: list[str]) -> dict[str, Row]:
+    """
+    여러 jti 의 (jti, token_hash, revoked, expires_at) 을 IN 쿼리 한 번으로 조회
+    - 반환: jti -> Row (DB 에 없는 jti 는 빠짐)
+    - 샤딩 시 샤드마다 같은 IN 쿼리를 실행해 합침
+    """
+    if not jtis:
+        return {}
+    states: dict[str, Row] = {}
+    def collect(conn) -> None:
+        for i in range(0, len(jtis), 1000):  # IN 목록 길이 제한
+            for row in conn.execute(_RS_STATES, {"jtis": jtis[i:i + 1000]}):
+                states[row.jti] = row
+    if not sharding.enabled():
+        collect(db.connection())
+    else:
+        for shard in sharding.engines():
+            with shard.connect() as conn:
+                collect(conn)
+    return states
@@ -13,12 +13,106 @@ attendance_repo.py
 이 파일에서는 출결 로그(`AttendanceLog`)를 생성하는 기능을 제공합니다.
 """
 
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Iterator, Sequence
+from sqlalchemy import bindparam, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, load_only
 from app.models import User
 
+# 재사용 statement (bindparam → 컴파일 캐시 적중)
+_user_t = User.__table__
+
+# 공개 필드 (/me, 회원 조회 응답에 쓰이는 컬럼)
+PUBLIC_COLUMNS = (User.id, User.user_id, User.user_name, User.user_email, User.user_updated_at)
+
+_PUBLIC_ROW = (
+    select(_user_t.c.id, _user_t.c.user_id, _user_t.c.user_name, _user_t.c.user_email, _user_t.c.user_updated_at)
+    .where(_user_t.c.id == bindparam("id"))
+)
+_VERSION_ROW = select(_user_t.c.id, _user_t.c.user_updated_at).where(_user_t.c.id == bindparam("id"))
+_PUBLIC_ENTITY = select(User).options(load_only(*PUBLIC_COLUMNS)).where(User.id == bindparam("id"))
+
 def create_user(db: Session, user_id: str, user_name: str, user_email: str, user_password: str) -> User:
     new_user = User(user_id=user_id, user_name=user_name, user_email=user_email, user_password=user_password) 
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
-    return new_user
\ No newline at end of file
+    return new_user
+
+def get_by_id(db: Session, id_: int, *, public_only: bool = False) -> User | None:
+    """
+    PK(id)로 사용자 조회
+    - public_only=True 면 공개 필드만 load_only 로 로딩 (비밀번호 해시 등 제외)
+    - 없으면 None 반환
+    """
+    if public_only:
+        return db.execute(_PUBLIC_ENTITY, {"id": id_}).scalar_one_or_none()
+    return db.get(User, id_)
+
+def get_public_row(db: Session, id_: int) -> Row | None:
+    """
+    공개 필드만 Core row 로 조회 (ORM 엔티티/identity map 생성 없음) → /me 등 읽기 전용 경로용
+    - 없으면 None 반환
+    """
+    return db.connection().execute(_PUBLIC_ROW, {"id": id_}).first()
+
+def get_version_by_id(db: Session, id_: int) -> tuple[int, datetime | None] | None:
+    """
+    ETag 계산용 가벼운 버전 조회 (id, user_updated_at 두 컬럼만 SELECT)
+    - 엔티티 로딩/직렬화 없이 If-None-Match 비교에 사용
+    """
+    row = db.connection().execute(_VERSION_ROW, {"id": id_}).first()
+    return (row.id, row.user_updated_at) if row else None
+
+# 내보내기(export) 허용 컬럼 — user_password 는 절대 포함하지 않음
+EXPORT_COLUMNS = ("id", "user_id", "user_name", "user_email", "user_created_at", "user_updated_at")
+
+def stream_users(
+    db: Session, columns: Sequence[str], *, updated_since: datetime | None = None, batch_size: int = 1000
+) -> Iterator[Row]:
+    """
+    전체 사용자를 서버 측 커서로 batch_size 단위씩 흘려보내는 제너레이터 (메모리 일정)
+    - stream_results: 드라이버 서버 측 커서 사용 (pymysql SSCursor)
+    - yield_per: 한 번에 batch_size 행만 fetch
+    - updated_since: 이 시각 이후 변경분만 (증분 내보내기)
+    """
+    stmt = select(*[_user_t.c[name] for name in columns]).order_by(_user_t.c.id)
+    if updated_since is not None:
+        stmt = stmt.where(_user_t.c.user_updated_at >= updated_since)
+    result = db.connection().execution_options(stream_results=True, yield_per=batch_size).execute(stmt)
+    try:
+        for partition in result.partitions():
+            yield from partition
+    finally:
+        result.close()
+
+# 타입어헤드 검색 대상 컬럼
+SEARCH_FIELDS = ("user_id", "user_name", "user_email")
+
+def _like_prefix(q: str) -> str:
+    # LIKE 와일드카드 이스케이프 후 접두사 패턴 ('abc%') → 인덱스 range scan 가능
+    return q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+def search_by_prefix(db: Session, field: str, q: str, *, offset: int = 0, limit: int = 20) -> list[Row]:
+    """
+    접두사 검색 (공개 필드 Core row 반환)
+    - field 가 SEARCH_FIELDS 중 하나면 해당 컬럼 값 순(동일 값은 id 순)으로 정렬
+    - field == "all" 이면 세 컬럼 중 하나라도 접두사가 일치하는 사용자를 id 순으로 반환
+    - '%x%' 형태의 중간 일치는 지원하지 않음 (전체 스캔 방지)
+    """
+    pattern = _like_prefix(q)
+    cols = (_user_t.c.id, _user_t.c.user_id, _user_t.c.user_name, _user_t.c.user_email)
+    if field == "all":
+        cond = (
+            _user_t.c.user_id.like(pattern, escape="\\")
+            | _user_t.c.user_name.like(pattern, escape="\\")
+            | _user_t.c.user_email.like(pattern, escape="\\")
+        )
+        order = (_user_t.c.id,)
+    else:
+        col = _user_t.c[field]
+        cond = col.like(pattern, escape="\\")
+        order = (col, _user_t.c.id)
+    stmt = select(*cols).where(cond).order_by(*order).offset(offset).limit(limit)
+    return list(db.connection().execute(stmt))
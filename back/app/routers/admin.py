@@ -0,0 +1,109 @@
+# app/routers/admin.py
+"""
+admin.py
+--------
+
+운영/관리자용 API
+
+✅ 규칙
+- 모든 엔드포인트는 `X-Admin-Token` 헤더 필요 (settings.admin_token, 비어 있으면 관리자 API 비활성)
+- 성공 응답: JSON:API 문서 (application/vnd.api+json)
+"""
+
+import hmac
+from datetime import date, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import FileResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.database import get_db
+from app.middlewares import profiler
+from app.schemas.jsonapi import list_doc, resource, single_doc, Meta
+from app.services import analytics_service
+from app.utils.metrics import metrics
+
+def require_admin(request: Request) -> None:
+    token = request.headers.get("x-admin-token")
+    if not settings.admin_token or not token or not hmac.compare_digest(token, settings.admin_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
+
+router = APIRouter(tags=["admin"], dependencies=[Depends(require_admin)])  # ← main.py에서 /api/admin 부여
+
+class ArmIn(BaseModel):
+    count: int = 1   # 다음 N개 요청 캡처
+
+# 프로파일 목록
+@router.get("/profiles", status_code=status.HTTP_200_OK)
+def list_profiles(response: Response):
+    items = profiler.list_profiles()
+    response.media_type = "application/vnd.api+json"
+    doc = list_doc(
+        [resource("profile", it["name"], {"size": it["size"], "created_at": it["created_at"]}) for it in items],
+        self_url=f"{settings.API_PREFIX}/admin/profiles",
+        meta=Meta(total=len(items)),
+    )
+    return doc.model_dump()
+
+# 다음 N개 요청 프로파일링 예약
+@router.post("/profiles/arm", status_code=status.HTTP_200_OK)
+def arm_profiler(data: ArmIn, response: Response):
+    if not settings.profiling_enabled:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Profiling is disabled (profiling_enabled=false)")
+    armed = profiler.profiler_state.arm(data.count)
+    response.media_type = "application/vnd.api+json"
+    doc = single_doc(
+        resource("profiler", "state", {"armed": armed, "mode": settings.profiling_mode}),
+        self_url=f"{settings.API_PREFIX}/admin/profiles/arm",
+    )
+    return doc.model_dump()
+
+# 프로파일 파일 다운로드
+@router.get("/profiles/{name}")
+def download_profile(name: str):
+    path = profiler.profile_path(name)
+    if not path:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=name)
+
+# 프로세스 메트릭 (write-behind 대기/드롭 수 등)
+@router.get("/metrics", status_code=status.HTTP_200_OK)
+def get_metrics(response: Response):
+    response.media_type = "application/vnd.api+json"
+    doc = single_doc(
+        resource("metrics", "process", metrics.snapshot()),
+        self_url=f"{settings.API_PREFIX}/admin/metrics",
+    )
+    return doc.model_dump()
+
+# 일별 로그인/활성 사용자 롤업 (tb_analytics_daily 만 조회)
+@router.get("/analytics/daily", status_code=status.HTTP_200_OK)
+def analytics_daily(response: Response,
+                    start: date | None = Query(None, description="시작일 (UTC, 기본: 30일 전)"),
+                    end: date | None = Query(None, description="종료일 (UTC, 기본: 오늘)"),
+                    device: str | None = Query(None, pattern="^(all|desktop|mobile|tablet|bot|other)$"),
+                    db: Session = Depends(get_db)):
+    end = end or analytics_service.today()
+    start = start or end - timedelta(days=29)
+    if start > end or (end - start).days > 366:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid range (start <= end, max 366 days)")
+    rows = analytics_service.daily_rollups(db, start, end, device)
+    response.media_type = "application/vnd.api+json"
+    doc = list_doc(
+        [
+            resource("analytics_daily", f"{r.day.isoformat()}:{r.device}", {
+                "day": r.day.isoformat(),
+                "device": r.device,
+                "logins": r.logins,
+                "refreshes": r.refreshes,
+                "active_users": r.active_users,
+                "updated_at": r.updated_at.isoformat() if r.updated_at else None,
+            })
+            for r in rows
+        ],
+        self_url=f"{settings.API_PREFIX}/admin/analytics/daily",
+        meta=Meta(total=len(rows)),
+    )
+    return doc.model_dump()
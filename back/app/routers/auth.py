@@ -1,11 +1,13 @@
 # app/routers/auth.py
+import hmac
 from fastapi import APIRouter, Depends, HTTPException, Response, Request, status
 from sqlalchemy.orm import Session
 from jose import JWTError
 from app.database import get_db
 from app.services import auth_service
-from app.schemas.auth_schema import LoginIn           
-from app.schemas.jsonapi import resource, single_doc
+from app.schemas.auth_schema import LoginIn, IntrospectIn
+from app.schemas.jsonapi import resource, single_doc, list_doc, Meta
+from app.utils.etag import resource_etag, not_modified, set_etag
 from app.config.settings import settings
 
 router = APIRouter(tags=["auth"])  # ← prefix 없음 (패턴 B: main.py에서 /api/auth 부여)
@@ -68,7 +70,9 @@ def refresh(request: Request, response: Response, db: Session = Depends(get_db))
 
     try:
         auth_service.validate_refresh_and_get_uid_jti(rt)
-        new_access, new_refresh = auth_service.rotate_refresh_and_issue_access(db, rt)
+        new_access, new_refresh = auth_service.rotate_refresh_and_issue_access(
+            db, rt, user_agent=request.headers.get("user-agent")
+        )
     except (JWTError, ValueError):
         raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
 
@@ -109,7 +113,16 @@ def logout(response: Response, request: Request, db: Session = Depends(get_db)):
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 @router.get("/me", status_code=status.HTTP_200_OK)
-def me(response: Response, db: Session = Depends(get_db), user_id: int = Depends(get_current_user_id)):
+def me(request: Request, response: Response, db: Session = Depends(get_db), user_id: int = Depends(get_current_user_id)):
+    # 1) 가벼운 버전 조회로 ETag 계산 → If-None-Match 일치 시 304 (엔티티 조회/직렬화 생략)
+    version = auth_service.me_version(db, user_id)
+    if not version:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found")
+    etag = resource_etag("user", *version)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
     user = auth_service.me(db, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found")
@@ -127,4 +140,25 @@ def me(response: Response, db: Session = Depends(get_db), user_id: int = Depends
         ),
         self_url=f"{settings.API_PREFIX}/auth/me",
     )
-    return doc.model_dump()
\ No newline at end of file
+    set_etag(response, etag)
+    return doc.model_dump()
+
+def require_service_token(request: Request) -> None:
+    # 게이트웨이/사이드카 인증 (settings.introspection_token 이 비어 있으면 비활성)
+    token = request.headers.get("x-service-token")
+    if not settings.introspection_token or not token or not hmac.compare_digest(token, settings.introspection_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Service token required")
+
+# 배치 토큰 introspection (게이트웨이용)
+@router.post("/introspect", status_code=status.HTTP_200_OK, dependencies=[Depends(require_service_token)])
+def introspect(data: IntrospectIn, response: Response, db: Session = Depends(get_db)):
+    results = auth_service.introspect_many(db, data.tokens)
+
+    # 입력 순서(index)를 리소스 id 로 사용
+    response.media_type = "application/vnd.api+json"
+    doc = list_doc(
+        [resource("introspection", i, r) for i, r in enumerate(results)],
+        self_url=f"{settings.API_PREFIX}/auth/introspect",
+        meta=Meta(total=len(results)),
+    )
+    return doc.model_dump()
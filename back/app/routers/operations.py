@@ -0,0 +1,40 @@
+# app/routers/operations.py
+"""
+operations.py
+--------------
+
+JSON:API Atomic Operations 엔드포인트 (https://jsonapi.org/ext/atomic)
+
+✅ 규칙
+- 요청 바디: {"atomic:operations": [{"op": "add", "data": {...}}, {"op": "remove", "ref": {...}}, ...]}
+- 모든 연산을 DB 트랜잭션 하나로 실행 (전부 성공 또는 전부 취소, services/atomic_service.py)
+- 성공 응답: {"atomic:results": [...]} (연산 순서대로, 데이터 없는 연산은 {})
+- 실패 응답: 실패한 연산의 상태 코드 + RFC 7807 (detail 앞에 "/atomic:operations/<번호>" 포인터)
+- 세션 연산은 Authorization: Bearer <access token> 필요
+"""
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+
+from app.routers.auth import get_current_user_id
+from app.schemas.jsonapi import ATOMIC_MEDIA_TYPE, AtomicRequest, atomic_results_doc
+from app.services import atomic_service
+
+router = APIRouter(tags=["operations"])  # ← prefix 없음 (패턴 B: main.py에서 /api/operations 부여)
+
+def get_optional_user_id(request: Request) -> int | None:
+    # Authorization 헤더가 있으면 검증 (잘못된 토큰은 401), 없으면 익명
+    if not request.headers.get("authorization"):
+        return None
+    return get_current_user_id(request)
+
+@router.post("", status_code=status.HTTP_200_OK)
+def atomic_operations(data: AtomicRequest, request: Request):
+    try:
+        results = atomic_service.run(data.operations, user_id=get_optional_user_id(request))
+    except atomic_service.OperationError as exc:
+        pointer = f"/atomic:operations/{exc.index}: " if exc.index is not None else ""
+        raise HTTPException(status_code=exc.status, detail=pointer + exc.detail)
+
+    # 확장(ext) 파라미터가 붙은 미디어 타입을 그대로 내보내기 위해 응답 객체를 직접 생성
+    return JSONResponse(atomic_results_doc(results), media_type=ATOMIC_MEDIA_TYPE)
@@ -11,13 +11,20 @@ user.py
 - 오류 응답: 전역 핸들러가 RFC 7807로 변환
 """
 
-from fastapi import APIRouter, Depends, Response, status
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.datastructures import URL
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.services import user_service
+from app.services import user_service, search_service
+from app.repository.user_repo import EXPORT_COLUMNS
+from app.routers.admin import require_admin
 from app.schemas.user_schema import UserCreate           # ✅ 요청 스키마 사용
-from app.schemas.jsonapi import single_doc, resource
+from app.schemas.jsonapi import single_doc, list_doc, resource, Meta
 from app.config.settings import settings
 
 router = APIRouter(tags=["user"])  # ← prefix 없음 (패턴 B: main.py에서 /api/user 부여)
@@ -47,3 +54,57 @@ def create_user(data: UserCreate,                      # ✅ 명시적으로 Use
         self_url=f"{settings.API_PREFIX}/user/{user.id}",
     )
     return doc.model_dump()
+
+# 사용자 전체 내보내기 (관리자 전용, 스트리밍)
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+@router.get("/export", dependencies=[Depends(require_admin)])
+def export_users(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    fields: str | None = Query(None, description="쉼표로 구분한 컬럼 목록 (기본: 전체 공개 컬럼)"),
+    updated_since: datetime | None = Query(None, description="이 시각 이후 변경된 사용자만 (증분)"),
+):
+    columns = [c.strip() for c in fields.split(",") if c.strip()] if fields else list(EXPORT_COLUMNS)
+    unknown = [c for c in columns if c not in EXPORT_COLUMNS]
+    if unknown or not columns:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"unknown fields: {unknown}; allowed: {list(EXPORT_COLUMNS)}",
+        )
+
+    return StreamingResponse(
+        user_service.export_users(columns, format, updated_since=updated_since),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
+
+# 사용자 타입어헤드 검색 (관리자 전용, 접두사 일치)
+@router.get("/search", dependencies=[Depends(require_admin)])
+def search_users(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=100, description="검색어 (접두사)"),
+    field: Literal["all", "user_id", "user_name", "user_email"] = Query("all"),
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    # size+1 개를 가져와서 다음 페이지 존재 여부 판단 (COUNT 쿼리 생략)
+    rows = search_service.search_users(db, q, field, offset=(page - 1) * size, limit=size + 1)
+    has_next = len(rows) > size
+
+    base = f"{settings.API_PREFIX}/user/search"
+    def page_url(p: int) -> str:
+        return str(URL(base).include_query_params(q=q, field=field, page=p, size=size))
+
+    response.media_type = "application/vnd.api+json"
+    doc = list_doc(
+        [
+            resource("user", id_, {"user_id": user_id, "user_name": user_name, "user_email": user_email})
+            for id_, user_id, user_name, user_email in rows[:size]
+        ],
+        self_url=page_url(page),
+        next_url=page_url(page + 1) if has_next else None,
+        prev_url=page_url(page - 1) if page > 1 else None,
+        meta=Meta(page=page, size=size),
+    )
+    return doc.model_dump()
@@ -1,11 +1,25 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from typing import TypedDict
 from typing import Literal
 TokenType = Literal["access", "refresh"]
 
+BCRYPT_MAX_BYTES = 72   # bcrypt 는 앞 72바이트만 사용 (넘는 부분은 passlib 이 조용히 잘라냄)
+
+def check_bcrypt_bytes(value: str) -> str:
+    """max_length 는 글자 수 기준 → 한글 등 멀티바이트 비밀번호는 UTF-8 바이트 수로 다시 검사"""
+    if len(value.encode("utf-8")) > BCRYPT_MAX_BYTES:
+        raise ValueError(f"password must be at most {BCRYPT_MAX_BYTES} bytes in UTF-8")
+    return value
+
 class LoginIn(BaseModel):
-    username: str
-    password: str
+    # 길이 제한: bcrypt 검증 전에 비정상 입력을 422 로 차단 (bcrypt 는 72바이트까지만 사용)
+    user_id: str = Field(..., min_length=1, max_length=100)
+    password: str = Field(..., min_length=1, max_length=BCRYPT_MAX_BYTES)
+
+    @field_validator("password")
+    @classmethod
+    def _password_bytes(cls, value: str) -> str:
+        return check_bcrypt_bytes(value)
 
 class TokenOut(BaseModel):
     access_token: str
@@ -17,4 +31,8 @@ class BaseClaims(TypedDict, total=False):
     type: TokenType
     iat: int
     exp: int
-    jti: str
\ No newline at end of file
+    jti: str
+
+class IntrospectIn(BaseModel):
+    # 게이트웨이/사이드카용 배치 introspection 요청 (access/refresh 혼합 가능)
+    tokens: list[str] = Field(..., min_length=1, max_length=1000)
@@ -1,6 +1,6 @@
 # app/schemas/jsonapi.py
-from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel
+from typing import Any, Dict, List, Literal, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field
 
 # JSON 객체 타입 별칭 (dict[str, Any])
 JsonObj = Dict[str, Any]
@@ -50,6 +50,37 @@ class DocumentList(BaseModel):
     links: Optional[Links] = None
     meta: Optional[Meta] = None
 
+# ---------------------------
+# ⚛️ JSON:API Atomic Operations 확장 (https://jsonapi.org/ext/atomic)
+# ---------------------------
+ATOMIC_EXT = "https://jsonapi.org/ext/atomic"
+ATOMIC_MEDIA_TYPE = f'application/vnd.api+json; ext="{ATOMIC_EXT}"'
+
+class ResourceRef(BaseModel):
+    type: str                                  # 대상 리소스 타입 (ex: "session")
+    id: Optional[Union[int, str]] = None       # 대상 리소스 ID
+    relationship: Optional[str] = None         # 관계 대상 (ex: user 의 "sessions")
+
+class ResourceIn(BaseModel):
+    type: str                                  # 생성할 리소스 타입
+    id: Optional[Union[int, str]] = None       # 클라이언트 지정 ID (지원하는 타입만)
+    attributes: JsonObj = {}
+
+class AtomicOperation(BaseModel):
+    op: Literal["add", "update", "remove"]
+    ref: Optional[ResourceRef] = None          # update/remove 대상
+    data: Optional[ResourceIn] = None          # add/update 내용
+
+class AtomicRequest(BaseModel):
+    operations: List[AtomicOperation] = Field(..., alias="atomic:operations", min_length=1)
+
+class AtomicResult(BaseModel):
+    data: Optional[Resource] = None            # 데이터를 돌려주지 않는 연산은 빈 객체 {}
+
+class AtomicResults(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+    results: List[AtomicResult] = Field(..., alias="atomic:results")
+
 # ---------------------------
 # 🛠️ 편의 함수들
 # ---------------------------
@@ -90,3 +121,11 @@ def list_doc(res_list: List[Resource], *, self_url: Optional[str] = None,
         ),
         meta=meta
     )
+
+def atomic_results_doc(results: List[Optional[Resource]]) -> dict:
+    """
+    연산별 결과를 Atomic Operations 응답 문서로 변환 (연산 순서 유지).
+    데이터가 없는 연산은 빈 결과 객체 {} 로 표현.
+    """
+    doc = AtomicResults(results=[AtomicResult(data=r) if r is not None else AtomicResult() for r in results])
+    return doc.model_dump(by_alias=True, exclude_unset=True)
@@ -15,14 +15,22 @@ attendance.py
     - 데이터 흐름이 명확해집니다
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 
+from app.schemas.auth_schema import BCRYPT_MAX_BYTES, check_bcrypt_bytes
+
 class UserCreate(BaseModel):
-    user_id: str    
-    user_name: str
-    user_email: str
-    user_password: str
+    # 길이 제한은 DB 컬럼 길이(String(100))와 bcrypt 입력 한도(72바이트)에 맞춤
+    user_id: str = Field(..., min_length=1, max_length=100)
+    user_name: str = Field(..., min_length=1, max_length=100)
+    user_email: str = Field(..., min_length=3, max_length=100)
+    user_password: str = Field(..., min_length=1, max_length=BCRYPT_MAX_BYTES)
+
+    @field_validator("user_password")
+    @classmethod
+    def _password_bytes(cls, value: str) -> str:
+        return check_bcrypt_bytes(value)
 
 class UserOut(BaseModel):
     id: int
@@ -0,0 +1,61 @@
+"""
+analytics_service.py
+---------------------
+
+로그인/세션 분석 (일별 활성 사용자, 일별 로그인 수, 기기 유형별 활성 사용자)
+
+📌 데이터 흐름:
+    1. auth_service.login / _rotate → bookkeeping_service.record_activity(...)
+    2. write-behind 버퍼에서 (일자, 기기, 사용자) 단위로 카운트 병합
+    3. flush 시 analytics_repo.apply_activity 가 tb_analytics_daily 를 증분 갱신
+    4. 대시보드(/api/admin/analytics/daily)는 롤업 테이블만 조회 → tb_token 크기와 무관하게 일정한 비용
+
+※ write-behind 특성상 최대 flush 주기(write_behind_flush_interval)만큼 늦게 반영되며,
+   프로세스 비정상 종료 시 버퍼에 남은 카운트는 유실될 수 있습니다 (대시보드용 근사치).
+
+※ 기기 유형별 지표는 "활성 세션 수"가 아니라 "활성 사용자 수"(그날 로그인/refresh 한 고유 사용자)입니다.
+   세션 종료는 증감 카운터로 정확히 따라갈 수 없습니다:
+       - 폐기(revoke_all, 세션 상한 eviction)는 기기 정보 없이 여러 행을 한 번에 UPDATE
+       - 만료는 이벤트 없이 시간이 지나서 일어남
+   그래서 롤업은 쓰기 경로에서 정확히 셀 수 있는 값(로그인/refresh/고유 사용자)만 보관합니다.
+   특정 시점의 기기별 활성 세션 수가 필요하면 tb_token(revoked=false, expires_at>now)의 user_agent 를 직접 집계해야 합니다.
+"""
+
+import re
+from datetime import date, datetime, timezone
+from typing import Sequence
+
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.repository import analytics_repo
+
+DEVICE_TYPES = ("desktop", "mobile", "tablet", "bot", "other")
+
+_BOT = re.compile(r"bot|crawl|spider|slurp|curl|wget|python-requests|httpx", re.I)
+_TABLET = re.compile(r"ipad|tablet|kindle|silk|(android(?!.*mobile))", re.I)
+_MOBILE = re.compile(r"mobi|iphone|ipod|android.*mobile|windows phone", re.I)
+_DESKTOP = re.compile(r"windows nt|macintosh|x11|linux x86_64|cros", re.I)
+
+def device_type(user_agent: str | None) -> str:
+    """User-Agent → desktop / mobile / tablet / bot / other"""
+    if not user_agent:
+        return "other"
+    if _BOT.search(user_agent):
+        return "bot"
+    if _TABLET.search(user_agent):
+        return "tablet"
+    if _MOBILE.search(user_agent):
+        return "mobile"
+    if _DESKTOP.search(user_agent):
+        return "desktop"
+    return "other"
+
+def today() -> date:
+    return datetime.now(timezone.utc).date()
+
+def daily_rollups(db: Session, start: date, end: date, device: str | None = None) -> Sequence[Row]:
+    """
+    기간별 일별 롤업 (device=None 이면 기기별 행 + 전체("all") 행 모두)
+    """
+    return analytics_repo.get_daily(db, start, end, device)
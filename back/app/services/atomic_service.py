@@ -0,0 +1,141 @@
+"""
+atomic_service.py
+------------------
+
+JSON:API Atomic Operations 실행 (POST /api/operations)
+
+프론트엔드가 여러 쓰기를 연달아 보내면 요청마다 HTTP 왕복 + 미들웨어 스택 + commit 이 따로 듭니다.
+이 서비스는 연산 목록을 요청 하나, DB 트랜잭션 하나(database.atomic_session)로 처리합니다.
+
+📌 규칙:
+    - 전부 성공하거나 전부 취소 (all-or-nothing): 한 연산이라도 실패하면 전체 롤백 후 OperationError
+    - 실행 전에 모든 연산을 먼저 검사 (지원하지 않는 연산/개수 초과는 DB 를 건드리지 않고 실패)
+    - 결과는 연산 순서대로 (데이터가 없는 연산은 None → 응답에서 {})
+
+📌 지원 연산 (_HANDLERS 에 추가해서 확장):
+    - add    user                          : 회원가입 (attributes = UserCreate)
+    - remove session (id = jti)            : 내 refresh 세션 하나 폐기 (Bearer 필요)
+    - remove user/sessions (id = 내 id)    : 내 refresh 세션 전체 폐기 (Bearer 필요)
+
+※ refresh 세션 샤딩(token_shard_urls)이 켜져 있으면 세션 연산은 메인 DB 트랜잭션에 묶을 수 없으므로 거부합니다.
+"""
+
+from typing import Callable, NamedTuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import sharding
+from app.config.settings import settings
+from app.database import atomic_session
+from app.repository import auth_repo
+from app.schemas.jsonapi import AtomicOperation, Resource, resource
+from app.schemas.user_schema import UserCreate
+from app.services import user_service
+from app.utils.metrics import metrics
+
+class OperationError(Exception):
+    """연산 실패 (index = 실패한 연산 위치, 배치 전체가 롤백됨)"""
+
+    def __init__(self, status: int, detail: str, index: int | None = None):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+        self.index = index
+
+Handler = Callable[[Session, AtomicOperation, int | None], Resource | None]
+
+class _Entry(NamedTuple):
+    handler: Handler
+    token_table: bool   # tb_token 을 쓰는 연산 (샤딩 시 같은 트랜잭션에 묶을 수 없음)
+
+def _require_user(user_id: int | None) -> int:
+    if user_id is None:
+        raise OperationError(401, "authentication required")
+    return user_id
+
+def _add_user(db: Session, op: AtomicOperation, user_id: int | None) -> Resource:
+    try:
+        data = UserCreate.model_validate(op.data.attributes)
+    except ValidationError as exc:
+        raise OperationError(422, str(exc.errors(include_url=False)))
+    user = user_service.create_user(
+        db,
+        user_id=data.user_id,
+        user_name=data.user_name,
+        user_email=data.user_email,
+        user_password=data.user_password,
+    )
+    return resource("user", user.id, {
+        "user_id": user.user_id,
+        "user_name": user.user_name,
+        "user_email": user.user_email,
+    })
+
+def _remove_session(db: Session, op: AtomicOperation, user_id: int | None) -> None:
+    owner = _require_user(user_id)
+    row = auth_repo.get_refresh_row_by_jti(db, str(op.ref.id), user_id=owner)
+    if row is None or row.user_id != owner:   # 남의 세션은 존재 여부도 알리지 않음
+        raise OperationError(404, "session not found")
+    auth_repo.mark_refresh_revoked(db, row.jti, user_id=owner)
+
+def _remove_user_sessions(db: Session, op: AtomicOperation, user_id: int | None) -> None:
+    owner = _require_user(user_id)
+    if str(op.ref.id) != str(owner):
+        raise OperationError(403, "can only revoke your own sessions")
+    auth_repo.revoke_all_refresh_for_user(db, owner)
+
+_HANDLERS: dict[tuple[str, str], _Entry] = {
+    ("add", "user"): _Entry(_add_user, token_table=False),
+    ("remove", "session"): _Entry(_remove_session, token_table=True),
+    ("remove", "user/sessions"): _Entry(_remove_user_sessions, token_table=True),
+}
+
+def _resolve(op: AtomicOperation) -> _Entry:
+    if op.op == "add":
+        if op.data is None:
+            raise OperationError(400, "'add' requires data")
+        key = (op.op, op.data.type)
+    else:
+        if op.ref is None or op.ref.id is None:
+            raise OperationError(400, f"'{op.op}' requires ref with id")
+        key = (op.op, f"{op.ref.type}/{op.ref.relationship}" if op.ref.relationship else op.ref.type)
+    entry = _HANDLERS.get(key)
+    if entry is None:
+        raise OperationError(400, f"unsupported operation: {key[0]} {key[1]}")
+    if entry.token_table and sharding.enabled():
+        raise OperationError(400, "session operations cannot be atomic while refresh sessions are sharded")
+    return entry
+
+def run(operations: list[AtomicOperation], *, user_id: int | None) -> list[Resource | None]:
+    """
+    연산 목록을 트랜잭션 하나로 실행 → 연산별 결과 (실패 시 OperationError, 전체 롤백)
+    """
+    if len(operations) > settings.atomic_max_operations:
+        raise OperationError(400, f"too many operations (max {settings.atomic_max_operations})")
+
+    plan: list[_Entry] = []
+    for i, op in enumerate(operations):
+        try:
+            plan.append(_resolve(op))
+        except OperationError as exc:
+            exc.index = i
+            raise
+
+    results: list[Resource | None] = []
+    with atomic_session() as db:
+        for i, (op, entry) in enumerate(zip(operations, plan)):
+            try:
+                results.append(entry.handler(db, op, user_id))
+            except OperationError as exc:
+                exc.index = i
+                metrics.inc("atomic.rolled_back")
+                raise
+            except IntegrityError as exc:
+                metrics.inc("atomic.rolled_back")
+                raise OperationError(409, "conflicts with existing data", index=i) from exc
+
+    metrics.inc("atomic.batches")
+    metrics.inc("atomic.operations", len(operations))
+    return results
@@ -1,15 +1,41 @@
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4
+import base64
 import hashlib
+import json
+from cryptography.fernet import Fernet, InvalidToken
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
-from app.repository import auth_repo
+from app.repository import auth_repo, user_repo
+from app.services import bookkeeping_service
 from app.config.settings import settings
 from app.schemas.auth_schema import TokenOut, BaseClaims, TokenType
+from app.utils.metrics import metrics
+from app.utils.single_flight import SingleFlight
+from app.utils.ttl_cache import TTLCache
 
 pwd = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Refresh 회전 single-flight + 재사용 유예(grace) 캐시
+#  - 같은 jti 로 동시에 들어온 /refresh 는 하나씩 처리 (회전은 1회만)
+#  - 회전 결과(새 access/refresh)는 암호화해서 old_jti 키로 잠깐 보관
+#  - 유예 시간 안에 같은 refresh 가 다시 오면 재사용 탐지 대신 보관된 결과를 그대로 반환
+_refresh_flight = SingleFlight()
+_refresh_grace = TTLCache(
+    maxsize=settings.refresh_grace_cache_size,
+    ttl=settings.refresh_reuse_grace_seconds,
+)
+# introspection 용 refresh 세션 상태 캐시 (jti -> (active, exp))
+#  - 활성 상태는 introspection_cache_seconds 동안만 캐시 (폐기 반영 지연 상한)
+#  - 폐기/불일치는 되돌릴 수 없으므로 토큰 만료 시각까지 캐시
+_introspect_cache = TTLCache(maxsize=100_000, ttl=settings.introspection_cache_seconds)
+# 세션 상한 초과로 폐기된 refresh 세션 수 (/api/admin/metrics)
+metrics.inc("sessions.evicted", 0)
+_grace_fernet = Fernet(base64.urlsafe_b64encode(
+    hashlib.sha256(f"refresh-grace:{settings.secret_key}".encode("utf-8")).digest()
+))
+
 def _decode_and_require_type(token: str, expected_type: TokenType) -> BaseClaims:
     """
     공용 JWT 1차 검증:
@@ -105,8 +131,8 @@ def login(db: Session, user_id: str, password: str, *, user_agent: str | None =
     3. refresh token 발급 및 DB 저장 (hash 형태)
     4. access/refresh 토큰 반환
     """
-    # 사용자 조회
-    user = auth_repo.get_by_user_id(db, user_id)
+    # 사용자 조회 (검증에 필요한 id, user_password 만)
+    user = auth_repo.get_login_row(db, user_id)
     if not user or not verify_password(password, user.user_password):
         raise ValueError("invalid credentials")
 
@@ -125,7 +151,8 @@ def login(db: Session, user_id: str, password: str, *, user_agent: str | None =
     )
 
     # refresh 토큰은 DB에 해시로만 저장 (보안)
-    auth_repo.create_refresh_session(
+    #  - 사용자별 활성 세션 상한(max_active_sessions_per_user)을 넘으면 가장 오래된 세션부터 폐기
+    evicted = auth_repo.create_refresh_session(
         db,
         user_id=user.id,
         jti=jti,
@@ -133,25 +160,77 @@ def login(db: Session, user_id: str, password: str, *, user_agent: str | None =
         expires_at=datetime.now(timezone.utc) + refresh_exp,
         user_agent=user_agent,
         ip=ip,
+        keep_active=settings.max_active_sessions_per_user,
     )
+    if evicted:
+        metrics.inc("sessions.evicted", evicted)
+    bookkeeping_service.record_activity(user.id, user_agent, "login")   # 분석 롤업 (write-behind)
 
     # 반환: access_token + refresh_token
     return TokenOut(access_token=access, refresh_token=refresh)
 
-def rotate_refresh_and_issue_access(db: Session, refresh_token: str) -> tuple[str, str]:
+# Refresh grace helpers
+def _grace_fingerprint(refresh_token: str, user_agent: str | None) -> str:
+    # 같은 토큰 + 같은 클라이언트(User-Agent)일 때만 재사용 허용
+    return _sha256_hex(f"{refresh_token}\x1f{user_agent or ''}")
+
+def _store_grace(old_jti: str, refresh_token: str, user_agent: str | None,
+                 access: str, new_refresh: str) -> None:
+    if settings.refresh_reuse_grace_seconds <= 0:
+        return
+    blob = json.dumps({
+        "fp": _grace_fingerprint(refresh_token, user_agent),
+        "access": access,
+        "refresh": new_refresh,
+    }).encode("utf-8")
+    _refresh_grace.set(old_jti, _grace_fernet.encrypt(blob))
+
+def _load_grace(old_jti: str, refresh_token: str, user_agent: str | None) -> tuple[str, str] | None:
+    if settings.refresh_reuse_grace_seconds <= 0:
+        return None
+    token = _refresh_grace.get(old_jti)
+    if token is None:
+        return None
+    try:
+        data = json.loads(_grace_fernet.decrypt(token))
+    except InvalidToken:
+        return None
+    if data.get("fp") != _grace_fingerprint(refresh_token, user_agent):
+        # 다른 클라이언트가 같은 refresh 를 제출 → 유예 대상 아님 (기존 재사용 탐지로 진행)
+        return None
+    return data["access"], data["refresh"]
+
+def rotate_refresh_and_issue_access(db: Session, refresh_token: str, *, user_agent: str | None = None) -> tuple[str, str]:
     """
     Refresh 회전 + 재사용 감지:
       - 유효한 refresh면: 새 access + 새 refresh 발급, 기존 refresh 즉시 revoke
       - revoke된 refresh가 다시 오면: 재사용으로 판단하고 사용자의 모든 refresh 폐기
+      - 단, 회전 직후 유예 시간(refresh_reuse_grace_seconds) 안에 같은 클라이언트가
+        같은 refresh 를 다시 보내면 직전에 발급한 결과를 그대로 반환 (멀티 탭 동시 갱신 대응)
     반환: (access_token, new_refresh_token)
     """
     payload = _decode_token(refresh_token)
     if payload.get("type") != "refresh":
         raise ValueError("invalid token type")
 
+    old_jti = payload.get("jti")
+    with _refresh_flight.hold(old_jti):
+        # 유예 시간 내 재요청(다른 탭의 동시 요청 등) → 직전 회전 결과 재사용
+        reused = _load_grace(old_jti, refresh_token, user_agent)
+        if reused:
+            return reused
+
+        access, new_refresh = _rotate(db, refresh_token, payload)
+        _store_grace(old_jti, refresh_token, user_agent, access, new_refresh)
+        return access, new_refresh
+
+def _rotate(db: Session, refresh_token: str, payload: dict) -> tuple[str, str]:
+    """
+    실제 회전 처리 (single-flight lock 안에서만 호출)
+    """
     old_jti = payload.get("jti")
     uid = payload.get("sub")
-    rs = auth_repo.get_refresh_session_by_jti(db, old_jti)
+    rs = auth_repo.get_refresh_row_by_jti(db, old_jti, user_id=int(uid))  # sub 로 샤드 결정
     if not rs:
         raise ValueError("refresh not found")
 
@@ -169,7 +248,11 @@ def rotate_refresh_and_issue_access(db: Session, refresh_token: str) -> tuple[st
 
     # 만료 여부 확인
     now = datetime.now(timezone.utc)
-    if rs.expires_at <= now:
+    expires_at = rs.expires_at
+    if expires_at.tzinfo is None:
+        # MySQL/SQLite 드라이버는 tz 정보 없이 돌려줌 → UTC 로 간주
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    if expires_at <= now:
         raise ValueError("refresh expired")
 
     # ---- 새 access 발급 ----
@@ -187,7 +270,7 @@ def rotate_refresh_and_issue_access(db: Session, refresh_token: str) -> tuple[st
     )
 
     # 기존 refresh 즉시 revoke
-    auth_repo.mark_refresh_revoked(db, old_jti)
+    auth_repo.mark_refresh_revoked(db, old_jti, user_id=int(uid))
 
     # 새 refresh 세션 저장
     auth_repo.create_refresh_session(
@@ -200,8 +283,9 @@ def rotate_refresh_and_issue_access(db: Session, refresh_token: str) -> tuple[st
         ip=rs.ip,
     )
 
-    # 사용 흔적 업데이트(선택): old_jti를 남기고 싶으면 위에 touch 호출 유지 가능
-    auth_repo.touch_refresh_last_used(db, old_jti)
+    # 사용 흔적 업데이트(선택): 요청 경로에서 빼서 write-behind 로 배치 처리
+    bookkeeping_service.touch_refresh(old_jti)
+    bookkeeping_service.record_activity(int(uid), rs.user_agent, "refresh")
 
     return access, new_refresh
 
@@ -214,11 +298,74 @@ def logout(db: Session, refresh_token: str) -> None:
     try:
         payload = _decode_token(refresh_token)
         jti = payload.get("jti")
-        auth_repo.mark_refresh_revoked(db, jti)
-    except JWTError:
+        auth_repo.mark_refresh_revoked(db, jti, user_id=int(payload["sub"]))
+    except (JWTError, KeyError, TypeError, ValueError):
         # 이미 만료되었거나 손상된 토큰이면 무시 (쿠키만 지우면 됨)
         pass
 
 def me(db: Session, user_id: int):
-    user = auth_repo.get_by_user_id(db, user_id)
-    return user
\ No newline at end of file
+    # access token 의 sub 는 User.id(PK) → 공개 필드만 row 로 조회
+    user = user_repo.get_public_row(db, user_id)
+    return user
+
+def me_version(db: Session, user_id: int):
+    """
+    /me ETag 계산용 (id, user_updated_at) 조회
+    - 없으면 None
+    """
+    return user_repo.get_version_by_id(db, user_id)
+
+def introspect_many(db: Session, tokens: list[str]) -> list[dict]:
+    """
+    배치 토큰 introspection (RFC 7662 유사 응답)
+      1. 서명/만료/타입 검증은 DB 없이 처리
+      2. refresh 토큰만 DB 상태 확인 → 캐시에 없는 jti 만 IN 쿼리 한 번으로 조회
+      3. access 토큰은 상태 저장이 없으므로 서명/만료만으로 판단
+    반환: 입력 순서대로 {"active", "uid", "exp", "token_type", "jti"} (비활성이면 {"active": False})
+    """
+    results: list[dict] = []
+    to_check: dict[str, list[int]] = {}   # 확인이 필요한 refresh jti -> 결과 인덱스 목록
+    hashes: dict[int, str] = {}
+
+    for i, token in enumerate(tokens):
+        try:
+            payload = _decode_token(token)
+            typ = payload.get("type")
+            uid = int(payload["sub"])
+            jti = str(payload.get("jti") or "")
+            if typ not in ("access", "refresh") or (typ == "refresh" and not jti):
+                raise ValueError("invalid token type")
+        except (JWTError, KeyError, TypeError, ValueError):
+            results.append({"active": False})
+            continue
+
+        results.append({"active": True, "uid": uid, "exp": payload.get("exp"), "token_type": typ, "jti": jti})
+        if typ == "refresh":
+            cached = _introspect_cache.get((jti, _sha256_hex(token)))
+            if cached is not None:
+                results[i]["active"] = cached
+            else:
+                to_check.setdefault(jti, []).append(i)
+                hashes[i] = _sha256_hex(token)
+
+    if to_check:
+        states = auth_repo.get_refresh_states(db, list(to_check))
+        now = datetime.now(timezone.utc)
+        for jti, indexes in to_check.items():
+            row = states.get(jti)
+            for i in indexes:
+                ttl = None   # 기본: introspection_cache_seconds
+                if row is None:
+                    # 행이 없음 → 짧게만 캐시 (샤드 재배치 중 이동 중인 행일 수 있음)
+                    active = False
+                elif row.revoked or row.token_hash != hashes[i]:
+                    # 폐기/불일치는 토큰이 만료될 때까지 바뀌지 않음
+                    active = False
+                    ttl = max(1, int(results[i]["exp"] or 0) - int(now.timestamp()))
+                else:
+                    expires_at = row.expires_at if row.expires_at.tzinfo else row.expires_at.replace(tzinfo=timezone.utc)
+                    active = expires_at > now
+                results[i]["active"] = active
+                _introspect_cache.set((jti, hashes[i]), active, ttl=ttl)
+
+    return [r if r["active"] else {"active": False} for r in results]
@@ -0,0 +1,50 @@
+"""
+bookkeeping_service.py
+-----------------------
+
+요청 응답과 무관한 부가 쓰기(bookkeeping)를 write-behind 로 처리하는 서비스
+
+- touch_refresh(jti): refresh 세션 last_used_at 갱신 (jti 별 병합 → 배치 UPDATE)
+- record_activity(user_id, user_agent, kind): 로그인/refresh 분석 롤업 (일자·기기·사용자 별 카운트 합산 → 배치 upsert)
+- 감사 로그/로그인 이력 등 새 부가 쓰기는 여기서 op 를 register 하고 submit 하는 함수를 추가하세요.
+
+백그라운드 flush 스레드는 main.py lifespan 에서 start()/stop() 합니다.
+"""
+
+from datetime import datetime, timezone
+
+from app.config.settings import settings
+from app.database import SessionLocal
+from app.repository import analytics_repo, auth_repo
+from app.services import analytics_service
+from app.utils.write_behind import WriteBehind
+
+writes = WriteBehind(
+    SessionLocal,
+    flush_interval=settings.write_behind_flush_interval,
+    flush_threshold=settings.write_behind_flush_threshold,
+    max_pending=settings.write_behind_max_pending,
+)
+
+writes.register("touch_refresh", auth_repo.touch_refresh_last_used_many)
+writes.register(
+    "analytics_activity",
+    analytics_repo.apply_activity,
+    merge=lambda old, new: (old[0] + new[0], old[1] + new[1]),   # (logins, refreshes) 누적
+)
+
+def touch_refresh(jti: str) -> None:
+    """refresh 세션 마지막 사용 시각 갱신 예약"""
+    writes.submit("touch_refresh", jti, datetime.now(timezone.utc))
+
+def record_activity(user_id: int, user_agent: str | None, kind: str) -> None:
+    """로그인(kind="login") / refresh(kind="refresh") 1건을 분석 롤업에 반영 예약"""
+    key = (analytics_service.today(), analytics_service.device_type(user_agent), int(user_id))
+    writes.submit("analytics_activity", key, (1, 0) if kind == "login" else (0, 1))
+
+def start() -> None:
+    if settings.write_behind_enabled:
+        writes.start()
+
+def stop() -> None:
+    writes.stop()
@@ -0,0 +1,152 @@
+"""
+search_service.py
+------------------
+
+관리자 화면용 사용자 타입어헤드 검색
+
+📌 두 가지 경로:
+    1. DB 접두사 검색 (기본): user_repo.search_by_prefix → `LIKE 'abc%'` + 인덱스 range scan
+    2. 프로세스 내 접두사 인덱스 (settings.user_search_index_enabled=True):
+        - 첫 검색 시 tb_user 공개 필드를 한 번 읽어 정렬 배열(PrefixIndex) 구성
+        - 이후 User ORM 쓰기(insert/update/delete)가 commit 될 때마다 증분 반영
+        - 검색 시 DB 왕복 없이 메모리에서 바로 결과 반환
+
+※ 인덱스는 워커(프로세스)마다 따로 존재합니다. 다른 워커에서 생긴 변경이나
+   ORM 을 거치지 않는 벌크 SQL 변경은 반영되지 않으므로, 필요하면 rebuild() 를 호출하세요.
+"""
+
+import heapq
+import threading
+from typing import Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.config.settings import settings
+from app.database import SessionLocal, run_after_commit
+from app.models import User
+from app.repository import user_repo
+from app.utils.prefix_index import PrefixIndex
+
+_PENDING_KEY = "user_search_pending"
+_ROW_FIELDS = ("id",) + user_repo.SEARCH_FIELDS
+
+class UserSearchIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._fields = {f: PrefixIndex() for f in user_repo.SEARCH_FIELDS}
+        self._rows: dict[int, tuple] = {}    # id -> (id, user_id, user_name, user_email)
+        self._loaded = False
+        self._loading = False
+        self._backlog: list[tuple] = []      # 로딩 중 들어온 변경 (로딩 후 재적용)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def rebuild(self) -> None:
+        """DB 에서 전체 재구성"""
+        with self._lock:
+            self._loading = True
+        db = SessionLocal()
+        try:
+            rows = [tuple(r) for r in user_repo.stream_users(db, _ROW_FIELDS)]
+        finally:
+            db.close()
+        with self._lock:
+            self._rows = {r[0]: r for r in rows}
+            for i, name in enumerate(user_repo.SEARCH_FIELDS, start=1):
+                self._fields[name].bulk_load([(r[i], r[0]) for r in rows])
+            self._loaded, self._loading = True, False
+            backlog, self._backlog = self._backlog, []
+            for change in backlog:
+                self._apply(*change)
+
+    def ensure_loaded(self) -> None:
+        if not self._loaded:
+            with self._lock:
+                if self._loaded or self._loading:
+                    return
+            self.rebuild()
+
+    def _apply(self, op: str, row: tuple) -> None:
+        old = self._rows.pop(row[0], None)
+        if old:
+            for i, name in enumerate(user_repo.SEARCH_FIELDS, start=1):
+                self._fields[name].remove(old[i], old[0])
+        if op != "delete":
+            self._rows[row[0]] = row
+            for i, name in enumerate(user_repo.SEARCH_FIELDS, start=1):
+                self._fields[name].add(row[i], row[0])
+
+    def apply(self, changes: Iterable[tuple[str, tuple]]) -> None:
+        """commit 된 변경 반영 (op: insert/update/delete, row: 공개 필드 튜플)"""
+        with self._lock:
+            if self._loading:
+                self._backlog.extend(changes)
+            elif self._loaded:
+                for op, row in changes:
+                    self._apply(op, row)
+
+    def search(self, field: str, q: str, *, offset: int, limit: int) -> list[tuple]:
+        with self._lock:
+            if field != "all":
+                ids = self._fields[field].search(q, offset, limit)
+            else:
+                # 세 필드 결과를 합쳐 id 순으로 (중복 제거)
+                merged = heapq.merge(*(sorted(set(ix.iter_ids(q))) for ix in self._fields.values()))
+                ids, last, skipped = [], None, 0
+                for id_ in merged:
+                    if id_ == last:
+                        continue
+                    last = id_
+                    if skipped < offset:
+                        skipped += 1
+                        continue
+                    ids.append(id_)
+                    if len(ids) >= limit:
+                        break
+            return [self._rows[i] for i in ids]
+
+user_search_index = UserSearchIndex()
+
+# ---------------------------
+# 🔔 ORM 쓰기 → commit 시 인덱스 증분 반영
+# ---------------------------
+def _queue(op: str):
+    def listener(mapper, connection, target: User):
+        session = object_session(target)
+        if session is not None:
+            row = tuple(getattr(target, f) for f in _ROW_FIELDS)
+            session.info.setdefault(_PENDING_KEY, []).append((op, row))
+    return listener
+
+def _after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        # atomic_session 안이면 바깥 트랜잭션이 실제로 COMMIT 된 뒤에 반영 (롤백되면 버림)
+        run_after_commit(session, lambda: user_search_index.apply(pending))
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+if settings.user_search_index_enabled:
+    event.listen(User, "after_insert", _queue("insert"))
+    event.listen(User, "after_update", _queue("update"))
+    event.listen(User, "after_delete", _queue("delete"))
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+
+# ---------------------------
+# 🔎 검색
+# ---------------------------
+def search_users(db: Session, q: str, field: str = "all", *, offset: int = 0, limit: int = 20) -> list[tuple]:
+    """
+    접두사 검색 → (id, user_id, user_name, user_email) 목록
+    - 인덱스가 켜져 있으면 메모리 인덱스, 아니면 DB 접두사 쿼리
+    """
+    if settings.user_search_index_enabled:
+        user_search_index.ensure_loaded()
+        if user_search_index.loaded:
+            return user_search_index.search(field, q, offset=offset, limit=limit)
+    return [tuple(r) for r in user_repo.search_by_prefix(db, field, q, offset=offset, limit=limit)]
@@ -11,7 +11,14 @@ attendance_service.py
     - 라우터는 "입출력 처리", repository는 "데이터 접근", 서비스는 "업무 로직"을 담당합니다.
 """
 
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator, Sequence
 from sqlalchemy.orm import Session
+from app.config.settings import settings
+from app.database import SessionLocal
 from app.repository import user_repo
 from app.models import User
 from app.services import auth_service
@@ -25,4 +32,39 @@ def create_user(db: Session, user_id: str, user_name: str, user_email: str, user
         user_name=user_name,
         user_email=user_email,
         user_password=hashed_pw
-    )
\ No newline at end of file
+    )
+
+# 사용자 내보내기 (스트리밍)
+def _jsonable(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def export_users(
+    columns: Sequence[str], fmt: str, *, updated_since: datetime | None = None
+) -> Iterator[str]:
+    """
+    사용자 목록을 NDJSON 또는 CSV 문자열 청크로 생성하는 제너레이터
+    - 응답이 끝날 때까지 살아 있어야 하므로 요청 의존성(get_db)과 별도로 자체 세션을 열고 닫음
+    - 행을 export_chunk_bytes 정도씩 모아서 내보냄 (전송 호출 횟수 감소)
+    """
+    db = SessionLocal()
+    buf = io.StringIO()
+    writer = csv.writer(buf) if fmt == "csv" else None
+    try:
+        if writer:
+            writer.writerow(columns)
+        for row in user_repo.stream_users(
+            db, columns, updated_since=updated_since, batch_size=settings.export_batch_size
+        ):
+            if writer:
+                writer.writerow([_jsonable(v) for v in row])
+            else:
+                buf.write(json.dumps({k: _jsonable(v) for k, v in zip(columns, row)}, ensure_ascii=False))
+                buf.write("\n")
+            if buf.tell() >= settings.export_chunk_bytes:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        if buf.tell():
+            yield buf.getvalue()
+    finally:
+        db.close()
@@ -0,0 +1,62 @@
+"""
+sharding.py
+------------
+
+refresh 세션(tb_token) 수평 샤딩
+
+tb_token 은 로그인/refresh 마다 INSERT 가 일어나는 가장 쓰기가 많은 테이블입니다.
+settings.token_shard_urls 에 DB 를 여러 개 지정하면 RefreshSession 행을 user_id 해시로 나눠 저장합니다.
+
+📌 규칙:
+    - 샤드 번호 = blake2b(user_id) % 샤드 수 (shard_for_user)
+    - jti 로만 찾는 경로는 refresh 토큰의 sub(User.id)로 샤드를 정함 → auth_repo 의 user_id 인자
+    - 샤드 수를 바꾸면 tools.rebalance_token_shards 로 행을 새 소유 샤드로 옮깁니다.
+      옮기는 동안 소유 샤드에 없으면 나머지 샤드도 확인합니다 (shard_order).
+    - 샤드에는 tb_token 만 존재하므로 tb_user 로의 외래키 없이 생성합니다 (create_shard_tables).
+
+token_shard_urls 가 비어 있으면 기존처럼 요청 세션(메인 DB)을 그대로 사용합니다.
+"""
+
+import hashlib
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.config.settings import settings
+from app.database import make_engine
+from app.models import RefreshSession
+
+_engines: list[Engine] = [make_engine(url, name=f"token_shard{i}") for i, url in enumerate(settings.token_shard_urls)]
+
+def enabled() -> bool:
+    return bool(_engines)
+
+def engines() -> list[Engine]:
+    return _engines
+
+def shard_for_user(user_id: int, shard_count: int | None = None) -> int:
+    """user_id → 샤드 번호 (프로세스/플랫폼과 무관하게 안정적인 해시)"""
+    digest = hashlib.blake2b(str(int(user_id)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % (shard_count or len(_engines))
+
+def shard_order(user_id: int | None) -> list[Engine]:
+    """조회 순서: 소유 샤드 먼저, 그다음 나머지 (user_id 를 모르면 전체)"""
+    if user_id is None:
+        return list(_engines)
+    owner = shard_for_user(user_id)
+    return [_engines[owner]] + [e for i, e in enumerate(_engines) if i != owner]
+
+def create_token_table(bind: Engine) -> None:
+    """샤드 DB 에 tb_token (+ 인덱스) 생성, 외래키 제외 / 이미 있으면 건너뜀"""
+    table = RefreshSession.__table__
+    if inspect(bind).has_table(table.name):
+        return
+    with bind.begin() as conn:
+        conn.execute(CreateTable(table, include_foreign_key_constraints=[]))
+        for index in table.indexes:
+            conn.execute(CreateIndex(index))
+
+def create_shard_tables() -> None:
+    for shard in _engines:
+        create_token_table(shard)
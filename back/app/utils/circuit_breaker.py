@@ -0,0 +1,186 @@
+"""
+circuit_breaker.py
+-------------------
+
+DB 서킷 브레이커 (MySQL 장애/포화 시 빠른 실패)
+
+DB 가 죽거나 포화되면 요청마다 커넥션 checkout · pool_pre_ping · 연결 타임아웃을 기다리느라
+스레드풀 스레드가 쌓이고, DB 와 무관한 요청까지 같이 멈춥니다.
+서킷 브레이커는 연속 실패를 감지하면 일정 시간 동안 DB 호출 자체를 시도하지 않고 즉시 503 을 돌려줍니다.
+
+📌 상태 전이:
+    closed ──(연결 실패·끊김·풀 타임아웃 failure_threshold 회 연속)──▶ open
+    open ──(reset_timeout 경과)──▶ half_open
+    half_open ──(프로브 요청의 SQL 성공)──▶ closed
+    half_open ──(프로브 요청 실패)──▶ open (reset_timeout 다시 시작)
+
+📌 적용 위치 (install_circuit_breaker / database.get_db):
+    - get_db        : allow() — open 이면 세션을 만들기 전에 CircuitOpenError → 503 problem+json
+                      half_open 에서는 half_open_probes 개 요청만 프로브로 통과
+    - do_connect    : check() — open 동안 새 DB 연결 시도 자체를 막음 (백그라운드 스레드, 샤드 엔진 포함)
+    - handle_error  : 연결 실패 / 연결 끊김 → record_failure() (쿼리 단위 오류·타임아웃은 제외, _is_failure)
+    - after_cursor_execute · 연결 성공 → record_success()
+
+상태는 `GET /api/admin/metrics` 의 circuit.<이름>.state (0=closed, 1=half_open, 2=open) 로 확인합니다.
+"""
+
+import logging
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.metrics import metrics
+
+logger = logging.getLogger("app.circuit_breaker")
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 DB 호출을 시도하지 않음"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"circuit '{name}' is open")
+        self.name = name
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    def __init__(self, name: str, *, failure_threshold: int, reset_timeout: float, half_open_probes: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self._failures = 0
+        self._probes = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+        metrics.gauge(f"circuit.{name}.state", lambda: _STATE_VALUE[self.state])
+        metrics.gauge(f"circuit.{name}.failures", lambda: self._failures)
+        for counter in ("opened", "rejected", "probes"):
+            metrics.inc(f"circuit.{name}.{counter}", 0)
+
+    # ---------------------------
+    # 🚦 호출 허용 여부
+    # ---------------------------
+    def allow(self) -> bool:
+        """
+        요청 단위 허용 여부 (get_db)
+        - open 이면 CircuitOpenError
+        - 반환값 True = half_open 프로브로 통과 → 요청이 끝나면 release() 호출
+        """
+        if self.state == CLOSED:    # 정상 상태는 Lock 없이 통과
+            return False
+        with self._lock:
+            self._maybe_half_open()
+            if self.state == OPEN:
+                self._reject(self._opened_at + self.reset_timeout - time.monotonic())
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    self._reject(1.0)
+                self._probes += 1
+                metrics.inc(f"circuit.{self.name}.probes")
+                return True
+            return False
+
+    def check(self) -> None:
+        """연결 단위 확인 (do_connect) — open 동안만 막고 프로브 수는 세지 않음"""
+        if self.state == CLOSED:
+            return
+        with self._lock:
+            self._maybe_half_open()
+            if self.state == OPEN:
+                self._reject(self._opened_at + self.reset_timeout - time.monotonic())
+
+    def release(self) -> None:
+        """결과 없이 끝난 프로브 슬롯 반환 (DB 를 쓰지 않은 요청 등)"""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def retry_after(self) -> float:
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    # ---------------------------
+    # 📝 결과 기록
+    # ---------------------------
+    def record_success(self) -> None:
+        if self.state == CLOSED and self._failures == 0:
+            return
+        with self._lock:
+            self._failures = 0
+            if self.state != CLOSED:
+                logger.warning("circuit '%s' closed", self.name)
+                self.state = CLOSED
+                self._probes = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self._failures >= self.failure_threshold):
+                self._open()
+
+    # ---------------------------
+    # 🔒 내부 (Lock 안에서 호출)
+    # ---------------------------
+    def _open(self) -> None:
+        if self.state != OPEN:
+            logger.warning("circuit '%s' opened after %d consecutive failures", self.name, self._failures)
+            metrics.inc(f"circuit.{self.name}.opened")
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._probes = 0
+
+    def _maybe_half_open(self) -> None:
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self._probes = 0
+
+    def _reject(self, retry_after: float) -> None:
+        metrics.inc(f"circuit.{self.name}.rejected")
+        raise CircuitOpenError(self.name, max(0.0, retry_after))
+
+breakers: dict[str, CircuitBreaker] = {}
+
+def _is_failure(ctx) -> bool:
+    """
+    DB 에 닿지 못했다는 신호만 실패로 셈
+        - 연결 시도 실패 (ctx.connection 이 None = 새 DBAPI 연결을 만드는 중)
+        - 연결 끊김 (is_disconnect: MySQL 2006/2013 등)
+    문장 단위 OperationalError 는 세지 않음 — 데드락/잠금 대기(1213/1205), SQLite "database is locked",
+    deadline 이 일부러 중단시킨 쿼리(MAX_EXECUTION_TIME, progress handler)는 DB 가 살아 있다는 뜻이고,
+    느리거나 경합이 심한 엔드포인트 하나 때문에 모든 요청이 503 이 되면 안 되기 때문
+    (커넥션 풀 checkout 타임아웃은 database.get_db 에서 기록)
+    """
+    if ctx.is_pre_ping:     # pre_ping 실패 후 재연결을 시도하므로 재연결 결과로 판단
+        return False
+    return ctx.is_disconnect or ctx.connection is None
+
+def install_circuit_breaker(engine: Engine, breaker: CircuitBreaker) -> CircuitBreaker:
+    """엔진에 서킷 브레이커 연결 (breakers[breaker.name] 로 등록)"""
+    breakers[breaker.name] = breaker
+
+    @event.listens_for(engine, "do_connect", insert=True)
+    def _gate(dialect, conn_rec, cargs, cparams):
+        breaker.check()
+
+    @event.listens_for(engine, "connect")
+    def _connected(dbapi_conn, conn_rec):
+        breaker.record_success()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _executed(conn, cursor, statement, parameters, context, executemany):
+        breaker.record_success()
+
+    # insert=True: deadline 훅이 DeadlineExceeded 로 바꿔 던지기 전에 먼저 실패를 기록
+    @event.listens_for(engine, "handle_error", insert=True)
+    def _failed(ctx):
+        if _is_failure(ctx):
+            breaker.record_failure()
+
+    return breaker
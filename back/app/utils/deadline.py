@@ -0,0 +1,86 @@
+"""
+deadline.py
+------------
+
+요청 단위 마감 시각(deadline) 전파
+
+- middlewares/deadline.py 가 요청마다 마감 시각을 contextvar 에 넣습니다.
+  (동기 라우터/의존성은 스레드풀에서 실행되지만 contextvar 는 복사되어 함께 전달됩니다)
+- install_statement_timeouts(engine) 는 SQL 실행 직전마다 남은 시간을 읽어:
+    - 이미 지났으면 DB 에 보내지 않고 DeadlineExceeded 발생
+    - MySQL  : SELECT 에 `/*+ MAX_EXECUTION_TIME(ms) */` 힌트 삽입 (서버가 쿼리를 중단)
+    - SQLite : progress handler 로 실행 중인 쿼리를 중단
+  DB 가 타임아웃으로 중단한 오류도 DeadlineExceeded 로 바꿔, errors/handlers.py 에서 504 로 응답합니다.
+
+※ MySQL 의 MAX_EXECUTION_TIME 은 SELECT 에만 적용됩니다. 쓰기 문장은 innodb_lock_wait_timeout 에 의존합니다.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+class DeadlineExceeded(Exception):
+    """요청 마감 시각 초과"""
+
+def remaining() -> float | None:
+    """남은 시간(초). 마감 시각이 없으면 None"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+def check() -> None:
+    """마감 시각이 지났으면 DeadlineExceeded 발생 (긴 루프 중간 점검용)"""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded()
+
+@contextmanager
+def deadline_scope(seconds: float | None) -> Iterator[None]:
+    """현재 컨텍스트에 마감 시각 설정 (seconds 가 None/0 이면 마감 없음)"""
+    token = _deadline.set(time.monotonic() + seconds if seconds else None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+# ---------------------------
+# 🗄️ DB statement timeout 연동
+# ---------------------------
+_SQLITE_PROGRESS_STEPS = 1000   # progress handler 호출 간격 (VM 명령 수)
+
+def _sqlite_progress(deadline: float):
+    return lambda: 1 if time.monotonic() >= deadline else 0
+
+def install_statement_timeouts(engine: Engine) -> None:
+    dialect = engine.dialect.name
+
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        left = remaining()
+        if left is None:
+            if dialect == "sqlite":
+                conn.connection.driver_connection.set_progress_handler(None, 0)
+            return statement, parameters
+        if left <= 0:
+            raise DeadlineExceeded()
+        if dialect == "mysql" and statement.lstrip()[:6].upper() == "SELECT":
+            ms = max(1, int(left * 1000))
+            statement = statement.lstrip()
+            statement = f"SELECT /*+ MAX_EXECUTION_TIME({ms}) */{statement[6:]}"
+        elif dialect == "sqlite":
+            conn.connection.driver_connection.set_progress_handler(
+                _sqlite_progress(_deadline.get()), _SQLITE_PROGRESS_STEPS
+            )
+        return statement, parameters
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(ctx):
+        # 마감 시각이 지난 상태에서 난 DB 오류(쿼리 중단) → DeadlineExceeded
+        left = remaining()
+        if left is not None and left <= 0 and not isinstance(ctx.original_exception, DeadlineExceeded):
+            raise DeadlineExceeded() from ctx.original_exception
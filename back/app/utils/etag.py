@@ -0,0 +1,88 @@
+"""
+etag.py
+--------
+
+JSON:API 리소스용 ETag / 조건부 GET(If-None-Match) 헬퍼 모음입니다.
+
+📌 사용 흐름 (라우터):
+    1. 가벼운 "버전 조회"(id + updated_at 만 SELECT)로 ETag 계산
+    2. `not_modified(request, etag)` 가 304 응답을 돌려주면 그대로 반환
+       → 전체 엔티티 조회/직렬화 생략
+    3. 아니면 평소처럼 문서를 만들고 `set_etag(response, etag)` 로 헤더 부착
+
+`resource_etag` 는 `single_doc`, `list_etag` 는 `list_doc` 응답에 대응합니다.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Iterable, Optional, Tuple, Union
+
+from fastapi import Request, Response
+
+from app.errors import codes
+
+# ETag 계산에 쓰이는 (type, id, updated_at) 묶음
+Version = Tuple[str, Union[int, str], Optional[datetime]]
+
+def _stamp(updated_at: Optional[datetime]) -> str:
+    # DB 드라이버에 따라 tz 정보 유무가 달라도 같은 값이 나오도록 isoformat 사용
+    return updated_at.isoformat() if updated_at else "-"
+
+def make_etag(*parts: str) -> str:
+    """
+    주어진 문자열 조각으로 강한(strong) ETag 생성 → '"<sha1 hex>"'
+    """
+    h = hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+    return f'"{h}"'
+
+def resource_etag(type_: str, id_: Union[int, str], updated_at: Optional[datetime]) -> str:
+    """
+    단일 리소스(single_doc)용 ETag
+    예: resource_etag("user", 1, user.user_updated_at)
+    """
+    return make_etag(type_, str(id_), _stamp(updated_at))
+
+def list_etag(versions: Iterable[Version], *, extra: str = "") -> str:
+    """
+    리소스 목록(list_doc)용 ETag
+    - 각 항목의 (type, id, updated_at) 순서를 그대로 반영 (정렬/페이지가 바뀌면 ETag도 바뀜)
+    - extra: 페이지 번호, 필터 등 목록 자체를 구분하는 값
+    """
+    parts = [extra]
+    for type_, id_, updated_at in versions:
+        parts.append(f"{type_}:{id_}:{_stamp(updated_at)}")
+    return make_etag(*parts)
+
+def _matches(header: str, etag: str) -> bool:
+    """
+    If-None-Match 비교 (RFC 9110: weak comparison → W/ 접두사는 무시)
+    """
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+def set_etag(response: Response, etag: str) -> None:
+    """
+    응답에 ETag + 재검증 강제 Cache-Control 부착
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    If-None-Match 가 현재 ETag 와 일치하면 304 응답 반환, 아니면 None
+    - 본문 직렬화 전에 호출해야 의미가 있음
+    """
+    header = request.headers.get("if-none-match")
+    if not header or not _matches(header, etag):
+        return None
+    response = Response(status_code=codes.HTTP_304_NOT_MODIFIED)
+    set_etag(response, etag)
+    return response
@@ -0,0 +1,51 @@
+"""
+latency_injection.py
+---------------------
+
+테스트/벤치마크 전용: DB 왕복 지연 및 장애 주입
+
+로컬의 임베디드/같은 호스트 DB 는 왕복 비용이 거의 0 이라 auth_repo 호출이 공짜처럼 보입니다.
+운영 MySQL 은 왕복마다 1~5ms 가 더해지므로, 이 모듈로 엔진에 인위적인 지연을 넣어
+"SQL/commit 횟수가 많은 경로"가 로컬에서도 느리게 드러나도록 합니다.
+
+- SQL 실행마다 statement_ms (+ 0~jitter_ms 무작위) 만큼 대기
+- commit 마다 commit_ms (+ jitter) 만큼 대기
+- failure_rate 확률로 SQL 실행을 OperationalError 로 실패시킴 (재시도/에러 처리 경로 점검용)
+
+settings.db_latency_enabled=True 일 때 database.py 에서 설치됩니다. 운영 환경에서는 켜지 마세요.
+"""
+
+import random
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from app.utils.metrics import metrics
+
+class InjectedDBError(Exception):
+    """failure_rate 로 주입된 가짜 DB 장애"""
+
+def install_latency_injection(
+    engine: Engine, *, statement_ms: float = 0.0, commit_ms: float = 0.0,
+    jitter_ms: float = 0.0, failure_rate: float = 0.0, seed: int | None = None,
+) -> None:
+    rng = random.Random(seed)
+
+    def _sleep(base_ms: float) -> None:
+        delay = base_ms + (rng.uniform(0, jitter_ms) if jitter_ms else 0.0)
+        if delay > 0:
+            metrics.inc("db_latency.injected_ms", delay)
+            time.sleep(delay / 1000)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        _sleep(statement_ms)
+        if failure_rate and rng.random() < failure_rate:
+            metrics.inc("db_latency.injected_failures")
+            raise OperationalError(statement, parameters, InjectedDBError("injected failure"))
+
+    @event.listens_for(engine, "commit")
+    def _on_commit(conn):
+        _sleep(commit_ms)
@@ -0,0 +1,49 @@
+"""
+metrics.py
+-----------
+
+프로세스 내부 경량 메트릭 레지스트리
+
+- counter: 누적 값 (예: 드롭된 쓰기 수, 세션 eviction 수)
+- gauge  : 조회 시점에 계산되는 현재 값 (예: 대기 중인 쓰기 수, 서킷 상태)
+
+`GET /api/admin/metrics` 에서 snapshot() 결과를 그대로 노출합니다.
+Prometheus 등으로 옮길 때는 이 모듈만 교체하면 됩니다.
+"""
+
+import threading
+from typing import Callable
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = {}
+        self._gauges: dict[str, Callable[[], float]] = {}
+
+    def inc(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def gauge(self, name: str, fn: Callable[[], float]) -> None:
+        """조회 시점에 fn() 을 호출해 값을 읽는 게이지 등록"""
+        with self._lock:
+            self._gauges[name] = fn
+
+    def get(self, name: str) -> float:
+        with self._lock:
+            if name in self._gauges:
+                return self._gauges[name]()
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+        for name, fn in gauges.items():
+            try:
+                counters[name] = fn()
+            except Exception:
+                counters[name] = -1
+        return dict(sorted(counters.items()))
+
+metrics = Metrics()
@@ -0,0 +1,206 @@
+"""
+online_migration.py
+--------------------
+
+대용량 테이블(tb_user, tb_token 등)을 서비스 중단 없이 변경하기 위한 Alembic 마이그레이션 헬퍼입니다.
+
+📌 제공 기능:
+    - backfill_in_batches : PK 구간 단위로 나눠 UPDATE → 배치마다 커밋, 배치 사이 sleep 으로 부하 조절
+                            진행 상황(last_pk)을 tb_migration_progress 에 기록 → 중단 후 재실행 시 이어서 진행
+                            배치마다 처리 속도(rows/s)와 ETA 로그 출력
+    - create_index_online : 쓰기를 막지 않는 인덱스 생성
+                            (MySQL: ALGORITHM=INPLACE, LOCK=NONE / PostgreSQL: CONCURRENTLY / 그 외: 일반 CREATE INDEX)
+    - drop_index_online   : 위와 동일한 방식의 인덱스 삭제
+
+📌 사용 예시 (alembic/versions/xxxx.py):
+
+    from app.utils.online_migration import backfill_in_batches, create_index_online
+
+    def upgrade() -> None:
+        op.add_column("tb_token", sa.Column("family", sa.String(36), nullable=True))
+        # autocommit_block: 배치마다 별도 트랜잭션으로 커밋 (긴 트랜잭션/테이블 잠금 방지)
+        with op.get_context().autocommit_block():
+            backfill_in_batches(op.get_bind(), "tb_token", "family = jti",
+                                where="family IS NULL", name="0007_token_family")
+            create_index_online(op.get_bind(), "ix_tb_token_user_revoked", "tb_token", ["user_id", "revoked"])
+
+※ Connection 을 넘기면 호출자가 autocommit 상태를 보장해야 하고, Engine 을 넘기면 배치마다 engine.begin() 으로 커밋합니다.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, Sequence
+
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table, func, inspect, select, text,
+)
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger("alembic.online")
+
+PROGRESS_TABLE = "tb_migration_progress"
+
+# 앱 모델(Base.metadata)과 분리된 메타데이터 → autogenerate 대상 아님 (env.py include_object 참고)
+_progress_meta = MetaData()
+progress_table = Table(
+    PROGRESS_TABLE, _progress_meta,
+    Column("name", String(100), primary_key=True),   # 백필 작업 이름 (마이그레이션 리비전 등)
+    Column("last_pk", Integer, nullable=False),      # 마지막으로 처리 완료한 PK (이 값 이하 처리 완료)
+    Column("rows_done", Integer, nullable=False, default=0),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now(), onupdate=func.now()),
+)
+
+Bind = Connection | Engine
+
+@contextmanager
+def _tx(bind: Bind) -> Iterator[Connection]:
+    # Engine → 배치마다 새 트랜잭션 / Connection → 호출자의 autocommit 모드에 맡김
+    if isinstance(bind, Engine):
+        with bind.begin() as conn:
+            yield conn
+    else:
+        yield bind
+
+def _load_progress(bind: Bind, name: str) -> tuple[int | None, int]:
+    with _tx(bind) as conn:
+        progress_table.create(conn, checkfirst=True)
+        row = conn.execute(
+            select(progress_table.c.last_pk, progress_table.c.rows_done).where(progress_table.c.name == name)
+        ).first()
+    return (row.last_pk, row.rows_done) if row else (None, 0)
+
+def _save_progress(conn: Connection, name: str, last_pk: int, rows_done: int, exists: bool) -> None:
+    if exists:
+        conn.execute(
+            progress_table.update()
+            .where(progress_table.c.name == name)
+            .values(last_pk=last_pk, rows_done=rows_done)
+        )
+    else:
+        conn.execute(progress_table.insert().values(name=name, last_pk=last_pk, rows_done=rows_done))
+
+def backfill_in_batches(
+    bind: Bind,
+    table: str,
+    set_clause: str,
+    *,
+    name: str,
+    where: str | None = None,
+    pk: str = "id",
+    batch_size: int = 1000,
+    sleep: float = 0.05,
+    params: dict | None = None,
+) -> int:
+    """
+    PK 구간별 배치 UPDATE (재실행 시 중단 지점부터 이어서 진행)
+
+    Args:
+        bind: Connection(autocommit) 또는 Engine
+        table: 대상 테이블 이름
+        set_clause: SET 절 SQL (예: "family = jti")
+        name: 진행 상황 저장 키 (작업마다 고유해야 함)
+        where: 추가 조건 (예: "family IS NULL")
+        pk: 정수 PK 컬럼 이름
+        batch_size: 한 번에 처리할 PK 구간 크기
+        sleep: 배치 사이 대기 시간(초) → 복제 지연/락 경합 완화
+        params: SQL 바인딩 파라미터
+
+    Returns:
+        이번 실행에서 갱신된 행 수
+    """
+    last_pk, rows_done = _load_progress(bind, name)
+    has_progress = last_pk is not None
+
+    with _tx(bind) as conn:
+        lo, hi = conn.execute(text(f"SELECT MIN({pk}), MAX({pk}) FROM {table}")).one()
+    if lo is None:
+        logger.info("[%s] %s is empty, nothing to backfill", name, table)
+        return 0
+
+    start_pk = lo if last_pk is None else last_pk + 1
+    if start_pk > hi:
+        logger.info("[%s] already complete (last_pk=%s)", name, last_pk)
+        return 0
+
+    extra = f" AND ({where})" if where else ""
+    sql = text(f"UPDATE {table} SET {set_clause} WHERE {pk} >= :_lo AND {pk} < :_hi{extra}")
+    total_span = hi - start_pk + 1
+    updated = 0
+    started = time.monotonic()
+
+    cursor = start_pk
+    while cursor <= hi:
+        upper = min(cursor + batch_size, hi + 1)
+        with _tx(bind) as conn:
+            result = conn.execute(sql, {**(params or {}), "_lo": cursor, "_hi": upper})
+            updated += result.rowcount or 0
+            rows_done += result.rowcount or 0
+            _save_progress(conn, name, upper - 1, rows_done, has_progress)
+        has_progress = True
+
+        # 진행률/속도/ETA 로그
+        elapsed = max(time.monotonic() - started, 1e-6)
+        span_done = upper - start_pk
+        rate = updated / elapsed
+        eta = elapsed / span_done * (total_span - span_done)
+        logger.info(
+            "[%s] %s pk<%s (%.1f%%) updated=%d %.0f rows/s ETA %.1fs",
+            name, table, upper, span_done / total_span * 100, updated, rate, eta,
+        )
+
+        cursor = upper
+        if sleep and cursor <= hi:
+            time.sleep(sleep)
+
+    return updated
+
+def _index_exists(conn: Connection, table: str, name: str) -> bool:
+    return any(ix["name"] == name for ix in inspect(conn).get_indexes(table))
+
+def create_index_online(bind: Bind, name: str, table: str, columns: Sequence[str], *, unique: bool = False) -> None:
+    """
+    쓰기를 막지 않는 방식으로 인덱스 생성 (이미 있으면 건너뜀)
+    - PostgreSQL CONCURRENTLY 는 트랜잭션 밖에서만 가능 → autocommit_block 안에서 호출
+    """
+    cols = ", ".join(columns)
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    with _tx(bind) as conn:
+        if _index_exists(conn, table, name):
+            logger.info("index %s already exists on %s", name, table)
+            return
+        dialect = conn.dialect.name
+        if dialect == "mysql":
+            sql = f"CREATE {kind} {name} ON {table} ({cols}) ALGORITHM=INPLACE, LOCK=NONE"
+        elif dialect == "postgresql":
+            sql = f"CREATE {kind} CONCURRENTLY {name} ON {table} ({cols})"
+        else:
+            sql = f"CREATE {kind} {name} ON {table} ({cols})"
+        started = time.monotonic()
+        conn.execute(text(sql))
+    logger.info("created index %s on %s(%s) in %.1fs", name, table, cols, time.monotonic() - started)
+
+def drop_index_online(bind: Bind, name: str, table: str) -> None:
+    """
+    인덱스 삭제 (없으면 건너뜀)
+    """
+    with _tx(bind) as conn:
+        if not _index_exists(conn, table, name):
+            return
+        dialect = conn.dialect.name
+        if dialect == "mysql":
+            sql = f"DROP INDEX {name} ON {table} ALGORITHM=INPLACE, LOCK=NONE"
+        elif dialect == "postgresql":
+            sql = f"DROP INDEX CONCURRENTLY {name}"
+        else:
+            sql = f"DROP INDEX {name}"
+        conn.execute(text(sql))
+    logger.info("dropped index %s on %s", name, table)
+
+def reset_progress(bind: Bind, name: str) -> None:
+    """
+    저장된 진행 상황 삭제 (백필을 처음부터 다시 돌리고 싶을 때)
+    """
+    with _tx(bind) as conn:
+        progress_table.create(conn, checkfirst=True)
+        conn.execute(progress_table.delete().where(progress_table.c.name == name))
@@ -0,0 +1,72 @@
+"""
+prefix_index.py
+----------------
+
+정렬 배열 기반 접두사(prefix) 인덱스
+
+- (정규화된 키, id) 튜플을 정렬된 리스트로 유지하고, bisect 로 접두사 구간을 찾습니다.
+- 조회: O(log n + 결과 수) / 추가·삭제: O(n) (리스트 삽입) → 읽기가 압도적으로 많은 타입어헤드 용도
+- 키는 소문자로 정규화해서 저장합니다 (대소문자 무시 검색).
+"""
+
+import bisect
+import threading
+from typing import Iterator
+
+_MAX_CHAR = "\U0010ffff"   # 접두사 구간의 상한을 만들기 위한 가장 큰 문자
+
+class PrefixIndex:
+    def __init__(self):
+        self._keys: list[tuple[str, int]] = []
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        return value.casefold()
+
+    def bulk_load(self, items: list[tuple[str, int]]) -> None:
+        keys = sorted((self.normalize(k), id_) for k, id_ in items if k)
+        with self._lock:
+            self._keys = keys
+
+    def add(self, key: str | None, id_: int) -> None:
+        if not key:
+            return
+        with self._lock:
+            bisect.insort(self._keys, (self.normalize(key), id_))
+
+    def remove(self, key: str | None, id_: int) -> None:
+        if not key:
+            return
+        item = (self.normalize(key), id_)
+        with self._lock:
+            i = bisect.bisect_left(self._keys, item)
+            if i < len(self._keys) and self._keys[i] == item:
+                del self._keys[i]
+
+    def _range(self, prefix: str) -> tuple[int, int]:
+        p = self.normalize(prefix)
+        lo = bisect.bisect_left(self._keys, (p, -1))
+        hi = bisect.bisect_left(self._keys, (p + _MAX_CHAR, -1))
+        return lo, hi
+
+    def count(self, prefix: str) -> int:
+        with self._lock:
+            lo, hi = self._range(prefix)
+            return hi - lo
+
+    def search(self, prefix: str, offset: int = 0, limit: int = 20) -> list[int]:
+        """키 순서(정규화된 값, id)대로 접두사가 일치하는 id 목록"""
+        with self._lock:
+            lo, hi = self._range(prefix)
+            start = lo + offset
+            return [id_ for _, id_ in self._keys[start:min(start + limit, hi)]]
+
+    def iter_ids(self, prefix: str) -> Iterator[int]:
+        with self._lock:
+            lo, hi = self._range(prefix)
+            ids = [id_ for _, id_ in self._keys[lo:hi]]
+        return iter(ids)
+
+    def __len__(self) -> int:
+        return len(self._keys)
@@ -0,0 +1,34 @@
+"""
+single_flight.py
+-----------------
+
+같은 키(jti 등)에 대한 동시 요청을 한 줄로 세우는 키 단위 Lock 입니다.
+
+- 먼저 들어온 요청이 작업(예: refresh 회전)을 끝낼 때까지 같은 키의 나머지 요청은 대기합니다.
+- 대기하던 요청은 먼저 끝난 요청의 결과(캐시 등)를 확인한 뒤 재사용할 수 있습니다.
+- 사용 중인 키가 없으면 Lock 객체도 정리되므로 메모리가 누적되지 않습니다.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Hashable, Iterator
+
+class SingleFlight:
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._locks: dict[Hashable, list] = {}  # key -> [Lock, 참조 수]
+
+    @contextmanager
+    def hold(self, key: Hashable) -> Iterator[None]:
+        with self._guard:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        entry[0].acquire()
+        try:
+            yield
+        finally:
+            entry[0].release()
+            with self._guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    self._locks.pop(key, None)
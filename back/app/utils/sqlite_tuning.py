@@ -0,0 +1,85 @@
+"""
+sqlite_tuning.py
+-----------------
+
+임베디드 SQLite 모드 엔진 설정 (settings.db_backend="sqlite")
+
+MySQL 서버 없이 단일 노드로 배포하거나 빠르게 테스트를 돌릴 때 사용합니다.
+SQLite 기본값(rollback journal, synchronous=FULL, 외래키 미검사, busy 대기 없음)은
+웹 서버처럼 여러 스레드가 동시에 읽고 쓰는 환경에 맞지 않으므로 연결마다 PRAGMA 를 적용합니다.
+
+📌 연결마다 적용하는 PRAGMA (connect 이벤트):
+    - journal_mode=WAL   : 읽기와 쓰기가 서로 막지 않음 (쓰기는 여전히 한 번에 하나)
+    - synchronous=NORMAL : WAL 에서는 commit 마다 fsync 하지 않아도 손상되지 않음 (전원 장애 시 마지막 commit 만 유실 가능)
+    - mmap_size          : 읽기를 메모리 맵으로 처리해 read() 시스템 콜/복사 감소
+    - busy_timeout       : 다른 연결이 쓰는 중이면 즉시 "database is locked" 대신 대기
+    - cache_size, temp_store=MEMORY, foreign_keys=ON (MySQL 과 같은 제약 검사)
+
+📌 커넥션 풀:
+    - 파일 DB  : QueuePool (sqlite_pool_size) + check_same_thread=False
+                 (FastAPI 동기 라우터는 스레드풀에서 실행되므로 연결이 스레드를 옮겨 다님)
+    - :memory: : StaticPool — 연결 하나를 공유해야 모든 스레드가 같은 메모리 DB 를 봄
+                 ※ 테스트/단일 스레드 전용: 스레드풀 워커와 write-behind 스레드가 같은 DBAPI 연결(=같은 트랜잭션)을
+                   쓰므로 한 요청의 commit/rollback 이 동시에 진행 중인 다른 요청의 작업까지 확정/취소합니다.
+                   동시 요청을 받는 배포에는 파일 DB 를 사용하세요.
+    - 네트워크가 없으므로 pool_pre_ping 은 끔
+"""
+
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from app.config.settings import settings
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+def _is_memory(url: str) -> bool:
+    database = make_url(url).database
+    return not database or database == ":memory:"
+
+def engine_options(url: str) -> dict:
+    """create_engine 에 넘길 SQLite 전용 옵션 (파일 DB 면 상위 디렉토리도 만들어 둠)"""
+    if _is_memory(url):
+        # 연결 하나를 모든 스레드가 공유 → 동시 트랜잭션이 섞임 (테스트/단일 스레드 전용, 모듈 docstring 참고)
+        return {
+            "poolclass": StaticPool,
+            "connect_args": {"check_same_thread": False},
+            "pool_pre_ping": False,
+        }
+    directory = os.path.dirname(make_url(url).database)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return {
+        "poolclass": QueuePool,
+        "pool_size": settings.sqlite_pool_size,
+        "max_overflow": settings.sqlite_pool_size,
+        "connect_args": {"check_same_thread": False},
+        "pool_pre_ping": False,
+    }
+
+def install_pragmas(
+    engine: Engine, *, journal_mode: str, synchronous: str, mmap_size: int,
+    busy_timeout_ms: int, cache_size_kb: int,
+) -> None:
+    """새 DBAPI 연결마다 PRAGMA 적용"""
+    pragmas = [
+        f"PRAGMA busy_timeout={int(busy_timeout_ms)}",   # journal_mode 변경도 잠금이 필요하므로 먼저
+        f"PRAGMA journal_mode={journal_mode}",
+        f"PRAGMA synchronous={synchronous}",
+        f"PRAGMA mmap_size={int(mmap_size)}",
+        f"PRAGMA cache_size={-int(cache_size_kb)}",      # 음수 = KiB 단위
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA foreign_keys=ON",
+    ]
+
+    @event.listens_for(engine, "connect")
+    def _apply(dbapi_conn, conn_rec):
+        cursor = dbapi_conn.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
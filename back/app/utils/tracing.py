@@ -0,0 +1,309 @@
+"""
+tracing.py
+-----------
+
+경량 분산 트레이싱 (W3C traceparent 호환, 외부 의존성 없음)
+
+📌 구성:
+    - Span / start_span(): contextvar 로 현재 span 을 추적하는 컨텍스트 매니저
+        (동기 라우터는 스레드풀에서 실행되지만 contextvar 가 복사되므로 부모-자식 관계가 유지됨)
+    - instrument_module(module): 모듈의 공개 함수를 span 으로 감쌈 (auth_service, user_service 등)
+    - instrument_engine(engine): SQL 실행마다 "db.query" span
+    - BatchExporter: 끝난 span 을 메모리 큐에 모았다가 백그라운드 스레드가 배치로 내보냄
+        - "file": JSON Lines 파일에 추가 (settings.tracing_file)
+        - "http": 로컬 수집기(tools/trace_collector.py 등)로 JSON 배열 POST (settings.tracing_endpoint)
+        - 큐가 가득 차면 버림 (tracing.dropped 메트릭)
+
+📌 head 기반 샘플링:
+    요청 진입 시(middlewares/tracing.py) 한 번만 샘플링 여부를 정하고, 샘플링되지 않은 요청은
+    하위 span 을 만들지 않습니다 → 대부분의 요청은 contextvar 조회 한 번 정도의 비용만 듭니다.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+import urllib.request
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import ModuleType
+from typing import Any, Callable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.metrics import metrics
+
+logger = logging.getLogger("app.tracing")
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "sampled", "start_ns", "end_ns", "attributes", "status")
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, sampled: bool):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.sampled = sampled
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: dict[str, Any] = {}
+        self.status = "ok"
+
+    def set(self, key: str, value: Any) -> None:
+        if self.sampled:
+            self.attributes[key] = value
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+_current: ContextVar[Span | None] = ContextVar("trace_span", default=None)
+
+def current_span() -> Span | None:
+    return _current.get()
+
+# ---------------------------
+# 🔗 W3C traceparent
+# ---------------------------
+def parse_traceparent(header: str | None) -> tuple[str, str, bool] | None:
+    """'00-<trace_id 32hex>-<parent_id 16hex>-<flags>' → (trace_id, parent_id, sampled)"""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or parts[0] == "ff":
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+        flags = int(parts[3], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1], parts[2], bool(flags & 1)
+
+def format_traceparent(span: Span) -> str:
+    return f"00-{span.trace_id}-{span.span_id}-{'01' if span.sampled else '00'}"
+
+# ---------------------------
+# ⏱️ span 생성
+# ---------------------------
+def start_root(name: str, *, traceparent: str | None, sample_rate: float) -> Span:
+    """
+    요청 진입 span 생성 (컨텍스트에 설정하지 않음 → activate() 로 설정)
+    - 상위 서비스가 traceparent 를 보냈으면 그 trace 와 샘플링 결정을 이어받음
+    - 없으면 sample_rate 확률로 새 trace 샘플링
+    """
+    parent = parse_traceparent(traceparent)
+    if parent:
+        trace_id, parent_id, sampled = parent
+    else:
+        trace_id, parent_id = secrets.token_hex(16), None
+        sampled = sample_rate > 0 and (sample_rate >= 1 or secrets.randbelow(1_000_000) < sample_rate * 1_000_000)
+    return Span(name, trace_id, parent_id, sampled)
+
+@contextmanager
+def activate(span: Span) -> Iterator[Span]:
+    """span 을 현재 컨텍스트로 설정, 끝나면 종료 + 내보내기"""
+    token = _current.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.status = "error"
+        span.set("error", type(exc).__name__)
+        raise
+    finally:
+        _current.reset(token)
+        finish(span)
+
+def finish(span: Span) -> None:
+    span.end_ns = time.time_ns()
+    if span.sampled:
+        exporter.enqueue(span)
+
+@contextmanager
+def start_span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """
+    현재 span 의 자식 span (샘플링된 trace 안에서만 기록, 아니면 아무것도 하지 않음)
+    """
+    parent = _current.get()
+    if parent is None or not parent.sampled:
+        yield None
+        return
+    span = Span(name, parent.trace_id, parent.span_id, True)
+    span.attributes.update(attributes)
+    with activate(span):
+        yield span
+
+def traced(name: str) -> Callable:
+    """함수 호출을 span 으로 감싸는 데코레이터 (동기/비동기 모두 지원)"""
+    def decorator(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                parent = _current.get()
+                if parent is None or not parent.sampled:
+                    return await fn(*args, **kwargs)
+                with start_span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            parent = _current.get()
+            if parent is None or not parent.sampled:
+                return fn(*args, **kwargs)
+            with start_span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def instrument_module(module: ModuleType) -> None:
+    """
+    모듈에 정의된 공개 함수를 모두 span 으로 감쌈 (span 이름: "<모듈 마지막 이름>.<함수명>")
+    - 호출하는 쪽이 `module.func()` 로 부르거나 같은 모듈 안에서 부르는 경우에 적용됨
+    - 제너레이터 함수(스트리밍)는 감싸지 않음
+    """
+    prefix = module.__name__.rsplit(".", 1)[-1]
+    for attr, fn in list(vars(module).items()):
+        if (
+            attr.startswith("_") or not inspect.isfunction(fn) or fn.__module__ != module.__name__
+            or inspect.isgeneratorfunction(fn) or getattr(fn, "__wrapped__", None)
+        ):
+            continue
+        setattr(module, attr, traced(f"{prefix}.{attr}")(fn))
+
+# ---------------------------
+# 🗄️ SQLAlchemy
+# ---------------------------
+_SQL_ATTR_LIMIT = 500
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    SQL 실행마다 "db.query" span (자식이 없으므로 컨텍스트에는 설정하지 않음)
+    - insert=True: 다른 before_cursor_execute 훅(지연 주입 등)보다 먼저 시작해서 그 시간도 포함
+    """
+    @event.listens_for(engine, "before_cursor_execute", insert=True)
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        parent = _current.get()
+        if parent is None or not parent.sampled:
+            return
+        span = Span("db.query", parent.trace_id, parent.span_id, True)
+        span.attributes["db.system"] = engine.dialect.name
+        span.attributes["db.statement"] = statement[:_SQL_ATTR_LIMIT]
+        context._trace_span = span
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            context._trace_span = None
+            finish(span)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(ctx):
+        context = ctx.execution_context
+        span = getattr(context, "_trace_span", None) if context is not None else None
+        if span is not None:
+            context._trace_span = None
+            span.status = "error"
+            span.attributes["error"] = type(ctx.original_exception).__name__
+            finish(span)
+
+# ---------------------------
+# 📤 배치 내보내기
+# ---------------------------
+class BatchExporter:
+    def __init__(self):
+        self._queue: deque[Span] = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._halt = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.kind = "file"
+        self.target = ""
+        self.batch_size = 512
+        self.flush_interval = 2.0
+        self.max_queue = 10000
+        metrics.gauge("tracing.queued", lambda: len(self._queue))
+        for counter in ("exported", "dropped", "export_errors"):
+            metrics.inc(f"tracing.{counter}", 0)
+
+    def configure(self, *, kind: str, target: str, batch_size: int, flush_interval: float, max_queue: int) -> None:
+        self.kind, self.target = kind, target
+        self.batch_size, self.flush_interval, self.max_queue = batch_size, flush_interval, max_queue
+
+    def enqueue(self, span: Span) -> None:
+        with self._lock:
+            if len(self._queue) >= self.max_queue:
+                metrics.inc("tracing.dropped")
+                return
+            self._queue.append(span)
+            full = len(self._queue) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        sent = 0
+        while True:
+            with self._lock:
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            if not batch:
+                return sent
+            try:
+                self._export([s.to_dict() for s in batch])
+                metrics.inc("tracing.exported", len(batch))
+                sent += len(batch)
+            except Exception:
+                logger.exception("span export failed (%d spans)", len(batch))
+                metrics.inc("tracing.export_errors")
+                metrics.inc("tracing.dropped", len(batch))
+
+    def _export(self, spans: list[dict]) -> None:
+        if self.kind == "http":
+            req = urllib.request.Request(
+                self.target, data=json.dumps(spans).encode("utf-8"),
+                headers={"Content-Type": "application/json"}, method="POST",
+            )
+            with urllib.request.urlopen(req, timeout=5):
+                pass
+            return
+        os.makedirs(os.path.dirname(self.target) or ".", exist_ok=True)
+        with open(self.target, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(s, ensure_ascii=False) + "\n" for s in spans))
+
+    def _loop(self) -> None:
+        while not self._halt.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._halt.clear()
+        self._thread = threading.Thread(target=self._loop, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._halt.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+exporter = BatchExporter()
@@ -0,0 +1,53 @@
+"""
+ttl_cache.py
+-------------
+
+프로세스 내부(in-memory)용 소형 TTL 캐시입니다.
+
+- 항목마다 만료 시각을 두고, 조회 시 만료된 항목은 버립니다.
+- 최대 크기를 넘으면 가장 오래 전에 넣은 항목부터 제거합니다 (메모리 상한 보장).
+- 동기 라우터는 스레드풀에서 실행되므로 내부 접근은 Lock 으로 보호합니다.
+
+※ 워커(프로세스)마다 따로 존재하므로, 여러 워커 사이 공유가 필요하면 Redis 등 외부 저장소로 교체하세요.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+class TTLCache:
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires, value = item
+            if expires <= now:
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
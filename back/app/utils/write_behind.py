@@ -0,0 +1,145 @@
+"""
+write_behind.py
+----------------
+
+중요도가 낮은 쓰기(마지막 사용 시각 갱신, 감사/로그인 이력 등)를 요청 경로에서 떼어내는 write-behind 버퍼
+
+📌 동작:
+    - submit(op, key, payload): 메모리 버퍼에 적재 (같은 op+key 는 마지막 값으로 병합, merge 를 등록하면 merge(이전, 새 값))
+    - 백그라운드 스레드가 flush_interval 마다, 또는 버퍼가 flush_threshold 이상 쌓이면 즉시
+      op 별로 모아서 등록된 핸들러(handler(db, items))를 호출 → 배치 SQL + commit 1회
+    - max_pending 을 넘으면 새 키는 버림(dropped 카운트) → 메모리 상한 보장
+    - stop() 시 남은 항목을 모두 flush (앱 lifespan 종료 시 호출)
+
+📌 메트릭 (utils/metrics):
+    write_behind.pending / write_behind.dropped / write_behind.flushed / write_behind.flush_errors
+
+※ 스레드가 시작되지 않은 상태(스크립트, 단독 실행 등)에서는 submit 이 즉시 동기 실행됩니다.
+※ 프로세스가 비정상 종료되면 버퍼에 남은 쓰기는 유실될 수 있으므로, 중요한 쓰기에는 사용하지 마세요.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Hashable
+
+from sqlalchemy.orm import Session
+
+from app.utils.metrics import metrics
+
+logger = logging.getLogger("app.write_behind")
+
+Handler = Callable[[Session, list[tuple[Hashable, Any]]], None]
+Merge = Callable[[Any, Any], Any]
+
+class WriteBehind:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        flush_interval: float = 1.0,
+        flush_threshold: int = 500,
+        max_pending: int = 10000,
+        name: str = "write_behind",
+    ):
+        self._session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.max_pending = max_pending
+        self.name = name
+        self._handlers: dict[str, Handler] = {}
+        self._merges: dict[str, Merge] = {}
+        self._pending: dict[tuple[str, Hashable], Any] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._halt = threading.Event()
+        self._thread: threading.Thread | None = None
+        metrics.gauge(f"{name}.pending", lambda: len(self._pending))
+        for counter in ("dropped", "flushed", "flush_errors"):
+            metrics.inc(f"{name}.{counter}", 0)  # 0 으로 미리 노출
+
+    def register(self, op: str, handler: Handler, *, merge: Merge | None = None) -> None:
+        """
+        op 이름별 배치 핸들러 등록: handler(db, [(key, payload), ...])
+        - merge: 같은 key 가 버퍼에 있을 때 merge(이전 payload, 새 payload) 로 합침 (카운터 누적 등)
+        """
+        self._handlers[op] = handler
+        if merge is not None:
+            self._merges[op] = merge
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, op: str, key: Hashable, payload: Any) -> bool:
+        """
+        쓰기 적재 (같은 op+key 는 병합). 버퍼가 가득 차서 버려지면 False
+        """
+        if not self.running:
+            self._run_batch(op, [(key, payload)])
+            return True
+        with self._lock:
+            slot = (op, key)
+            if slot not in self._pending and len(self._pending) >= self.max_pending:
+                metrics.inc(f"{self.name}.dropped")
+                return False
+            merge = self._merges.get(op)
+            if merge is not None and slot in self._pending:
+                payload = merge(self._pending[slot], payload)
+            self._pending[slot] = payload
+            size = len(self._pending)
+        if size >= self.flush_threshold:
+            self._wake.set()
+        return True
+
+    def flush(self) -> int:
+        """버퍼를 비우고 op 별로 배치 실행, 처리한 항목 수 반환"""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+        grouped: dict[str, list[tuple[Hashable, Any]]] = {}
+        for (op, key), payload in batch.items():
+            grouped.setdefault(op, []).append((key, payload))
+        for op, items in grouped.items():
+            self._run_batch(op, items)
+        return len(batch)
+
+    def _run_batch(self, op: str, items: list[tuple[Hashable, Any]]) -> None:
+        handler = self._handlers.get(op)
+        if handler is None:
+            logger.error("no write-behind handler for %s", op)
+            metrics.inc(f"{self.name}.dropped", len(items))
+            return
+        db = self._session_factory()
+        try:
+            handler(db, items)
+            metrics.inc(f"{self.name}.flushed", len(items))
+        except Exception:
+            db.rollback()
+            logger.exception("write-behind flush failed (op=%s, items=%d)", op, len(items))
+            metrics.inc(f"{self.name}.flush_errors")
+            metrics.inc(f"{self.name}.dropped", len(items))
+        finally:
+            db.close()
+
+    def _loop(self) -> None:
+        while not self._halt.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._halt.clear()
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """스레드 종료 + 남은 항목 flush (lifespan 종료 시)"""
+        if self._thread is not None:
+            self._halt.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
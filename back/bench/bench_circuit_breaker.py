@@ -0,0 +1,135 @@
+"""
+bench_circuit_breaker.py
+-------------------------
+
+DB 장애 시 요청 지연 비교 (서킷 브레이커 없음 vs 있음)
+
+로컬 SQLite 파일을 "장애를 낼 수 있는 DB" 로 씁니다 (FlakyDB).
+    - down 동안: 새 연결은 CONNECT_DELAY 만큼 걸린 뒤 실패 (MySQL 연결 타임아웃 흉내),
+      기존 연결의 SQL 실행도 실패 (pre_ping 실패 → 재연결 시도)
+    - 단계: 정상(UP) → 장애(DOWN) → 복구(RECOVER)
+
+워커 N_WORKERS 개가 get_db 와 같은 방식(allow → 세션 → SELECT 1)으로 요청을 반복합니다.
+    - 브레이커 없음: 장애 동안 모든 요청이 연결 타임아웃만큼 붙잡힘
+    - 브레이커 있음: 연속 실패 후 즉시 503(rejected), reset 후 프로브 한 개로 복구 확인
+
+실행:
+    cd back
+    python -m bench.bench_circuit_breaker
+"""
+
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.database import make_engine
+from app.utils.circuit_breaker import CircuitOpenError, breakers
+
+N_WORKERS = 16
+CONNECT_DELAY = 0.2
+PHASES = (("UP", 0.5, False), ("DOWN", 2.0, True), ("RECOVER", 1.5, False))
+
+class FlakyDB:
+    """
+    엔진에 붙이는 장애 스위치 (down=True 동안 DBAPI 수준에서 연결/실행 실패)
+    - 실행 실패는 끊김(is_disconnect)으로 표시 → 풀이 연결을 버리고 재연결 시도 (MySQL 2006 과 같은 흐름)
+    """
+
+    def __init__(self, engine):
+        self.down = False
+        flaky = self
+
+        class _Cursor(sqlite3.Cursor):
+            def execute(self, *args):
+                if flaky.down:
+                    raise sqlite3.OperationalError("stand-in: server has gone away")
+                return super().execute(*args)
+
+        class _Connection(sqlite3.Connection):
+            def cursor(self, factory=_Cursor):
+                return super().cursor(factory)
+
+        @event.listens_for(engine, "do_connect")
+        def _connect(dialect, conn_rec, cargs, cparams):
+            if self.down:
+                time.sleep(CONNECT_DELAY)
+                raise sqlite3.OperationalError("stand-in: connection refused")
+            return sqlite3.connect(*cargs, factory=_Connection, **cparams)
+
+        @event.listens_for(engine, "handle_error")
+        def _disconnect(ctx):
+            if "gone away" in str(ctx.original_exception):
+                ctx.is_disconnect = True
+
+def _request(engine, breaker) -> str:
+    try:
+        probe = breaker.allow() if breaker else False
+    except CircuitOpenError:
+        return "rejected"
+    try:
+        with Session(engine) as db:
+            db.execute(text("SELECT 1"))
+        return "ok"
+    except CircuitOpenError:    # do_connect 단계에서 막힘
+        return "rejected"
+    except Exception:
+        return "error"
+    finally:
+        if probe:
+            breaker.release()
+
+def _run(name: str, breaker_name: str | None) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "flaky.db")
+    engine = make_engine(f"sqlite:///{path}", name=breaker_name)
+    flaky = FlakyDB(engine)
+    breaker = breakers.get(breaker_name) if breaker_name else None
+    if breaker:
+        breaker.reset_timeout = 0.5
+
+    results: dict[str, list[tuple[str, float]]] = {phase: [] for phase, _, _ in PHASES}
+    current = [PHASES[0][0]]
+    stop = threading.Event()
+
+    def worker():
+        while not stop.is_set():
+            phase = current[0]
+            t = time.perf_counter()
+            outcome = _request(engine, breaker)
+            results[phase].append((outcome, time.perf_counter() - t))
+            if outcome != "ok":
+                time.sleep(0.01)
+
+    threads = [threading.Thread(target=worker) for _ in range(N_WORKERS)]
+    for th in threads:
+        th.start()
+    for phase, duration, down in PHASES:
+        current[0] = phase
+        flaky.down = down
+        time.sleep(duration)
+    stop.set()
+    for th in threads:
+        th.join()
+
+    print(f"[{name}]")
+    for phase, _, _ in PHASES:
+        rows = results[phase]
+        counts = {k: sum(1 for o, _ in rows if o == k) for k in ("ok", "error", "rejected")}
+        latencies = [d for _, d in rows] or [0.0]
+        print(f"  {phase:<8} ok={counts['ok']:>6} error={counts['error']:>5} rejected={counts['rejected']:>6} "
+              f"mean={statistics.mean(latencies) * 1000:7.2f}ms max={max(latencies) * 1000:7.1f}ms")
+    if breaker:
+        print(f"  final state={breaker.state}")
+    engine.dispose()
+
+def main():
+    _run("no breaker", None)
+    _run("breaker", "bench")
+
+if __name__ == "__main__":
+    main()
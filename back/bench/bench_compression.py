@@ -0,0 +1,78 @@
+"""
+bench_compression.py
+---------------------
+
+응답 압축 비용/효과 측정
+
+    1. 인코딩별 압축률과 압축 시간 (list_doc 사용자 100명, OpenAPI 스키마)
+       - br / zstd 는 brotli / zstandard 가 설치된 경우에만 측정
+    2. CompressionMiddleware 경유 요청 처리 시간
+       - 작은 응답(기준 미만)   : 압축하지 않으므로 통과 비용만
+       - /openapi.json 캐시 없음 : 요청마다 압축
+       - /openapi.json 캐시 있음 : 미리 압축한 본문 재사용
+
+실행:
+    cd back
+    python -m bench.bench_compression
+"""
+
+import asyncio
+import json
+import time
+
+from app.main import app as fastapi_app
+from app.middlewares.compression import CompressionMiddleware, _codecs, compress_once
+from app.schemas.jsonapi import list_doc, resource
+
+N = 500
+
+def _payloads() -> dict[str, bytes]:
+    users = list_doc([
+        resource("user", i, {"user_id": f"user{i:04d}", "user_name": f"User {i}", "user_email": f"user{i}@example.com"})
+        for i in range(100)
+    ], self_url="/api/user/search?q=user&page=1&size=100")
+    return {
+        "list_doc x100": json.dumps(users.model_dump()).encode(),
+        "openapi.json": json.dumps(fastapi_app.openapi()).encode(),
+    }
+
+def _static_app(body: bytes, content_type: bytes = b"application/json"):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+async def _drive(app, path: str) -> float:
+    scope = {"type": "http", "method": "GET", "path": path, "headers": [(b"accept-encoding", b"gzip, br, zstd")]}
+    async def send(message):
+        pass
+    start = time.perf_counter()
+    for _ in range(N):
+        await app(scope, None, send)
+    return (time.perf_counter() - start) / N * 1e6
+
+def _middleware(body: bytes, cache_paths: list[str]) -> CompressionMiddleware:
+    return CompressionMiddleware(
+        _static_app(body), min_size=1024, encodings=["zstd", "br", "gzip"],
+        cache_paths=cache_paths, cache_size=64, cache_max_bytes=2 * 1024 * 1024, cache_level_boost=5,
+    )
+
+def main():
+    payloads = _payloads()
+    print("encoding ratio / time")
+    for name, body in payloads.items():
+        for encoding, (_, level, _) in _codecs().items():
+            start = time.perf_counter()
+            out = compress_once(encoding, body, level)
+            ms = (time.perf_counter() - start) * 1000
+            print(f"  {name:<14} {encoding:<5} {len(body):>7} -> {len(out):>6} bytes ({len(out) / len(body):5.1%})  {ms:6.2f} ms")
+
+    openapi = payloads["openapi.json"]
+    print(f"middleware per request (x{N})")
+    print(f"  small (200B)        : {asyncio.run(_drive(_middleware(b'x' * 200, []), '/small')):8.1f} us")
+    print(f"  openapi no cache    : {asyncio.run(_drive(_middleware(openapi, []), '/openapi.json')):8.1f} us")
+    print(f"  openapi cached      : {asyncio.run(_drive(_middleware(openapi, ['/openapi.json']), '/openapi.json')):8.1f} us")
+
+if __name__ == "__main__":
+    main()
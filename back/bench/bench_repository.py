@@ -0,0 +1,69 @@
+"""
+bench_repository.py
+--------------------
+
+Repository 읽기 경로의 ORM 오버헤드 측정 (호출 1회당 μs)
+
+같은 쿼리를 세 가지 방식으로 반복 실행해서 비교합니다.
+    - orm      : select(User) → 전체 컬럼 ORM 엔티티 (identity map 등록)
+    - load_only: select(User).options(load_only(...)) → 필요한 컬럼만 로딩한 ORM 엔티티
+    - core row : 테이블 컬럼만 Core 로 SELECT → Row (ORM 처리 없음)
+
+DB 왕복 비용을 최소화하기 위해 메모리 SQLite 를 사용하므로, 차이는 대부분 ORM 처리 비용입니다.
+
+실행:
+    cd back
+    python -m bench.bench_repository
+"""
+
+import time
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import load_only, sessionmaker
+
+from app.database import Base
+from app.models import User
+from app.repository import auth_repo, user_repo
+
+N = 5000
+
+def _bench(label: str, fn) -> None:
+    fn()  # 워밍업 (컴파일 캐시 채우기)
+    start = time.perf_counter()
+    for _ in range(N):
+        fn()
+    print(f"  {label:<28}: {(time.perf_counter() - start) / N * 1e6:7.1f} us/call")
+
+def main():
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"user_id": f"user{i}", "user_name": f"User {i}", "user_email": f"user{i}@example.com",
+             "user_password": "x" * 60}
+            for i in range(1, 1001)
+        ])
+    db = sessionmaker(bind=engine, autoflush=False)()
+
+    def fresh(fn):
+        # 매 호출마다 identity map 을 비워서 "요청마다 새 세션" 상황을 흉내
+        def run():
+            fn()
+            db.expunge_all()
+        return run
+
+    print("login lookup (user_id → id, user_password)")
+    _bench("orm  get_by_user_id", fresh(lambda: auth_repo.get_by_user_id(db, "user500")))
+    _bench("load_only (built per call)", fresh(lambda: db.execute(
+        select(User).options(load_only(User.id, User.user_password)).where(User.user_id == "user500")
+    ).scalar_one()))
+    _bench("core get_login_row", fresh(lambda: auth_repo.get_login_row(db, "user500")))
+
+    print("/me lookup (id → public fields)")
+    _bench("orm  db.get(User)", fresh(lambda: db.get(User, 500)))
+    _bench("load_only get_by_id(public)", fresh(lambda: user_repo.get_by_id(db, 500, public_only=True)))
+    _bench("core get_public_row", fresh(lambda: user_repo.get_public_row(db, 500)))
+    db.close()
+
+if __name__ == "__main__":
+    main()
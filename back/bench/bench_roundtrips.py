@@ -0,0 +1,76 @@
+"""
+bench_roundtrips.py
+--------------------
+
+DB 왕복 지연을 주입한 상태에서 refresh 경로의 비용 측정
+
+메모리 SQLite 에 utils/latency_injection 으로 운영 MySQL 수준의 지연(SQL 2ms, commit 2ms, jitter 1ms)을 넣고,
+refresh 회전 한 번에 해당하는 repository 호출 순서와 last_used_at 갱신 방식(건별 vs 배치)을 비교합니다.
+지연이 없으면 차이가 거의 보이지 않던 "SQL/commit 횟수"가 그대로 시간으로 드러납니다.
+
+실행:
+    cd back
+    python -m bench.bench_roundtrips
+"""
+
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import User
+from app.repository import auth_repo
+from app.utils.latency_injection import install_latency_injection
+
+N = 100
+
+def main():
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"user_id": "u1", "user_name": "U", "user_email": "u@x.com", "user_password": "x"}])
+    install_latency_injection(engine, statement_ms=2.0, commit_ms=2.0, jitter_ms=1.0, seed=0)
+
+    counts = {"sql": 0, "commit": 0}
+    event.listen(engine, "before_cursor_execute", lambda *a: counts.__setitem__("sql", counts["sql"] + 1))
+    event.listen(engine, "commit", lambda *a: counts.__setitem__("commit", counts["commit"] + 1))
+
+    db = sessionmaker(bind=engine, autoflush=False)()
+    expires = datetime.now(timezone.utc) + timedelta(days=7)
+
+    def new_session() -> str:
+        jti = str(uuid.uuid4())
+        auth_repo.create_refresh_session(db, user_id=1, jti=jti, token_hash=jti.replace("-", ""),
+                                         expires_at=expires, user_agent=None, ip=None)
+        return jti
+
+    def run(label: str, fn) -> None:
+        counts.update(sql=0, commit=0)
+        start = time.perf_counter()
+        fn()
+        ms = (time.perf_counter() - start) * 1000
+        print(f"  {label:<34}: {ms:8.1f} ms  (SQL {counts['sql']:>4}, commit {counts['commit']:>4})")
+
+    jtis = [new_session() for _ in range(N)]
+
+    def rotate_once():
+        # _rotate 의 repository 호출 순서 (조회 → 폐기 → 새 세션 저장 → last_used 갱신)
+        row = auth_repo.get_refresh_row_by_jti(db, jtis[0])
+        auth_repo.mark_refresh_revoked(db, row.jti)
+        new_session()
+        auth_repo.touch_refresh_last_used(db, jtis[0])
+
+    print("refresh rotation x1 (statement 2ms / commit 2ms / jitter 1ms)")
+    run("rotate (touch inline)", rotate_once)
+
+    print(f"last_used_at bookkeeping for {N} refreshes")
+    run("touch_refresh_last_used x N", lambda: [auth_repo.touch_refresh_last_used(db, j) for j in jtis])
+    now = datetime.now(timezone.utc)
+    run("touch_refresh_last_used_many", lambda: auth_repo.touch_refresh_last_used_many(db, [(j, now) for j in jtis]))
+    db.close()
+
+if __name__ == "__main__":
+    main()
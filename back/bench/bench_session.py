@@ -0,0 +1,73 @@
+"""
+bench_session.py
+-----------------
+
+세션 미들웨어 오버헤드 측정 (Starlette SessionMiddleware vs LazySessionMiddleware)
+
+/auth/me 와 같은 요청(세션 쿠키 + Authorization 헤더, 라우터는 세션 미사용)을
+미들웨어에 직접 ASGI 로 흘려보내고, 요청당 소요 시간을 비교합니다.
+DB/라우팅 비용을 빼고 "세션 계층이 추가하는 비용"만 보기 위한 스크립트입니다.
+
+실행:
+    cd back
+    python -m bench.bench_session
+"""
+
+import asyncio
+import time
+
+from starlette.middleware.sessions import SessionMiddleware
+
+from app.config.settings import settings
+from app.middlewares.session import LazySessionMiddleware
+
+N = 20000
+
+async def _me_like_app(scope, receive, send):
+    # /auth/me 처럼 request.session 을 건드리지 않는 라우터
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+async def _session_cookie(mw_cls) -> bytes:
+    # 세션에 값이 들어 있는 브라우저를 흉내 내기 위해 쿠키 하나 발급
+    async def writer(scope, receive, send):
+        scope["session"]["csrf"] = "x" * 32
+        await _me_like_app(scope, receive, send)
+    mw = mw_cls(writer, secret_key=settings.secret_key)
+    headers = []
+    async def send(message):
+        if message["type"] == "http.response.start":
+            headers.extend(message["headers"])
+    await mw(_scope([]), _receive, send)
+    for name, value in headers:
+        if name == b"set-cookie":
+            return value.split(b";", 1)[0]
+    raise RuntimeError("no cookie issued")
+
+def _scope(headers):
+    return {"type": "http", "method": "GET", "path": "/api/auth/me", "headers": headers}
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+async def _noop_send(message):
+    pass
+
+async def _bench(mw_cls) -> float:
+    cookie = await _session_cookie(mw_cls)
+    headers = [(b"cookie", cookie), (b"authorization", b"Bearer x")]
+    mw = mw_cls(_me_like_app, secret_key=settings.secret_key)
+    start = time.perf_counter()
+    for _ in range(N):
+        await mw(_scope(list(headers)), _receive, _noop_send)
+    return (time.perf_counter() - start) / N * 1e6
+
+async def main():
+    base = await _bench(SessionMiddleware)
+    lazy = await _bench(LazySessionMiddleware)
+    print(f"SessionMiddleware      : {base:7.2f} us/req")
+    print(f"LazySessionMiddleware  : {lazy:7.2f} us/req")
+    print(f"removed per /auth/me   : {base - lazy:7.2f} us/req")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""
+bench_sqlite.py
+----------------
+
+임베디드 SQLite 모드: PRAGMA 설정별 인증 흐름 처리량 비교
+
+파일 SQLite DB 에서 스레드 N_THREADS 개가 인증 흐름의 repository 호출 순서를 반복합니다.
+(bcrypt 해시 비용은 DB 설정과 무관하므로 제외)
+    - login  : get_login_row → create_refresh_session(keep_active=10, 초과분 폐기 포함)
+    - refresh: get_refresh_row_by_jti → mark_refresh_revoked → create_refresh_session
+    - logout : mark_refresh_revoked
+
+비교 설정:
+    - sqlite default : journal_mode=DELETE, synchronous=FULL, mmap 없음 (busy_timeout 만 동일)
+    - tuned          : settings 기본값 (WAL, synchronous=NORMAL, mmap 256MB)
+
+실행:
+    cd back
+    python -m bench.bench_sqlite
+"""
+
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.config.settings import settings
+from app.database import Base
+from app.models import User
+from app.repository import auth_repo
+from app.utils import sqlite_tuning
+
+N_THREADS = 8
+N_USERS = 200
+DURATION = 3.0
+
+CONFIGS = {
+    "sqlite default": dict(journal_mode="DELETE", synchronous="FULL", mmap_size=0),
+    "tuned": dict(
+        journal_mode=settings.sqlite_journal_mode,
+        synchronous=settings.sqlite_synchronous,
+        mmap_size=settings.sqlite_mmap_size,
+    ),
+}
+
+def _engine(path: str, pragmas: dict):
+    url = f"sqlite:///{path}"
+    engine = create_engine(url, future=True, **sqlite_tuning.engine_options(url))
+    sqlite_tuning.install_pragmas(
+        engine, busy_timeout_ms=settings.sqlite_busy_timeout_ms,
+        cache_size_kb=settings.sqlite_cache_size_kb, **pragmas,
+    )
+    return engine
+
+def _run(name: str, pragmas: dict) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = _engine(path, pragmas)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"user_id": f"u{i}", "user_name": "U", "user_email": f"u{i}@x.com", "user_password": "x"}
+            for i in range(N_USERS)
+        ])
+    make_session = sessionmaker(bind=engine, autoflush=False)
+    expires = datetime.now(timezone.utc) + timedelta(days=7)
+    stats: dict[str, list[float]] = {"login": [], "refresh": [], "logout": []}
+    errors = [0]
+    stop = time.monotonic() + DURATION
+
+    def new_session(db, user_pk: int) -> str:
+        jti = str(uuid.uuid4())
+        auth_repo.create_refresh_session(db, user_id=user_pk, jti=jti, token_hash=jti.replace("-", ""),
+                                         expires_at=expires, user_agent=None, ip=None, keep_active=10)
+        return jti
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        db = make_session()
+        while time.monotonic() < stop:
+            i = rng.randrange(N_USERS)
+            try:
+                t = time.perf_counter()
+                row = auth_repo.get_login_row(db, f"u{i}")
+                jti = new_session(db, row.id)
+                stats["login"].append(time.perf_counter() - t)
+
+                t = time.perf_counter()
+                rs = auth_repo.get_refresh_row_by_jti(db, jti, user_id=row.id)
+                auth_repo.mark_refresh_revoked(db, rs.jti, user_id=row.id)
+                jti = new_session(db, row.id)
+                stats["refresh"].append(time.perf_counter() - t)
+
+                t = time.perf_counter()
+                auth_repo.mark_refresh_revoked(db, jti, user_id=row.id)
+                stats["logout"].append(time.perf_counter() - t)
+            except Exception:
+                errors[0] += 1
+                db.rollback()
+        db.close()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(N_THREADS)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    engine.dispose()
+
+    print(f"[{name}] {pragmas}  errors={errors[0]}")
+    for flow, values in stats.items():
+        values.sort()
+        p50 = values[len(values) // 2] * 1000 if values else 0
+        p99 = values[min(len(values) - 1, int(len(values) * .99))] * 1000 if values else 0
+        print(f"  {flow:<8} {len(values) / DURATION:8.0f}/s  p50={p50:6.2f}ms  p99={p99:7.2f}ms")
+
+def main():
+    for name, pragmas in CONFIGS.items():
+        _run(name, pragmas)
+
+if __name__ == "__main__":
+    main()
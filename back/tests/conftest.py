@@ -0,0 +1,30 @@
+"""
+테스트 공통 설정
+
+app 모듈을 import 하기 전에 환경 변수를 정해 둡니다 (settings 는 import 시점에 한 번 읽음).
+    - DB 는 임베디드 SQLite 메모리 DB (MySQL 서버 없이 실행)
+    - secret_key 는 .env 가 없어도 동작하도록 테스트용 값
+    - 사용자 검색 인덱스 켜기 (커밋/롤백 이벤트 경로까지 테스트)
+실행:
+    cd back
+    python -m pytest -q
+"""
+
+import os
+
+os.environ.setdefault("DB_BACKEND", "sqlite")
+os.environ.setdefault("SQLITE_PATH", ":memory:")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("USER_SEARCH_INDEX_ENABLED", "true")
+
+import pytest
+
+from app.database import Base, SessionLocal, engine
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
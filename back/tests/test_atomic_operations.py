@@ -0,0 +1,39 @@
+"""
+Atomic Operations(POST /api/operations) 트랜잭션과 사용자 검색 인덱스
+
+    - 실패한 배치는 DB 와 검색 인덱스 모두에 흔적을 남기지 않음
+    - 성공한 배치는 바깥 트랜잭션 COMMIT 후 검색 인덱스에 반영
+"""
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models import User
+from app.schemas.jsonapi import AtomicRequest
+from app.services import atomic_service
+from app.services.search_service import search_users, user_search_index
+
+def _add_users(*user_ids: str):
+    return AtomicRequest.model_validate({"atomic:operations": [
+        {"op": "add", "data": {"type": "user", "attributes": {
+            "user_id": uid, "user_name": uid, "user_email": f"{uid}@example.com", "user_password": "pw",
+        }}}
+        for uid in user_ids
+    ]}).operations
+
+@pytest.fixture
+def index(db):
+    user_search_index.rebuild()   # 이전 테스트의 (삭제된 테이블) 행 제거
+    return user_search_index
+
+def test_failed_batch_leaves_no_index_entries(db, index):
+    with pytest.raises(atomic_service.OperationError) as exc:
+        atomic_service.run(_add_users("ghost1", "ghost1"), user_id=None)
+    assert (exc.value.status, exc.value.index) == (409, 1)
+    assert db.scalar(select(func.count()).select_from(User)) == 0
+    assert search_users(db, "ghost") == []
+
+def test_committed_batch_is_indexed(db, index):
+    results = atomic_service.run(_add_users("alice", "albert"), user_id=None)
+    assert [r.attributes["user_id"] for r in results] == ["alice", "albert"]
+    assert sorted(row[1] for row in search_users(db, "al")) == ["albert", "alice"]
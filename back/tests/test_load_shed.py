@@ -0,0 +1,88 @@
+"""
+LoadShedMiddleware: 과부하에서도 처리된 요청의 p99 가 제한되고, 넘치는 요청은 503 + Retry-After
+
+동시 처리 능력이 CAPACITY 인 가짜 백엔드에 클라이언트 N_CLIENTS 개가 쉬지 않고 요청을 보냅니다.
+(bench/bench_load_shed.py 와 같은 구성, 제한 없이 보내면 p99 ≈ N_CLIENTS / CAPACITY * SERVICE_TIME)
+"""
+
+import asyncio
+import json
+import time
+
+from app.middlewares.load_shed import AdaptiveLimiter, LoadShedMiddleware
+
+N_CLIENTS = 100
+DURATION = 1.0
+CAPACITY = 4
+SERVICE_TIME = 0.010
+P99_BOUND = 0.150   # 제한 없음이면 약 250ms
+
+def _backend():
+    sem = asyncio.Semaphore(CAPACITY)   # DB 커넥션 풀/스레드풀 흉내
+    async def app(scope, receive, send):
+        async with sem:
+            await asyncio.sleep(SERVICE_TIME)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+    return app
+
+async def _overload(app) -> tuple[list[float], list[dict]]:
+    latencies: list[float] = []
+    rejections: list[dict] = []
+    stop = time.monotonic() + DURATION
+
+    async def client():
+        scope = {"type": "http", "method": "GET", "path": "/api/user/me", "headers": []}
+        while time.monotonic() < stop:
+            messages: list[dict] = []
+            async def send(message):
+                messages.append(message)
+            t = time.monotonic()
+            await app(scope, None, send)
+            if messages[0]["status"] == 503:
+                rejections.append({"headers": dict(messages[0]["headers"]), "body": messages[1]["body"]})
+                await asyncio.sleep(0.02)
+            else:
+                latencies.append(time.monotonic() - t)
+
+    await asyncio.gather(*(client() for _ in range(N_CLIENTS)))
+    return latencies, rejections
+
+def _p99(values: list[float]) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * .99))]
+
+def test_p99_bounded_under_overload():
+    app = LoadShedMiddleware(_backend(), {}, initial=8, min_limit=2, max_limit=200,
+                             target_ms=50, queue_timeout_ms=20)
+    latencies, rejections = asyncio.run(_overload(app))
+
+    assert latencies, "no request was accepted"
+    assert rejections, "overload did not shed any request"
+    assert _p99(latencies) < P99_BOUND
+
+def test_shed_response_is_problem_json_with_retry_after():
+    app = LoadShedMiddleware(_backend(), {}, initial=8, min_limit=2, max_limit=200,
+                             target_ms=50, queue_timeout_ms=20)
+    _, rejections = asyncio.run(_overload(app))
+
+    headers, body = rejections[0]["headers"], json.loads(rejections[0]["body"])
+    assert headers[b"content-type"] == b"application/problem+json"
+    assert int(headers[b"retry-after"]) >= 1
+    assert body["status"] == 503
+    assert body["instance"] == "/api/user/me"
+
+def test_limit_increase_wakes_every_free_slot():
+    async def scenario():
+        lim = AdaptiveLimiter("test", initial=2, min_limit=1, max_limit=10, target=1.0)
+        assert await lim.acquire(0) and await lim.acquire(0)
+        waiters = [asyncio.ensure_future(lim.acquire(1.0)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert len(lim._waiters) == 2
+
+        lim.limit = 4
+        lim.release(0.001, ok=True)   # 한도 4 → 빈 슬롯 2개: 대기 중인 두 요청 모두 깨워야 함
+        assert await asyncio.wait_for(asyncio.gather(*waiters), 0.1) == [True, True]
+        assert lim.inflight == 3
+
+    asyncio.run(scenario())
@@ -0,0 +1,47 @@
+"""
+LazySessionMiddleware: Starlette SessionMiddleware 와 같은 저장 동작
+
+    - 값 내부만 바꾼 경우(session["cart"].append(1))도 다음 요청에 남음 (쿠키 / 메모리 저장소)
+    - 읽기만 한 요청은 Set-Cookie 를 보내지 않음
+"""
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.middlewares.session import LazySessionMiddleware, MemorySessionStore
+
+MAX_AGE = 60
+
+def _client(store: MemorySessionStore | None) -> TestClient:
+    async def init(request):
+        request.session["cart"] = []
+        return JSONResponse(dict(request.session))
+
+    async def add(request):
+        request.session["cart"].append(1)
+        return JSONResponse(dict(request.session))
+
+    async def read(request):
+        return JSONResponse(dict(request.session))
+
+    app = Starlette(routes=[Route("/init", init), Route("/add", add), Route("/read", read)])
+    app.add_middleware(LazySessionMiddleware, secret_key="test", max_age=MAX_AGE, store=store)
+    return TestClient(app)
+
+@pytest.mark.parametrize("store", [None, MemorySessionStore(max_age=MAX_AGE)], ids=["cookie", "memory"])
+def test_nested_mutation_is_saved(store):
+    client = _client(store)
+    assert "set-cookie" in client.get("/init").headers
+    assert "set-cookie" in client.get("/add").headers
+    assert client.get("/read").json() == {"cart": [1]}
+
+@pytest.mark.parametrize("store", [None, MemorySessionStore(max_age=MAX_AGE)], ids=["cookie", "memory"])
+def test_read_only_request_does_not_resign(store):
+    client = _client(store)
+    client.get("/init")
+    response = client.get("/read")
+    assert response.json() == {"cart": []}
+    assert "set-cookie" not in response.headers
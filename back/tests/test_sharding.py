@@ -0,0 +1,173 @@
+"""
+refresh 세션(tb_token) 샤딩: 로컬 SQLite 파일 여러 개를 샤드로 사용
+
+    - shard_for_user 안정성
+    - 로그인/회전/로그아웃이 소유 샤드로 라우팅 (auth_repo._token_first / _token_write)
+    - 리밸런싱 중 다른 샤드에 남은 세션까지 포함한 재사용 탐지
+    - 3 → 2 샤드 리밸런싱 (tools.rebalance_token_shards), 두 번째 실행은 아무것도 옮기지 않음
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, insert, select, update
+
+from app import sharding
+from app.database import make_engine
+from app.models import RefreshSession
+from app.repository import auth_repo
+from app.services import auth_service, user_service
+from tools import rebalance_token_shards
+
+_rs_t = RefreshSession.__table__
+
+@pytest.fixture
+def use_shards(tmp_path, monkeypatch):
+    """n 개의 SQLite 파일 샤드로 전환 (같은 번호는 같은 파일 → 샤드 수를 바꿔도 데이터 유지)"""
+    def use(n: int):
+        engines = [make_engine(f"sqlite:///{tmp_path / f'shard{i}.db'}") for i in range(n)]
+        monkeypatch.setattr(sharding, "_engines", engines)
+        sharding.create_shard_tables()
+        return engines
+    return use
+
+def _rows(shard, **where) -> list:
+    stmt = select(_rs_t.c.jti, _rs_t.c.user_id, _rs_t.c.revoked)
+    for column, value in where.items():
+        stmt = stmt.where(_rs_t.c[column] == value)
+    with shard.connect() as conn:
+        return conn.execute(stmt).all()
+
+def _locate(engines, jti: str) -> list[int]:
+    return [i for i, shard in enumerate(engines) if _rows(shard, jti=jti)]
+
+def _jti(token: str) -> str:
+    return auth_service._decode_token(token)["jti"]
+
+def _move_row(engines, jti: str, to: int) -> None:
+    """리밸런싱 도중처럼 세션 행을 소유 샤드가 아닌 곳으로 옮겨 둠"""
+    (src,) = _locate(engines, jti)
+    with engines[src].begin() as conn:
+        row = conn.execute(select(*[c for c in _rs_t.c if c.name != "id"]).where(_rs_t.c.jti == jti)).mappings().one()
+        conn.execute(_rs_t.delete().where(_rs_t.c.jti == jti))
+    with engines[to].begin() as conn:
+        conn.execute(insert(_rs_t), dict(row))
+
+def _session(shard, user_id: int, *, revoked: bool = False) -> str:
+    jti = str(uuid.uuid4())
+    with shard.begin() as conn:
+        conn.execute(insert(_rs_t), {
+            "user_id": user_id, "jti": jti, "token_hash": uuid.uuid4().hex * 2, "revoked": revoked,
+            "expires_at": datetime.now(timezone.utc) + timedelta(days=1),
+        })
+    return jti
+
+def test_shard_for_user_is_stable():
+    # 프로세스/플랫폼과 무관한 해시 → 고정 값 (바뀌면 기존 배치가 모두 어긋남)
+    assert [sharding.shard_for_user(uid, 3) for uid in range(1, 9)] == [2, 2, 1, 1, 2, 1, 1, 1]
+    assert [sharding.shard_for_user(uid, 2) for uid in range(1, 9)] == [0, 0, 1, 0, 0, 0, 0, 0]
+    assert sharding.shard_for_user(42, 3) == sharding.shard_for_user("42", 3)
+    placements = {sharding.shard_for_user(uid, 3) for uid in range(1, 200)}
+    assert placements == {0, 1, 2}
+    assert all(sharding.shard_for_user(uid, 1) == 0 for uid in range(1, 50))
+
+def test_login_refresh_logout_route_to_owner_shard(db, use_shards):
+    engines = use_shards(3)
+    user = user_service.create_user(db, user_id="alice", user_name="Alice",
+                                    user_email="alice@example.com", user_password="pw-alice")
+    owner = sharding.shard_for_user(user.id)
+
+    tokens = auth_service.login(db, "alice", "pw-alice", user_agent="pytest")
+    first = _jti(tokens.refresh_token)
+    assert _locate(engines, first) == [owner]
+
+    _, refreshed = auth_service.rotate_refresh_and_issue_access(db, tokens.refresh_token, user_agent="pytest")
+    second = _jti(refreshed)
+    assert _locate(engines, second) == [owner]
+    assert _rows(engines[owner], jti=first)[0].revoked
+
+    auth_service.logout(db, refreshed)
+    assert _rows(engines[owner], jti=second)[0].revoked
+    assert not any(_rows(shard) for i, shard in enumerate(engines) if i != owner)
+
+def test_lookup_and_write_fall_back_to_other_shards(db, use_shards):
+    engines = use_shards(3)
+    uid = 7
+    owner = sharding.shard_for_user(uid)
+    jti = _session(engines[(owner + 1) % 3], uid)   # 아직 옮겨지지 않은 행
+
+    assert auth_repo.get_refresh_row_by_jti(db, jti, user_id=uid).jti == jti
+    auth_repo.mark_refresh_revoked(db, jti, user_id=uid)
+    assert _rows(engines[(owner + 1) % 3], jti=jti)[0].revoked
+
+def test_reuse_detection_revokes_sessions_on_every_shard(db, use_shards):
+    engines = use_shards(3)
+    user = user_service.create_user(db, user_id="bob", user_name="Bob",
+                                    user_email="bob@example.com", user_password="pw-bob")
+    owner = sharding.shard_for_user(user.id)
+    other = (owner + 1) % 3
+
+    stolen = auth_service.login(db, "bob", "pw-bob", user_agent="browser").refresh_token
+    _, current = auth_service.rotate_refresh_and_issue_access(db, stolen, user_agent="browser")
+    _move_row(engines, _jti(stolen), other)         # 폐기된 옛 세션은 아직 옛 샤드에
+    straggler = _session(engines[other], user.id)   # 옮겨지지 않은 다른 활성 세션
+
+    # 다른 클라이언트가 폐기된 refresh 를 제출 → 유예 대상 아님 → 재사용 탐지
+    with pytest.raises(ValueError, match="reuse"):
+        auth_service.rotate_refresh_and_issue_access(db, stolen, user_agent="attacker")
+
+    assert _rows(engines[owner], jti=_jti(current))[0].revoked
+    assert _rows(engines[other], jti=straggler)[0].revoked
+
+def test_rebalance_three_to_two_shards_is_idempotent(use_shards):
+    engines = use_shards(3)
+    expected: dict[str, int] = {}
+    for uid in range(1, 61):
+        for _ in range(2):
+            expected[_session(engines[sharding.shard_for_user(uid)], uid, revoked=uid % 5 == 0)] = uid
+    old_third = engines[2]
+
+    engines = use_shards(2)   # shard2 제거 → 같은 파일의 shard0/1 + 옛 shard2 를 원본으로
+    sources = [(engines[0], 0), (engines[1], 1), (old_third, None)]
+
+    moved = sum(rebalance_token_shards.rebalance_source(src, idx, batch_size=7, dry_run=False)[1]
+                for src, idx in sources)
+    assert moved > 0
+    for jti, uid in expected.items():
+        assert _locate(engines + [old_third], jti) == [sharding.shard_for_user(uid)]
+    revoked = {r.jti for shard in engines for r in _rows(shard, revoked=True)}
+    assert revoked == {jti for jti, uid in expected.items() if uid % 5 == 0}
+
+    again = [rebalance_token_shards.rebalance_source(src, idx, batch_size=7, dry_run=False) for src, idx in sources]
+    assert [m for _, m in again] == [0, 0, 0]
+    with old_third.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(_rs_t)).scalar_one() == 0
+
+def test_rebalance_keeps_revocation_that_lands_on_source_mid_move(use_shards):
+    engines = use_shards(2)
+    uid = next(u for u in range(1, 100) if sharding.shard_for_user(u) == 1)
+    jti = _session(engines[0], uid)
+    with engines[0].connect() as conn:
+        snapshot = [dict(r) for r in conn.execute(rebalance_token_shards._SNAPSHOT).mappings()]
+
+    # 스냅샷을 읽은 뒤, 복사 전에 로그아웃이 원본 행에 반영됨
+    with engines[0].begin() as conn:
+        conn.execute(update(_rs_t).where(_rs_t.c.jti == jti).values(revoked=True))
+
+    assert rebalance_token_shards._move(engines[0], engines[1], snapshot) == 1
+    assert _rows(engines[0]) == []
+    assert _rows(engines[1], jti=jti)[0].revoked
+
+def test_rebalance_merges_revoked_into_existing_owner_copy(use_shards):
+    engines = use_shards(2)
+    uid = next(u for u in range(1, 100) if sharding.shard_for_user(u) == 1)
+    jti = _session(engines[0], uid, revoked=True)
+    with engines[0].connect() as conn:   # 중단된 이전 실행이 폐기 전 상태를 이미 복사해 둔 경우
+        row = conn.execute(select(*[c for c in _rs_t.c if c.name != "id"])).mappings().one()
+    with engines[1].begin() as conn:
+        conn.execute(insert(_rs_t), dict(row, revoked=False))
+
+    rebalance_token_shards.rebalance_source(engines[0], 0, batch_size=10, dry_run=False)
+    assert _rows(engines[0]) == []
+    assert [r.revoked for r in _rows(engines[1], jti=jti)] == [True]
@@ -0,0 +1,297 @@
+"""
+query_advisor.py
+-----------------
+
+Repository 계층 쿼리 실행 계획(EXPLAIN) 점검 CLI
+
+📌 하는 일:
+    1. 대상 DB에 테이블 생성(create_all) + 더미 데이터 시딩
+    2. auth_repo / user_repo 함수를 하나씩 실행하면서 발생한 SQL 문장을 모두 수집
+    3. 문장마다 EXPLAIN 을 실행해서 다음을 표시
+        - FULL SCAN   : 인덱스 없이 테이블 전체를 읽는 경우 (SQLite "SCAN t" / MySQL type=ALL)
+        - FILESORT    : 정렬을 위해 임시 정렬이 필요한 경우 (SQLite "TEMP B-TREE" / MySQL "Using filesort")
+        - TEMPORARY   : 임시 테이블 사용 (MySQL "Using temporary")
+    4. tb_user / tb_token 인덱스 점검
+        - DUPLICATE   : PK 또는 다른 인덱스의 앞부분(prefix)과 겹치는 인덱스
+        - UNUSED      : 어떤 repository 쿼리 계획에서도 사용되지 않은 인덱스
+    5. 위 결과를 바탕으로 마이그레이션 예시(app/utils/online_migration 헬퍼 사용) 제안
+
+실행 (back/ 에서):
+    python -m tools.query_advisor                                   # 임베디드 SQLite(메모리)
+    python -m tools.query_advisor --url sqlite:///advisor.db
+    python -m tools.query_advisor --url "mysql+pymysql://user:pw@127.0.0.1:3306/db_scratch"
+
+※ 테이블 생성 및 데이터 삽입/수정이 일어나므로 반드시 스크래치(임시) DB를 지정하세요.
+※ repository 에 함수를 추가하면 아래 _scenarios() 에도 추가해야 점검 대상이 됩니다.
+"""
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy import create_engine, event, inspect, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import User, RefreshSession
+from app.repository import analytics_repo, auth_repo, user_repo
+
+TABLES = ("tb_user", "tb_token")
+
+@dataclass
+class Finding:
+    kind: str      # FULL SCAN / FILESORT / TEMPORARY / DUPLICATE / UNUSED
+    table: str
+    detail: str
+    suggestion: str = ""
+
+@dataclass
+class StatementReport:
+    scenario: str
+    sql: str
+    plan: list[str]
+    findings: list[Finding] = field(default_factory=list)
+    used_indexes: set[str] = field(default_factory=set)
+
+# ---------------------------
+# 🌱 시딩
+# ---------------------------
+def seed(engine, users: int, sessions_per_user: int) -> None:
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        if conn.execute(select(User.id).limit(1)).first():
+            return  # 이미 데이터가 있으면 건너뜀
+        conn.execute(insert(User), [
+            {
+                "user_id": f"user{i}", "user_name": f"User {i}", "user_email": f"user{i}@example.com",
+                "user_password": "x" * 60,  # bcrypt 해시 길이의 더미 값 (해싱 비용 생략)
+            }
+            for i in range(1, users + 1)
+        ])
+        rows = []
+        for uid in range(1, users + 1):
+            for _ in range(sessions_per_user):
+                rows.append({
+                    "user_id": uid, "jti": str(uuid4()), "token_hash": uuid4().hex * 2,
+                    "expires_at": now + timedelta(days=7), "revoked": False,
+                })
+        if rows:
+            conn.execute(insert(RefreshSession), rows)
+
+# ---------------------------
+# 🎬 점검 시나리오 (repository 함수 호출)
+# ---------------------------
+def _scenarios(db):
+    # ORM 객체 대신 값만 꺼내 둠 → 시나리오 실행 중 lazy refresh SELECT 가 섞이지 않도록
+    uid, login_id = db.execute(select(User.id, User.user_id).order_by(User.id.desc()).limit(1)).one()
+    jti = db.execute(select(RefreshSession.jti).where(RefreshSession.user_id == uid).limit(1)).scalar_one()
+    now = datetime.now(timezone.utc)
+    return [
+        ("auth_repo.get_by_user_id", lambda: auth_repo.get_by_user_id(db, login_id)),
+        ("auth_repo.get_login_row", lambda: auth_repo.get_login_row(db, login_id)),
+        ("auth_repo.get_refresh_session_by_jti", lambda: auth_repo.get_refresh_session_by_jti(db, jti)),
+        ("auth_repo.get_refresh_row_by_jti", lambda: auth_repo.get_refresh_row_by_jti(db, jti)),
+        ("auth_repo.touch_refresh_last_used", lambda: auth_repo.touch_refresh_last_used(db, jti)),
+        ("auth_repo.touch_refresh_last_used_many", lambda: auth_repo.touch_refresh_last_used_many(db, [(jti, now)])),
+        ("auth_repo.mark_refresh_revoked", lambda: auth_repo.mark_refresh_revoked(db, jti)),
+        ("auth_repo.revoke_all_refresh_for_user", lambda: auth_repo.revoke_all_refresh_for_user(db, uid)),
+        ("auth_repo.create_refresh_session", lambda: auth_repo.create_refresh_session(
+            db, user_id=uid, jti=str(uuid4()), token_hash=uuid4().hex * 2,
+            expires_at=now + timedelta(days=7), user_agent="advisor", ip="127.0.0.1", keep_active=10)),
+        ("user_repo.get_by_id", lambda: user_repo.get_by_id(db, uid)),
+        ("user_repo.get_public_row", lambda: user_repo.get_public_row(db, uid)),
+        ("user_repo.get_version_by_id", lambda: user_repo.get_version_by_id(db, uid)),
+        ("user_repo.create_user", lambda: user_repo.create_user(
+            db, user_id=f"advisor-{uuid4().hex[:8]}", user_name="advisor",
+            user_email=f"{uuid4().hex[:8]}@advisor.local", user_password="x" * 60)),
+        ("analytics_repo.apply_activity", lambda: analytics_repo.apply_activity(
+            db, [((now.date(), "desktop", uid), (1, 0))])),
+        ("analytics_repo.get_daily", lambda: analytics_repo.get_daily(db, now.date() - timedelta(days=29), now.date())),
+    ]
+
+def capture(engine) -> list[tuple[str, str, object]]:
+    """
+    시나리오를 실행하며 (시나리오 이름, SQL, 파라미터) 수집
+    """
+    captured: list[tuple[str, str, object]] = []
+    current = {"name": None}
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if current["name"] and not executemany:
+            captured.append((current["name"], statement, parameters))
+
+    Session = sessionmaker(bind=engine, autoflush=False)
+    db = Session()
+    try:
+        scenarios = _scenarios(db)
+        event.listen(engine, "before_cursor_execute", _before)
+        try:
+            for name, run in scenarios:
+                current["name"] = name
+                run()
+                db.expire_all()   # 다음 시나리오가 identity map 캐시 대신 실제 SELECT 를 내도록
+        finally:
+            current["name"] = None
+            event.remove(engine, "before_cursor_execute", _before)
+    finally:
+        db.close()
+    return captured
+
+# ---------------------------
+# 🔍 EXPLAIN 해석
+# ---------------------------
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|UPDATE|DELETE)\b", re.I)
+_WHERE_COLS = re.compile(r"(?:(\w+)\.)?(\w+)\s*(?:=|IN\b|IS\b|<|>)", re.I)
+
+def _where_columns(sql: str, table: str) -> list[str]:
+    m = re.search(r"\bWHERE\b(.*?)(\bORDER BY\b|\bLIMIT\b|\bGROUP BY\b|$)", sql, re.I | re.S)
+    if not m:
+        return []
+    cols = []
+    for tbl, col in _WHERE_COLS.findall(m.group(1)):
+        if (not tbl or tbl == table) and col.lower() not in ("and", "or", "not") and col not in cols:
+            cols.append(col)
+    return cols
+
+def _suggest_index(table: str, cols: list[str]) -> str:
+    if not cols:
+        return ""
+    name = f"ix_{table}_{'_'.join(cols)}"
+    return f'create_index_online(op.get_bind(), "{name}", "{table}", {cols!r})'
+
+def explain(conn, scenario: str, sql: str, params) -> StatementReport:
+    dialect = conn.dialect.name
+    report = StatementReport(scenario=scenario, sql=" ".join(sql.split()), plan=[])
+
+    if dialect == "sqlite":
+        for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params):
+            detail = row[-1]
+            report.plan.append(detail)
+            m = re.match(r"SCAN (\w+)(?: USING (?:COVERING )?INDEX (\w+))?", detail)
+            if m and m.group(1) in TABLES and not m.group(2):
+                report.findings.append(Finding(
+                    "FULL SCAN", m.group(1), detail,
+                    _suggest_index(m.group(1), _where_columns(sql, m.group(1))),
+                ))
+            for ix in re.findall(r"USING (?:COVERING )?INDEX (\w+)", detail):
+                report.used_indexes.add(ix)
+            if "USING INTEGER PRIMARY KEY" in detail or "USING PRIMARY KEY" in detail:
+                report.used_indexes.add("PRIMARY")
+            if "TEMP B-TREE" in detail:
+                report.findings.append(Finding("FILESORT", "", detail))
+    else:  # mysql / mariadb
+        for row in conn.exec_driver_sql(f"EXPLAIN {sql}", params).mappings():
+            table, access, key, extra = row.get("table"), row.get("type"), row.get("key"), row.get("Extra") or ""
+            report.plan.append(f"table={table} type={access} key={key} rows={row.get('rows')} extra={extra}")
+            if key:
+                report.used_indexes.add(key)
+            if access == "ALL" and table in TABLES:
+                report.findings.append(Finding(
+                    "FULL SCAN", table, f"type=ALL rows={row.get('rows')}",
+                    _suggest_index(table, _where_columns(sql, table)),
+                ))
+            if "Using filesort" in extra:
+                report.findings.append(Finding("FILESORT", table or "", extra))
+            if "Using temporary" in extra:
+                report.findings.append(Finding("TEMPORARY", table or "", extra))
+    return report
+
+# ---------------------------
+# 🗂️ 인덱스 점검
+# ---------------------------
+def index_findings(engine, used: set[str]) -> list[Finding]:
+    insp = inspect(engine)
+    findings: list[Finding] = []
+    for table in TABLES:
+        pk_cols = insp.get_pk_constraint(table).get("constrained_columns") or []
+        indexes = insp.get_indexes(table)
+        for ix in indexes:
+            cols = ix["column_names"]
+            drop = f'drop_index_online(op.get_bind(), "{ix["name"]}", "{table}")'
+            # PK 앞부분과 겹치면 중복 (예: id 에 index=True)
+            if cols == pk_cols[:len(cols)] and not ix.get("unique"):
+                findings.append(Finding("DUPLICATE", table, f"{ix['name']}{cols} duplicates PRIMARY KEY{pk_cols}",
+                                        drop + "  # 모델에서 index=True 제거"))
+                continue
+            # 다른 인덱스의 앞부분과 겹치면 중복
+            wider = next((o for o in indexes if o is not ix and len(o["column_names"]) > len(cols)
+                          and o["column_names"][:len(cols)] == cols), None)
+            if wider and not ix.get("unique"):
+                findings.append(Finding("DUPLICATE", table,
+                                        f"{ix['name']}{cols} is a prefix of {wider['name']}{wider['column_names']}", drop))
+                continue
+            if ix["name"] not in used and not ix.get("unique"):
+                findings.append(Finding("UNUSED", table, f"{ix['name']}{cols} not used by any repository query",
+                                        drop + "  # 다른 서비스에서 쓰지 않는지 확인 후"))
+    return findings
+
+# ---------------------------
+# 🚀 실행
+# ---------------------------
+def run(url: str, users: int, sessions: int) -> tuple[list[StatementReport], list[Finding]]:
+    engine = create_engine(url, future=True)
+    Base.metadata.create_all(bind=engine)
+    seed(engine, users, sessions)
+    if engine.dialect.name == "mysql":
+        with engine.begin() as conn:
+            for table in TABLES:
+                conn.exec_driver_sql(f"ANALYZE TABLE {table}")  # 통계 갱신 → 현실적인 계획
+
+    captured = capture(engine)
+    reports: list[StatementReport] = []
+    with engine.connect() as conn:
+        for scenario, sql, params in captured:
+            if _EXPLAINABLE.match(sql):
+                reports.append(explain(conn, scenario, sql, params))
+    used = set().union(*(r.used_indexes for r in reports)) if reports else set()
+    return reports, index_findings(engine, used)
+
+def _print_text(reports: list[StatementReport], idx: list[Finding]) -> None:
+    for r in reports:
+        flag = "  ⚠" if r.findings else ""
+        print(f"[{r.scenario}]{flag}")
+        print(f"  SQL : {r.sql}")
+        for line in r.plan:
+            print(f"  PLAN: {line}")
+        for f in r.findings:
+            print(f"  !! {f.kind} {f.table}: {f.detail}")
+            if f.suggestion:
+                print(f"     → {f.suggestion}")
+        print()
+    print("== Index review ==")
+    if not idx:
+        print("  (no issues)")
+    for f in idx:
+        print(f"  !! {f.kind} {f.table}: {f.detail}")
+        print(f"     → {f.suggestion}")
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Repository 쿼리 실행 계획 점검")
+    parser.add_argument("--url", default="sqlite://", help="스크래치 DB URL (기본: 메모리 SQLite)")
+    parser.add_argument("--users", type=int, default=2000, help="시딩할 사용자 수")
+    parser.add_argument("--sessions", type=int, default=5, help="사용자당 refresh 세션 수")
+    parser.add_argument("--json", action="store_true", help="JSON 으로 출력")
+    parser.add_argument("--fail-on-findings", action="store_true", help="문제가 있으면 종료 코드 1 (CI 용)")
+    args = parser.parse_args(argv)
+
+    reports, idx = run(args.url, args.users, args.sessions)
+    if args.json:
+        print(json.dumps({
+            "statements": [
+                {"scenario": r.scenario, "sql": r.sql, "plan": r.plan,
+                 "findings": [f.__dict__ for f in r.findings]} for r in reports
+            ],
+            "indexes": [f.__dict__ for f in idx],
+        }, ensure_ascii=False, indent=2))
+    else:
+        _print_text(reports, idx)
+
+    has_findings = bool(idx) or any(r.findings for r in reports)
+    return 1 if (args.fail_on_findings and has_findings) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+rebalance_token_shards.py
+--------------------------
+
+refresh 세션(tb_token) 샤드 리밸런싱 CLI
+
+settings.token_shard_urls 를 바꾼 뒤(샤드 추가/제거) 또는 메인 DB 에서 샤딩으로 처음 옮길 때 실행합니다.
+
+📌 하는 일:
+    1. 원본(source) DB 들의 tb_token 을 id 순서로 배치 단위 스캔
+        - 원본 = 현재 샤드 전체 + --source 로 지정한 DB (제거한 샤드, --include-main 이면 메인 DB)
+    2. 행마다 소유 샤드(shard_for_user)를 계산해서, 지금 위치가 소유 샤드가 아니면
+        a. 소유 샤드에 스냅샷 INSERT (이미 같은 jti 가 있으면 revoked 만 병합: 원본이 폐기됐으면 소유 샤드도 폐기)
+        b. 원본에서 "스냅샷 이후 바뀌지 않은" 행만 DELETE
+           (WHERE id=:id AND revoked=:스냅샷 AND last_used_at IS NOT DISTINCT FROM :스냅샷)
+        c. 0행 삭제된 행(그 사이 로그아웃/회전/touch 가 원본에 닿음)은 다시 읽어서 a 부터 반복
+    3. 샤드별 최종 행 수 출력
+
+복사 후 삭제 순서이므로 중간에 멈춰도 다시 실행하면 이어서 처리됩니다 (중복 jti 는 revoked 병합).
+
+서비스 중 실행:
+    - auth_repo 는 소유 샤드를 먼저 확인하므로, 복사(a) 이후의 단건 쓰기(폐기/touch)는 소유 샤드 사본에 반영됩니다.
+    - 복사 전에 원본에 반영된 쓰기는 원본 행을 바꾸므로 b 의 조건에 걸려 삭제되지 않고 c 에서 다시 복사됩니다.
+      → 이미 폐기된 refresh 가 이동 후 다시 활성화되는 일(재사용 탐지 무력화)이 없습니다.
+
+실행 (back/ 에서):
+    python -m tools.rebalance_token_shards --dry-run
+    python -m tools.rebalance_token_shards --include-main              # 메인 DB → 샤드 최초 이전
+    python -m tools.rebalance_token_shards --source sqlite:///old3.db  # 제거한 샤드 비우기
+"""
+
+import argparse
+import sys
+
+from sqlalchemy import String, bindparam, cast, delete, func, select, update
+from sqlalchemy.engine import Engine
+
+from app import sharding
+from app.database import engine as main_engine, make_engine
+from app.models import RefreshSession
+
+_rs_t = RefreshSession.__table__
+_DATA_COLUMNS = [c for c in _rs_t.c if c.name != "id"]   # 대상 샤드에서 id 는 새로 발급
+_MAX_ATTEMPTS = 5   # 복사 중 계속 바뀌는 행은 이 횟수만큼만 재시도 (남은 행은 다음 실행에서 처리)
+
+# last_used_at 은 DB 에 저장된 문자열 그대로도 읽어 둠 (SQLite 는 server_default 형식과
+# SQLAlchemy 가 바인딩하는 datetime 형식이 달라 datetime 으로 비교하면 항상 "바뀜"으로 보임)
+_LAST_USED_RAW = cast(_rs_t.c.last_used_at, String)
+_SNAPSHOT = select(_rs_t.c.id, *_DATA_COLUMNS, _LAST_USED_RAW.label("last_used_raw"))
+# 스냅샷 이후 바뀌지 않은 경우에만 삭제 (바뀌었으면 0행)
+_DELETE_UNCHANGED = delete(_rs_t).where(
+    _rs_t.c.id == bindparam("_id"),
+    _rs_t.c.revoked == bindparam("_revoked"),
+    _LAST_USED_RAW.is_not_distinct_from(bindparam("_last_used_raw")),
+)
+_MERGE_REVOKED = (
+    update(_rs_t)
+    .where(_rs_t.c.jti.in_(bindparam("_jtis", expanding=True)), _rs_t.c.revoked == False)  # noqa: E712
+    .values(revoked=True)
+)
+
+def _label(bind: Engine) -> str:
+    return bind.url.render_as_string(hide_password=True)
+
+def _copy_to_owner(owner: Engine, items: list[dict]) -> None:
+    """소유 샤드에 복사: 없는 jti 는 INSERT, 이미 있으면 원본의 폐기 상태를 병합(OR)"""
+    with owner.begin() as conn:
+        existing = set(conn.execute(
+            select(_rs_t.c.jti).where(_rs_t.c.jti.in_([r["jti"] for r in items]))
+        ).scalars())
+        fresh = [{c.name: r[c.name] for c in _DATA_COLUMNS} for r in items if r["jti"] not in existing]
+        if fresh:
+            conn.execute(_rs_t.insert(), fresh)
+        revoked = [r["jti"] for r in items if r["jti"] in existing and r["revoked"]]
+        if revoked:
+            conn.execute(_MERGE_REVOKED, {"_jtis": revoked})
+
+def _delete_unchanged(source: Engine, items: list[dict]) -> list[int]:
+    """원본에서 스냅샷과 같은 행만 삭제 → 그 사이 바뀌어서 남은 행 id 목록"""
+    changed: list[int] = []
+    with source.begin() as conn:
+        for r in items:
+            result = conn.execute(_DELETE_UNCHANGED, {
+                "_id": r["id"], "_revoked": r["revoked"], "_last_used_raw": r["last_used_raw"],
+            })
+            if not result.rowcount:
+                changed.append(r["id"])
+    return changed
+
+def _move(source: Engine, owner: Engine, items: list[dict]) -> int:
+    """items 를 owner 로 옮김 → 옮긴 행 수 (원본에서 바뀐 행은 다시 읽어 재복사)"""
+    remaining = items
+    for _ in range(_MAX_ATTEMPTS):
+        _copy_to_owner(owner, remaining)
+        changed = _delete_unchanged(source, remaining)
+        if not changed:
+            return len(items)
+        with source.connect() as conn:
+            remaining = [dict(r) for r in conn.execute(_SNAPSHOT.where(_rs_t.c.id.in_(changed))).mappings()]
+        if not remaining:   # 그 사이 원본에서 사라짐 (다른 리밸런싱 실행 등)
+            return len(items)
+    return len(items) - len(remaining)
+
+def rebalance_source(source: Engine, owner_index: int | None, *, batch_size: int, dry_run: bool) -> tuple[int, int]:
+    """
+    source 의 tb_token 중 소유 샤드가 아닌 행을 옮김 → (스캔한 행 수, 옮긴 행 수)
+    - owner_index: source 가 현재 샤드 목록의 몇 번째인지 (샤드 목록 밖의 원본이면 None → 전부 이동)
+    """
+    shards = sharding.engines()
+    scanned = moved = 0
+    last_id = 0
+    while True:
+        with source.connect() as conn:
+            rows = conn.execute(
+                _SNAPSHOT.where(_rs_t.c.id > last_id).order_by(_rs_t.c.id).limit(batch_size)
+            ).mappings().all()
+        if not rows:
+            break
+        last_id = rows[-1]["id"]
+        scanned += len(rows)
+
+        by_target: dict[int, list[dict]] = {}
+        for row in rows:
+            target = sharding.shard_for_user(row["user_id"])
+            if target != owner_index:
+                by_target.setdefault(target, []).append(dict(row))
+
+        for target, items in by_target.items():
+            moved += len(items) if dry_run else _move(source, shards[target], items)
+    return scanned, moved
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="tb_token 샤드 리밸런싱")
+    parser.add_argument("--source", action="append", default=[], help="추가 원본 DB URL (제거한 샤드 등), 여러 번 지정 가능")
+    parser.add_argument("--include-main", action="store_true", help="메인 DB 의 tb_token 도 원본으로 사용")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="옮길 행 수만 계산")
+    args = parser.parse_args(argv)
+
+    if not sharding.enabled():
+        print("token_shard_urls 가 비어 있습니다 (샤딩 비활성).", file=sys.stderr)
+        return 2
+    sharding.create_shard_tables()
+
+    sources: list[tuple[Engine, int | None]] = [(e, i) for i, e in enumerate(sharding.engines())]
+    sources += [(make_engine(url), None) for url in args.source]
+    if args.include_main:
+        sources.append((main_engine, None))
+
+    total = 0
+    for source, owner_index in sources:
+        scanned, moved = rebalance_source(source, owner_index, batch_size=args.batch_size, dry_run=args.dry_run)
+        total += moved
+        print(f"{_label(source)}: scanned={scanned} {'to_move' if args.dry_run else 'moved'}={moved}")
+
+    print(f"total {'to_move' if args.dry_run else 'moved'}={total}")
+    for i, shard in enumerate(sharding.engines()):
+        with shard.connect() as conn:
+            count = conn.execute(select(func.count()).select_from(_rs_t)).scalar_one()
+        print(f"  shard[{i}] {_label(shard)}: rows={count}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+trace_collector.py
+-------------------
+
+로컬 개발용 span 수집기 (utils/tracing.BatchExporter 의 "http" 내보내기 대상)
+
+📌 하는 일:
+    - POST /v1/spans 로 받은 span JSON 배열을 trace 별로 모음
+    - 요청 진입 span(span.kind=server, 부모가 이 서비스 밖)이 도착하면 해당 trace 를 트리로 출력
+    - --file 로 JSON Lines 파일(tracing_exporter="file")을 읽어 같은 형식으로 출력할 수도 있음
+
+실행 (back/ 에서):
+    python -m tools.trace_collector                          # 127.0.0.1:4319 에서 수신
+    TRACING_ENABLED=true TRACING_EXPORTER=http TRACING_SAMPLE_RATE=1 uvicorn app.main:app
+    python -m tools.trace_collector --file traces/spans.jsonl
+"""
+
+import argparse
+import json
+import sys
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_BAR_WIDTH = 40
+
+def render(spans: list[dict]) -> str:
+    """한 trace 의 span 들 → 들여쓰기 트리 + 시간 막대"""
+    ids = {s["span_id"] for s in spans}
+    children: dict[str | None, list[dict]] = defaultdict(list)
+    for s in spans:
+        children[s["parent_id"] if s["parent_id"] in ids else None].append(s)
+    for items in children.values():
+        items.sort(key=lambda s: s["start_ns"])
+
+    roots = children[None]
+    t0 = min(s["start_ns"] for s in spans)
+    total = max(s["start_ns"] + s["duration_ms"] * 1e6 for s in spans) - t0 or 1
+    lines = [f"trace {spans[0]['trace_id']}  ({total / 1e6:.1f} ms, {len(spans)} spans)"]
+
+    def walk(span: dict, depth: int) -> None:
+        offset = int((span["start_ns"] - t0) / total * _BAR_WIDTH)
+        width = max(1, int(span["duration_ms"] * 1e6 / total * _BAR_WIDTH))
+        bar = " " * offset + "█" * min(width, _BAR_WIDTH - offset)
+        label = span["name"]
+        if span["name"] == "db.query":
+            label += " " + span["attributes"].get("db.statement", "").split("\n")[0][:60]
+        if span["status"] != "ok":
+            label += f" [{span['attributes'].get('error', span['status'])}]"
+        lines.append(f"  {bar:<{_BAR_WIDTH}} {span['duration_ms']:>9.3f} ms  {'  ' * depth}{label}")
+        for child in children.get(span["span_id"], []):
+            walk(child, depth + 1)
+
+    for root in roots:
+        walk(root, 0)
+    return "\n".join(lines)
+
+def _is_entry(span: dict) -> bool:
+    return span["attributes"].get("span.kind") == "server"
+
+class Collector:
+    def __init__(self):
+        self._traces: dict[str, list[dict]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def add(self, spans: list[dict]) -> None:
+        done = []
+        with self._lock:
+            for span in spans:
+                self._traces[span["trace_id"]].append(span)
+                if _is_entry(span):
+                    done.append(self._traces.pop(span["trace_id"]))
+        for trace in done:
+            print(render(trace), flush=True)
+
+def _handler(collector: Collector) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            try:
+                collector.add(json.loads(body))
+            except (ValueError, KeyError, TypeError):
+                self.send_response(400)
+                self.end_headers()
+                return
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+    return Handler
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="로컬 span 수집기")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4319)
+    parser.add_argument("--file", help="수신 대신 JSON Lines span 파일을 읽어 출력")
+    args = parser.parse_args(argv)
+
+    collector = Collector()
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            collector.add([json.loads(line) for line in f if line.strip()])
+        return 0
+
+    server = ThreadingHTTPServer((args.host, args.port), _handler(collector))
+    print(f"listening on http://{args.host}:{args.port}/v1/spans", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())